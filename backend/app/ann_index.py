@@ -0,0 +1,200 @@
+import json
+import os
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+# Rows scored per block while assigning vectors to centroids, to bound the
+# (rows x nlist) score matrix
+_ASSIGN_BLOCK = 8192
+
+
+def default_nlist(n: int) -> int:
+    """Roughly 4 * sqrt(n) lists, the usual IVF sweet spot."""
+    return max(1, min(n, int(4 * np.sqrt(max(n, 1)))))
+
+
+def spherical_kmeans(x: np.ndarray, k: int, iters: int = 10, seed: int = 0) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity; returns (k, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    n, dim = x.shape
+    k = min(k, n)
+    centroids = x[rng.choice(n, size=k, replace=False)].copy()
+    for _ in range(iters):
+        assign = assign_lists(x, centroids)
+        sums = np.empty((k, dim), dtype=np.float64)
+        for j in range(dim):
+            sums[:, j] = np.bincount(assign, weights=x[:, j], minlength=k)
+        counts = np.bincount(assign, minlength=k)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty clusters from random points
+            sums[empty] = x[rng.choice(n, size=int(empty.sum()), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+def assign_lists(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for every row of x."""
+    out = np.empty(x.shape[0], dtype=np.int64)
+    for start in range(0, x.shape[0], _ASSIGN_BLOCK):
+        block = x[start:start + _ASSIGN_BLOCK]
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+class _InvertedList:
+    __slots__ = ("ids", "vectors", "size")
+
+    def __init__(self, dim: int):
+        self.ids: list[str] = []
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.size = 0
+
+    def append(self, resume_id: str, vec: np.ndarray) -> int:
+        if self.size == self.vectors.shape[0]:
+            grown = np.zeros((max(16, self.size * 2), self.vectors.shape[1]), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+        self.vectors[self.size] = vec
+        self.ids.append(resume_id)
+        self.size += 1
+        return self.size - 1
+
+
+class IVFIndex:
+    """Inverted-file ANN index over unit vectors (CPU only, numpy).
+
+    Vectors are bucketed by their nearest k-means centroid. A query scores
+    the centroids, then only the nprobe closest lists: higher nprobe means
+    better recall and slower queries. Inserts and deletes are incremental;
+    centroids only change when the index is retrained.
+    """
+
+    def __init__(self, centroids: np.ndarray, nprobe: int = 16):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nlist, self.dim = self.centroids.shape
+        self.nprobe = nprobe
+        self._lists = [_InvertedList(self.dim) for _ in range(self.nlist)]
+        self._where: dict[str, tuple[int, int]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, nlist: int = 0, nprobe: int = 16,
+              sample: int = 0, iters: int = 10, seed: int = 0) -> "IVFIndex":
+        """Fit centroids on (a sample of) vectors; the returned index is empty."""
+        x = np.asarray(vectors, dtype=np.float32)
+        nlist = nlist or default_nlist(len(x))
+        sample = sample or min(len(x), nlist * 64)
+        if sample < len(x):
+            x = x[np.random.default_rng(seed).choice(len(x), size=sample, replace=False)]
+        return cls(spherical_kmeans(x, nlist, iters=iters, seed=seed), nprobe=nprobe)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._where
+
+    def add(self, resume_id: str, vector: Any) -> None:
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        with self._lock:
+            self.remove(resume_id)
+            list_no = int(np.argmax(self.centroids @ vec))
+            self._where[resume_id] = (list_no, self._lists[list_no].append(resume_id, vec))
+
+    def add_many(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Bulk insert with one blocked centroid assignment."""
+        x = np.asarray(vectors, dtype=np.float32)
+        assign = assign_lists(x, self.centroids)
+        with self._lock:
+            for resume_id, list_no, vec in zip(ids, assign, x):
+                self.remove(resume_id)
+                list_no = int(list_no)
+                self._where[resume_id] = (list_no, self._lists[list_no].append(resume_id, vec))
+
+    def remove(self, resume_id: str) -> bool:
+        with self._lock:
+            loc = self._where.pop(resume_id, None)
+            if loc is None:
+                return False
+            list_no, pos = loc
+            inv = self._lists[list_no]
+            last = inv.size - 1
+            if pos != last:
+                inv.vectors[pos] = inv.vectors[last]
+                inv.ids[pos] = inv.ids[last]
+                self._where[inv.ids[pos]] = (list_no, pos)
+            inv.ids.pop()
+            inv.size -= 1
+            return True
+
+    def search(self, query: Any, k: int, nprobe: int | None = None) -> list[tuple[str, float]]:
+        q = np.asarray(query, dtype=np.float32).ravel()
+        nprobe = max(1, min(nprobe or self.nprobe, self.nlist))
+        with self._lock:
+            centroid_scores = self.centroids @ q
+            probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+            scores: list[np.ndarray] = []
+            ids: list[str] = []
+            for list_no in probe:
+                inv = self._lists[list_no]
+                if inv.size:
+                    scores.append(inv.vectors[:inv.size] @ q)
+                    ids.extend(inv.ids)
+            if not ids:
+                return []
+            all_scores = np.concatenate(scores)
+            k = min(k, len(ids))
+            top = np.argpartition(-all_scores, k - 1)[:k]
+            top = top[np.argsort(-all_scores[top], kind="stable")]
+            return [(ids[i], float(all_scores[i])) for i in top]
+
+    def save(self, path: str) -> None:
+        """Write centroids, vectors and ids to a single .npz file."""
+        with self._lock:
+            sizes = np.array([inv.size for inv in self._lists], dtype=np.int64)
+            vectors = np.concatenate(
+                [inv.vectors[:inv.size] for inv in self._lists] or [np.zeros((0, self.dim), np.float32)]
+            )
+            ids = np.array([i for inv in self._lists for i in inv.ids], dtype=str)
+            params = json.dumps({"nprobe": self.nprobe})
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as fh:
+            np.savez(fh, centroids=self.centroids, sizes=sizes, vectors=vectors, ids=ids,
+                     params=np.array(params))
+
+    @classmethod
+    def load(cls, path: str, centroids_only: bool = False) -> "IVFIndex":
+        """Restore an index saved with save(); centroids_only skips the stored vectors."""
+        with np.load(path, allow_pickle=False) as data:
+            params = json.loads(str(data["params"]))
+            index = cls(data["centroids"], nprobe=params.get("nprobe", 16))
+            if not centroids_only and len(data["ids"]):
+                index.add_lists(data["ids"].tolist(), data["vectors"], data["sizes"])
+        return index
+
+    def add_lists(self, ids: Sequence[str], vectors: np.ndarray, sizes: np.ndarray) -> None:
+        """Insert vectors that are already grouped by list (as written by save())."""
+        offset = 0
+        with self._lock:
+            for list_no, size in enumerate(sizes):
+                for j in range(offset, offset + int(size)):
+                    self._where[ids[j]] = (list_no, self._lists[list_no].append(ids[j], vectors[j]))
+                offset += int(size)
+
+    def stats(self) -> dict[str, Any]:
+        sizes = [inv.size for inv in self._lists]
+        return {
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "vectors": len(self._where),
+            "maxListSize": max(sizes) if sizes else 0,
+            "emptyLists": sum(1 for s in sizes if s == 0),
+        }
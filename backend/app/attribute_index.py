@@ -0,0 +1,281 @@
+import re
+import unicodedata
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+# Attributes searches can be filtered on, each mapped to normalized values
+FILTER_FIELDS = ("skills", "location", "fileType")
+
+# Row sets larger than this switch from a sorted row array to a bitmap,
+# the same cut-over roaring bitmaps use for their containers
+_DENSE_THRESHOLD = 4096
+
+_DIGITS = re.compile(r"\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=65536)
+def _normalize(value: str) -> str:
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", value)).strip().casefold().lstrip(".")
+
+
+def normalize_value(value: Any) -> str:
+    """Case-, width- and whitespace-insensitive form of an attribute value (".PDF" -> "pdf")."""
+    return _normalize(value) if isinstance(value, str) else ""
+
+
+def location_values(location: Any) -> frozenset[str]:
+    """The full location plus each comma-separated part without postal codes.
+
+    "Austin, TX 78701" matches the filters "austin", "tx" and
+    "austin, tx 78701".
+    """
+    return _location_values(location) if isinstance(location, str) else frozenset()
+
+
+@lru_cache(maxsize=16384)
+def _location_values(location: str) -> frozenset[str]:
+    values = {normalize_value(location)}
+    for part in location.split(","):
+        values.add(normalize_value(_DIGITS.sub(" ", part)))
+    values.discard("")
+    return frozenset(values)
+
+
+def location_filter_values(location: str) -> frozenset[str]:
+    """Values a resume must be indexed under, all of them, to match a location filter.
+
+    Parts are normalized like location_values, so "Austin, TX" matches
+    "Austin, TX 78701"; a filter that is only a postal code is kept whole.
+    """
+    values = {normalize_value(_DIGITS.sub(" ", part)) for part in location.split(",")}
+    values.discard("")
+    return frozenset(values) or frozenset({normalize_value(location)})
+
+
+def attribute_keys(meta: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    """(field, normalized value) pairs a resume is indexed under."""
+    keys: set[tuple[str, str]] = set()
+    for skill in meta.get("skills") or []:
+        value = normalize_value(skill)
+        if value:
+            keys.add(("skills", value))
+    for value in location_values(meta.get("location")):
+        keys.add(("location", value))
+    file_type = normalize_value(meta.get("fileType"))
+    if file_type:
+        keys.add(("fileType", file_type))
+    return tuple(keys)
+
+
+class _RowSet:
+    """Rows holding one attribute value.
+
+    Small sets are a sorted int32 array (the first count entries of a
+    buffer that grows by doubling); past _DENSE_THRESHOLD rows they become a
+    packed bitmap (one bit per row), and shrink back to an array once they
+    fall well below it.
+    """
+
+    __slots__ = ("rows", "bits", "count")
+
+    def __init__(self, rows: np.ndarray | None = None) -> None:
+        self.rows: np.ndarray | None = np.zeros(4, dtype=np.int32)
+        self.bits: np.ndarray | None = None
+        self.count = 0
+        if rows is not None and len(rows):
+            self.rows = np.unique(np.asarray(rows, dtype=np.int32))
+            self.count = len(self.rows)
+            if self.count > _DENSE_THRESHOLD:
+                self._to_bitmap()
+
+    def _to_bitmap(self) -> None:
+        assert self.rows is not None
+        rows = self.rows[:self.count]
+        top = int(rows[-1]) if len(rows) else 0
+        bits = np.zeros(max(1, top // 8 + 1) * 2, dtype=np.uint8)
+        np.bitwise_or.at(bits, rows >> 3, (1 << (rows & 7)).astype(np.uint8))
+        self.bits, self.rows = bits, None
+
+    def _to_array(self) -> None:
+        assert self.bits is not None
+        self.rows = np.flatnonzero(np.unpackbits(self.bits, bitorder="little")).astype(np.int32)
+        self.bits = None
+
+    def add(self, row: int) -> None:
+        if self.bits is not None:
+            byte = row >> 3
+            if byte >= len(self.bits):
+                grown = np.zeros(max(byte + 1, 2 * len(self.bits)), dtype=np.uint8)
+                grown[:len(self.bits)] = self.bits
+                self.bits = grown
+            if not self.bits[byte] >> (row & 7) & 1:
+                self.bits[byte] |= 1 << (row & 7)
+                self.count += 1
+            return
+        assert self.rows is not None
+        n = self.count
+        # New vector index rows are always the highest, so most adds append
+        i = n if n == 0 or row > self.rows[n - 1] else int(np.searchsorted(self.rows[:n], row))
+        if i < n and self.rows[i] == row:
+            return
+        if n == len(self.rows):
+            grown = np.zeros(max(4, 2 * n), dtype=np.int32)
+            grown[:n] = self.rows
+            self.rows = grown
+        if i < n:
+            self.rows[i + 1:n + 1] = self.rows[i:n].copy()
+        self.rows[i] = row
+        self.count += 1
+        if self.count > _DENSE_THRESHOLD:
+            self._to_bitmap()
+
+    def discard(self, row: int) -> None:
+        if self.bits is not None:
+            byte = row >> 3
+            if byte < len(self.bits) and self.bits[byte] >> (row & 7) & 1:
+                self.bits[byte] &= ~np.uint8(1 << (row & 7))
+                self.count -= 1
+                if self.count < _DENSE_THRESHOLD // 2:
+                    self._to_array()
+            return
+        assert self.rows is not None
+        n = self.count
+        i = int(np.searchsorted(self.rows[:n], row))
+        if i < n and self.rows[i] == row:
+            self.rows[i:n - 1] = self.rows[i + 1:n].copy()
+            self.count -= 1
+
+    def mask(self, n: int) -> np.ndarray:
+        """Boolean mask over the first n rows."""
+        if self.bits is not None:
+            mask = np.unpackbits(self.bits, count=min(n, 8 * len(self.bits)), bitorder="little").view(bool)
+            return mask if len(mask) == n else np.concatenate([mask, np.zeros(n - len(mask), bool)])
+        assert self.rows is not None
+        rows = self.rows[:self.count]
+        mask = np.zeros(n, dtype=bool)
+        mask[rows[rows < n]] = True
+        return mask
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes if self.bits is not None else self.rows.nbytes  # type: ignore[union-attr]
+
+
+class AttributeIndex:
+    """Bitmap-style inverted index from attribute values to vector index rows.
+
+    Rows are the VectorIndex's matrix rows, so filters turn straight into a
+    candidate mask for the vector scan. The owning index calls set, clear
+    and move under its own lock as rows are written and compacted; these
+    are no-ops until the first rebuild, so processes that never filter do
+    not pay for the index.
+    Scores are filtered on a float32 column, since a threshold compare
+    over it is as cheap as OR-ing score-bucket bitmaps and exact.
+    """
+
+    def __init__(self) -> None:
+        self._sets: dict[tuple[str, str], _RowSet] = {}
+        self._row_keys: list[tuple[tuple[str, str], ...]] = []
+        self._scores = np.zeros(0, dtype=np.float32)
+        self.built = False
+
+    def _reserve(self, row: int) -> None:
+        if row >= len(self._row_keys):
+            self._row_keys.extend([()] * (row + 1 - len(self._row_keys)))
+        if row >= len(self._scores):
+            scores = np.full(max(row + 1, 2 * len(self._scores), 1024), np.nan, dtype=np.float32)
+            scores[:len(self._scores)] = self._scores
+            self._scores = scores
+
+    def set(self, row: int, meta: dict[str, Any]) -> None:
+        if not self.built:
+            return
+        self.clear(row)
+        keys = attribute_keys(meta)
+        for key in keys:
+            row_set = self._sets.get(key)
+            if row_set is None:
+                row_set = self._sets[key] = _RowSet()
+            row_set.add(row)
+        self._row_keys[row] = keys
+        score = meta.get("matchScore")
+        self._scores[row] = float(score) if isinstance(score, (int, float)) else np.nan
+
+    def clear(self, row: int) -> None:
+        if not self.built:
+            return
+        self._reserve(row)
+        for key in self._row_keys[row]:
+            row_set = self._sets[key]
+            row_set.discard(row)
+            if not row_set.count:
+                del self._sets[key]
+        self._row_keys[row] = ()
+        self._scores[row] = np.nan
+
+    def move(self, dst: int, src: int) -> None:
+        """Relabel src's attributes as dst's (dst is cleared first, src left empty)."""
+        if not self.built:
+            return
+        self.clear(dst)
+        keys = self._row_keys[src]
+        for key in keys:
+            self._sets[key].discard(src)
+            self._sets[key].add(dst)
+        self._row_keys[dst], self._row_keys[src] = keys, ()
+        self._scores[dst], self._scores[src] = self._scores[src], np.nan
+
+    def rebuild(self, metas: Iterable[dict[str, Any]]) -> None:
+        """Index rows 0..len(metas)-1 from scratch in one pass."""
+        rows: dict[tuple[str, str], list[int]] = {}
+        self._row_keys = []
+        scores: list[float] = []
+        for row, meta in enumerate(metas):
+            keys = attribute_keys(meta)
+            for key in keys:
+                rows.setdefault(key, []).append(row)
+            self._row_keys.append(keys)
+            score = meta.get("matchScore")
+            scores.append(float(score) if isinstance(score, (int, float)) else np.nan)
+        self._sets = {key: _RowSet(np.asarray(value)) for key, value in rows.items()}
+        self._scores = np.full(max(1024, len(scores)), np.nan, dtype=np.float32)
+        self._scores[:len(scores)] = scores
+        self.built = True
+
+    def mask(self, n: int, skills: Iterable[str] = (), location: str | None = None,
+             file_type: str | None = None, min_score: float | None = None) -> np.ndarray:
+        """Rows among the first n matching every given filter (all skills must match)."""
+        mask = np.ones(n, dtype=bool)
+        wanted = [("skills", normalize_value(skill)) for skill in skills]
+        if location:
+            wanted.extend(("location", value) for value in location_filter_values(location))
+        if file_type:
+            wanted.append(("fileType", normalize_value(file_type)))
+        # Most selective first, so the running mask empties as early as possible
+        sets = sorted((self._sets.get(key) for key in wanted), key=lambda s: s.count if s else 0)
+        for row_set in sets:
+            if row_set is None:
+                return np.zeros(n, dtype=bool)
+            mask &= row_set.mask(n)
+            if not mask.any():
+                return mask
+        if min_score is not None:
+            self._reserve(n)
+            with np.errstate(invalid="ignore"):
+                mask &= self._scores[:n] >= min_score
+        return mask
+
+    def stats(self) -> dict[str, Any]:
+        counts = {field: 0 for field in FILTER_FIELDS}
+        for field, _ in self._sets:
+            counts[field] += 1
+        return {
+            "built": self.built,
+            "values": counts,
+            "bitmaps": sum(1 for s in self._sets.values() if s.bits is not None),
+            "bytes": sum(s.nbytes for s in self._sets.values()) + self._scores.nbytes,
+        }
@@ -0,0 +1,406 @@
+import json
+import logging
+import os
+import threading
+from collections.abc import Sequence
+from contextlib import contextmanager
+from typing import Any
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker deployments only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the persisted embeddings (empty disables the store);
+# relative paths are resolved against the backend directory, not the CWD
+EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", ".cache/embeddings")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Compact once superseded rows outnumber live rows by this factor
+EMBEDDING_STORE_COMPACT_RATIO = float(os.getenv("EMBEDDING_STORE_COMPACT_RATIO", "0.5"))
+
+VECTORS_FILE = "vectors.f32"  # generation 0; later ones are vectors.<generation>.f32
+LOG_FILE = "index.jsonl"
+LOCK_FILE = ".lock"
+
+
+def _fsync(fh: Any) -> None:
+    fh.flush()
+    os.fsync(fh.fileno())
+
+
+def _fsync_dir(directory: str) -> None:
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows cannot open directories
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class EmbeddingSnapshot:
+    """Live rows of the store as of open(): ids, row numbers, metadata and the mapped matrix."""
+
+    def __init__(self, ids: list[str], rows: np.ndarray, meta: list[dict[str, Any]], matrix: np.ndarray):
+        self.ids = ids
+        self.rows = rows
+        self.meta = meta
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dense(self) -> bool:
+        """True when live rows are exactly 0..n-1 in order, so matrix can be used without copying."""
+        n = len(self.ids)
+        return self.matrix.shape[0] == n and bool(np.array_equal(self.rows, np.arange(n)))
+
+    def vectors(self) -> np.ndarray:
+        """Live vectors in id order: the mapping itself when dense, else a gathered copy."""
+        return self.matrix if self.dense else np.asarray(self.matrix[self.rows])
+
+
+class EmbeddingStore:
+    """Append-only on-disk embedding store shared by every worker on the host.
+
+    The vector file holds raw float32 rows; index.jsonl is a log of
+    {"id", "row", "meta"} entries (row null = deleted) after a
+    {"dim", "seeded", "generation"} header, where the last entry per id
+    wins. Readers map the vector file with mmap so workers share one copy
+    in the page cache. Writers append under an exclusive file lock.
+    Compaction writes the live rows to the next generation's vector file
+    and a log naming that generation, fsyncs both, and commits with a
+    single rename of the log: a crash at any point leaves a log and the
+    vector file it was written against.
+
+    The store only holds the whole corpus once seed() has written a full
+    listing. Until then it reads as empty and ignores appends and deletes,
+    so a write made before the first load cannot pass for the corpus.
+    """
+
+    def __init__(self, directory: str, compact_ratio: float = EMBEDDING_STORE_COMPACT_RATIO):
+        self.directory = directory
+        self.compact_ratio = compact_ratio
+        self.dim: int | None = None
+        self._known: set[str] = set()  # live ids as far as this process has seen
+        self._dead = 0
+        self._lock = threading.Lock()
+        self._compacting = False
+        self._seeded = False  # only ever goes from False to True
+        # read() follows the log incrementally: id -> row, bytes consumed,
+        # which log file (compaction swaps in a new inode), and the mapping
+        self._reader_rows: dict[str, int] = {}
+        self._reader_pos = 0
+        self._reader_inode: int | None = None
+        self._reader_matrix: np.ndarray | None = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        with open(self._path(LOCK_FILE), "a") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _replay(self) -> tuple[int | None, dict[str, tuple[int, dict[str, Any]]]]:
+        """Read the log; returns (dim, id -> (row, meta)) for live ids."""
+        dim = None
+        live: dict[str, tuple[int, dict[str, Any]]] = {}
+        try:
+            fh = open(self._path(LOG_FILE), "r", encoding="utf-8")
+        except FileNotFoundError:
+            return None, live
+        with fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn trailing write
+                if "dim" in entry:
+                    dim = int(entry["dim"])
+                    continue
+                if entry.get("row") is None:
+                    live.pop(entry["id"], None)
+                else:
+                    live[entry["id"]] = (int(entry["row"]), entry.get("meta") or {})
+        return dim, live
+
+    def _header(self) -> dict[str, Any]:
+        """The log's first line ({} if missing or torn); caller holds the file lock."""
+        try:
+            with open(self._path(LOG_FILE), "r", encoding="utf-8") as fh:
+                header = json.loads(fh.readline() or "{}")
+        except (OSError, ValueError):
+            return {}
+        return header if isinstance(header, dict) and "dim" in header else {}
+
+    def _is_seeded(self) -> bool:
+        """Whether the log header carries the seeded marker; caller holds the file lock."""
+        if not self._seeded:
+            self._seeded = bool(self._header().get("seeded"))
+        return self._seeded
+
+    def _vectors_path(self, generation: int | None = None) -> str:
+        """The vector file of a generation, by default the one the current log was written against."""
+        if generation is None:
+            generation = int(self._header().get("generation", 0))
+        return self._path(VECTORS_FILE if generation == 0 else f"vectors.{generation}.f32")
+
+    def _row_count(self, path: str | None = None) -> int:
+        try:
+            return os.path.getsize(path or self._vectors_path()) // (4 * self.dim)
+        except (FileNotFoundError, TypeError):
+            return 0
+
+    def open(self) -> EmbeddingSnapshot | None:
+        """Map the current live rows; None when the store is empty or was never seeded."""
+        with self._file_lock(exclusive=False):
+            if not self._is_seeded():
+                return None
+            dim, live = self._replay()
+            if dim is None or not live:
+                return None
+            self.dim = dim
+            path = self._vectors_path()
+            total = self._row_count(path)
+            if total == 0:
+                return None
+            # Copy-on-write: pages stay shared with other workers until this process writes to them
+            matrix = np.memmap(path, dtype=np.float32, mode="c", shape=(total, dim))
+        items = sorted(((row, rid, meta) for rid, (row, meta) in live.items() if row < total))
+        with self._lock:
+            self._known = set(live)
+            self._dead = total - len(items)
+        return EmbeddingSnapshot(
+            ids=[rid for _, rid, _ in items],
+            rows=np.array([row for row, _, _ in items], dtype=np.int64),
+            meta=[meta for _, _, meta in items],
+            matrix=matrix,
+        )
+
+    def read(self, ids: Sequence[str]) -> tuple[np.ndarray, np.ndarray | None]:
+        """Current vectors for ids as (found mask, rows), rows being zero where not found.
+
+        Only log entries added since the last call are parsed, so rows other
+        workers appended are seen without replaying the whole log. The
+        vectors come from a read-only mapping shared through the page cache.
+        """
+        found = np.zeros(len(ids), dtype=bool)
+        with self._file_lock(exclusive=False):
+            if not self._is_seeded():
+                return found, None
+            with self._lock:
+                matrix = self._catch_up()
+                if matrix is None:
+                    return found, None
+                rows = np.array([self._reader_rows.get(rid, -1) for rid in ids], dtype=np.int64)
+        found = (rows >= 0) & (rows < matrix.shape[0])
+        out = np.zeros((len(ids), matrix.shape[1]), dtype=np.float32)
+        out[found] = matrix[rows[found]]
+        return found, out
+
+    def _catch_up(self) -> np.ndarray | None:
+        """Apply new log entries to the reader state and remap grown vectors; caller holds both locks."""
+        log_path = self._path(LOG_FILE)
+        try:
+            st = os.stat(log_path)
+        except FileNotFoundError:
+            return None
+        if st.st_ino != self._reader_inode or st.st_size < self._reader_pos:
+            self._reader_rows, self._reader_pos, self._reader_matrix = {}, 0, None
+            self._reader_inode = st.st_ino
+        if st.st_size > self._reader_pos:
+            with open(log_path, "rb") as fh:
+                fh.seek(self._reader_pos)
+                data = fh.read(st.st_size - self._reader_pos)
+            end = data.rfind(b"\n") + 1  # leave a torn trailing line for next time
+            for line in data[:end].splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if "dim" in entry:
+                    self.dim = int(entry["dim"])
+                elif entry.get("row") is None:
+                    self._reader_rows.pop(entry["id"], None)
+                else:
+                    self._reader_rows[entry["id"]] = int(entry["row"])
+            self._reader_pos += end
+        # A new log inode resets the mapping above, so it is always of the log's generation
+        path = self._vectors_path()
+        total = self._row_count(path)
+        if total and (self._reader_matrix is None or self._reader_matrix.shape[0] < total):
+            self._reader_matrix = np.memmap(path, dtype=np.float32, mode="r", shape=(total, self.dim))
+        return self._reader_matrix
+
+    def _append_log(self, entries: list[dict[str, Any]]) -> None:
+        # Only called on seeded stores, so the header is already there
+        with open(self._path(LOG_FILE), "a", encoding="utf-8") as fh:
+            fh.write("".join(json.dumps(e) + "\n" for e in entries))
+
+    def append(self, ids: Sequence[str], vectors: np.ndarray, meta: Sequence[dict[str, Any]]) -> None:
+        """Append new versions of these rows; earlier versions become dead space."""
+        x = np.ascontiguousarray(vectors, dtype=np.float32)
+        if not len(ids):
+            return
+        with self._file_lock(exclusive=True):
+            if not self._is_seeded():
+                return
+            if self.dim is None:
+                self.dim = self._replay()[0] or int(x.shape[1])
+            if x.ndim != 2 or x.shape[1] != self.dim:
+                raise ValueError(f"expected {self.dim}-dim vectors, got shape {x.shape}")
+            path = self._vectors_path()
+            with open(path, "ab") as fh:
+                # Drop a partial row left by an interrupted write before appending
+                start = self._row_count(path)
+                fh.truncate(start * 4 * self.dim)
+                fh.write(x.tobytes())
+                # Rows reach the disk before the log entries that point at them
+                _fsync(fh)
+            self._append_log([
+                {"id": rid, "row": start + i, "meta": m} for i, (rid, m) in enumerate(zip(ids, meta))
+            ])
+        with self._lock:
+            self._dead += sum(1 for rid in ids if rid in self._known)
+            self._known.update(ids)
+        self._maybe_compact()
+
+    def delete(self, ids: Sequence[str]) -> None:
+        if not ids:
+            return
+        with self._file_lock(exclusive=True):
+            if not self._is_seeded():
+                return
+            if self.dim is None:
+                self.dim = self._replay()[0]
+            if self.dim is None:
+                return
+            self._append_log([{"id": rid, "row": None} for rid in ids])
+        with self._lock:
+            self._dead += sum(1 for rid in ids if rid in self._known)
+            self._known.difference_update(ids)
+        self._maybe_compact()
+
+    def replace_all(self, ids: Sequence[str], vectors: np.ndarray, meta: Sequence[dict[str, Any]]) -> None:
+        """Rewrite the store to exactly these rows, which must be the whole corpus."""
+        x = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._file_lock(exclusive=True):
+            self.dim = int(x.shape[1]) if x.ndim == 2 and x.shape[1] else self.dim
+            self._write_files(ids, x, meta)
+
+    def seed(self, ids: Sequence[str], vectors: np.ndarray, meta: Sequence[dict[str, Any]]) -> bool:
+        """replace_all() with a full listing, unless another worker seeded the store first.
+
+        Returns False in that case: the existing store may already hold
+        writes newer than this listing.
+        """
+        x = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._file_lock(exclusive=True):
+            if self._is_seeded():
+                return False
+            self.dim = int(x.shape[1]) if x.ndim == 2 and x.shape[1] else self.dim
+            self._write_files(ids, x, meta)
+        return True
+
+    def _write_files(self, ids: Sequence[str], x: np.ndarray, meta: Sequence[dict[str, Any]]) -> None:
+        """Write the next generation and commit it by renaming the log; caller holds the file lock."""
+        old_path = self._vectors_path()
+        generation = int(self._header().get("generation", 0)) + 1
+        vectors_path = self._vectors_path(generation)
+        log_tmp = self._path(LOG_FILE + ".tmp")
+        with open(vectors_path, "wb") as fh:
+            fh.write(x.tobytes())
+            _fsync(fh)
+        with open(log_tmp, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"dim": self.dim, "seeded": True, "generation": generation}) + "\n")
+            fh.write("".join(
+                json.dumps({"id": rid, "row": i, "meta": m}) + "\n" for i, (rid, m) in enumerate(zip(ids, meta))
+            ))
+            _fsync(fh)
+        os.replace(log_tmp, self._path(LOG_FILE))
+        _fsync_dir(self.directory)
+        # Open mappings in other workers keep the old inode until they reopen
+        self._remove_stale_vectors(keep=vectors_path, also=old_path)
+        with self._lock:
+            self._known = set(ids)
+            self._dead = 0
+            self._seeded = True
+
+    def _remove_stale_vectors(self, keep: str, also: str | None = None) -> None:
+        """Delete vector files of other generations, e.g. left by a crash before a log rename."""
+        stale = {also} if also else set()
+        for name in os.listdir(self.directory):
+            if name == VECTORS_FILE or (name.startswith("vectors.") and name.endswith(".f32")):
+                stale.add(self._path(name))
+        for path in stale - {keep}:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # gone already, or still mapped on Windows; a later swap retries
+
+    def _maybe_compact(self) -> None:
+        """Start a background compaction once enough rows are dead."""
+        with self._lock:
+            if self._compacting or self._dead <= max(1024, self.compact_ratio * len(self._known)):
+                return
+            self._compacting = True
+        threading.Thread(target=self._compact_in_background, name="embedding-store-compact", daemon=True).start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except OSError as exc:
+            logger.warning("Embedding store compaction failed: %s", exc)
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def compact(self) -> int:
+        """Drop superseded and deleted rows; returns the number of live rows kept."""
+        with self._file_lock(exclusive=True):
+            dim, live = self._replay()
+            if dim is None:
+                return 0
+            self.dim = dim
+            path = self._vectors_path()
+            total = self._row_count(path)
+            items = sorted(((row, rid, meta) for rid, (row, meta) in live.items() if row < total))
+            rows = np.array([row for row, _, _ in items], dtype=np.int64)
+            if total:
+                source = np.memmap(path, dtype=np.float32, mode="r", shape=(total, dim))
+                x = np.ascontiguousarray(source[rows])
+                del source
+            else:
+                x = np.zeros((0, dim), dtype=np.float32)
+            self._write_files([rid for _, rid, _ in items], x, [meta for _, _, meta in items])
+        logger.info("Compacted embedding store %s: %d of %d rows kept", self.directory, len(items), total)
+        return len(items)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            live, dead = len(self._known), self._dead
+        return {"directory": self.directory, "dim": self.dim, "seeded": self._seeded, "liveRows": live, "deadRows": dead}
+
+
+_store: EmbeddingStore | None = None
+
+
+def get_embedding_store() -> EmbeddingStore | None:
+    """Process-wide store, or None when EMBEDDING_STORE_DIR is empty."""
+    global _store
+    if _store is None and EMBEDDING_STORE_DIR:
+        _store = EmbeddingStore(os.path.join(BACKEND_DIR, EMBEDDING_STORE_DIR))
+    return _store
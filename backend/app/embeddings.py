@@ -1,15 +1,242 @@
-from collections.abc import Iterable
-from sentence_transformers import SentenceTransformer  # type: ignore
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from app.metrics import COUNT_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+# Concurrent embedding requests are coalesced into one encode() call of up to
+# EMBED_BATCH_MAX_SIZE texts, waiting at most EMBED_BATCH_MAX_WAIT_MS for company
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+# Inference threads (concurrent encode() calls), intra-op threads per call
+# (0 = runtime default) and texts allowed to wait before requests are rejected
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "1"))
+EMBED_TORCH_THREADS = int(os.getenv("EMBED_TORCH_THREADS", "0"))
+EMBED_MAX_QUEUE = int(os.getenv("EMBED_MAX_QUEUE", "1024"))
+# "torch" runs sentence-transformers; "onnx" runs an int8-quantized ONNX export
+# on onnxruntime (exported to ONNX_MODEL_DIR on first use) and falls back to
+# torch if that fails
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch").lower()
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", ".cache/onnx/all-MiniLM-L6-v2")
+
+
+class EmbeddingBusy(RuntimeError):
+    """The embedding queue is full."""
+
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# Bump whenever the same text would embed to a different vector. Switching to
+# the ONNX backend does not force a re-embed because tests/test_onnx_parity.py
+# requires cosine >= 0.99 against torch; run it wherever the model is available.
+EMBEDDING_VERSION = f"{MODEL_NAME}/1"
 
 _model = None
+_backend = ""
+_model_lock = threading.Lock()
+
+def _load_torch_model():
+    # Imported here so the ONNX backend never pays for torch
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    if EMBED_TORCH_THREADS > 0:
+        import torch
+        torch.set_num_threads(EMBED_TORCH_THREADS)
+    return SentenceTransformer(MODEL_NAME)
 
 def _get_model():
-    global _model
+    global _model, _backend
     if _model is None:
-        _model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+        with _model_lock:
+            if _model is None:
+                if EMBED_BACKEND == "onnx":
+                    try:
+                        from app.onnx_embedder import load_onnx_embedder
+                        _model = load_onnx_embedder(MODEL_NAME, ONNX_MODEL_DIR, threads=EMBED_TORCH_THREADS)
+                        _backend = "onnx"
+                    except Exception as exc:
+                        logger.warning("ONNX embedding backend unavailable, falling back to torch: %s", exc)
+                if _model is None:
+                    _model = _load_torch_model()
+                    _backend = "torch"
     return _model
 
+def embedding_fingerprint(text: str) -> str:
+    """Identifies the embedding of text under the current model, to skip re-embedding unchanged text."""
+    return hashlib.sha256(f"{EMBEDDING_VERSION}\n{text}".encode("utf-8")).hexdigest()
+
 def embed_texts(texts: Iterable[str]) -> list[list[float]]:
     model = _get_model()
     embs = model.encode(list(texts), normalize_embeddings=True)  # type: ignore
     return [e.tolist() for e in embs]
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests on one event loop into batched encode() calls.
+
+    A collector task takes the first queued text, waits up to max_wait for
+    more unless the batch is already full, then encodes it off the event
+    loop on a dedicated executor, so inference never competes with the
+    default thread pool. Up to `workers` batches encode at once; requests
+    that arrive meanwhile form the next batch, and texts beyond max_queue
+    are rejected with EmbeddingBusy.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], list[list[float]]] = embed_texts,
+        max_batch: int = EMBED_BATCH_MAX_SIZE,
+        max_wait: float = EMBED_BATCH_MAX_WAIT_MS / 1000,
+        workers: int = EMBED_WORKERS,
+        max_queue: int = EMBED_MAX_QUEUE,
+    ):
+        self._encode = encode
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embed")
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._busy = 0
+        self._batches = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        return loop
+
+    async def embed(self, texts: Iterable[str]) -> list[list[float]]:
+        loop = self._ensure_started()
+        texts = list(texts)
+        if self._queue.qsize() + len(texts) > self.max_queue:
+            self._rejected += len(texts)
+            registry.counter("embed.rejected").inc(len(texts))
+            raise EmbeddingBusy("Embedding queue is full, try again later")
+        enqueued = time.perf_counter()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.put_nowait((text, future, enqueued))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _collect(self) -> list[tuple[str, asyncio.Future, float]]:
+        batch = [await self._queue.get()]
+        if self._queue.qsize() < self.max_batch - 1 and self.max_wait:
+            await asyncio.sleep(self.max_wait)
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        slots = asyncio.Semaphore(self.workers)
+        while True:
+            # Collect only once an inference thread is free, so the batch keeps growing meanwhile
+            await slots.acquire()
+            batch = [item for item in await self._collect() if not item[1].cancelled()]
+            if not batch:
+                slots.release()
+                continue
+            task = self._loop.create_task(self._encode_batch(batch, slots))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _encode_batch(self, batch: list[tuple[str, asyncio.Future, float]], slots: asyncio.Semaphore) -> None:
+        started = time.perf_counter()
+        queue_wait = registry.histogram("embed.queue_wait.seconds")
+        for _, _, enqueued in batch:
+            queue_wait.observe(started - enqueued)
+        registry.histogram("embed.batch_size", COUNT_BUCKETS).observe(len(batch))
+        self._busy += 1
+        try:
+            vectors = await self._loop.run_in_executor(self._executor, self._encode, [text for text, _, _ in batch])
+        except Exception as exc:
+            self._failed += len(batch)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        finally:
+            self._busy -= 1
+            slots.release()
+            registry.histogram("embed.encode.seconds").observe(time.perf_counter() - started)
+        self._batches += 1
+        self._completed += len(batch)
+        for (_, future, _), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    async def embed_bulk(self, texts: list[str]) -> list[list[float]]:
+        """Encode a large batch directly on the inference executor, bypassing the request queue.
+
+        For background jobs that already batch their own input; counts
+        towards busy and completed like a regular batch.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self._busy += 1
+        try:
+            vectors = await loop.run_in_executor(self._executor, self._encode, texts)
+        except Exception:
+            self._failed += len(texts)
+            raise
+        finally:
+            self._busy -= 1
+            registry.histogram("embed.encode.seconds").observe(time.perf_counter() - started)
+        self._batches += 1
+        self._completed += len(texts)
+        return vectors
+
+    def stats(self) -> dict[str, Any]:
+        """Inference saturation counters for monitoring."""
+        return {
+            "workers": self.workers,
+            "backend": _backend or None,
+            "torchThreads": EMBED_TORCH_THREADS,
+            "busy": self._busy,
+            "queueDepth": self._queue.qsize() if self._queue is not None else 0,
+            "maxQueue": self.max_queue,
+            "maxBatch": self.max_batch,
+            "batches": self._batches,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_batcher: EmbeddingBatcher | None = None
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    global _batcher
+    if _batcher is None:
+        _batcher = EmbeddingBatcher()
+    return _batcher
+
+def shutdown_embedding_batcher() -> None:
+    global _batcher
+    if _batcher is not None:
+        _batcher.shutdown()
+        _batcher = None
+
+async def embed_texts_async(texts: Iterable[str]) -> list[list[float]]:
+    """Like embed_texts, but batched with other concurrent callers and run off the event loop."""
+    return await get_embedding_batcher().embed(texts)
@@ -0,0 +1,274 @@
+import asyncio
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from typing import Any
+
+from app.parsing import (
+    ExtractorTiming,
+    bytes_to_text,
+    emit_parse_timings,
+    parse_hooks_enabled,
+    parse_resume_content,
+)
+
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "0")) or (os.cpu_count() or 2)
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30"))
+EXTRACTION_MEMORY_LIMIT_MB = int(os.getenv("EXTRACTION_MEMORY_LIMIT_MB", "1024"))
+EXTRACTION_MAX_QUEUE = int(os.getenv("EXTRACTION_MAX_QUEUE", "256"))
+EXTRACTION_MAX_TASKS_PER_WORKER = int(os.getenv("EXTRACTION_MAX_TASKS_PER_WORKER", "200"))
+
+
+class ExtractionError(RuntimeError):
+    """Text extraction failed inside a worker."""
+
+
+class ExtractionTimeout(ExtractionError):
+    """A document exceeded the per-document wall-clock limit."""
+
+
+class ExtractionBusy(ExtractionError):
+    """The extraction queue is full."""
+
+
+def _worker_main(conn: Connection, memory_limit_mb: int) -> None:
+    """Worker loop: receive (content, ext, parse, timed), reply with ("ok", result) or ("error", message).
+
+    result is the extracted text, or (text, parsed, timings) when parse is
+    set; timings is None unless timed.
+    "fatal" replies mean the worker is exiting and must not be reused.
+    """
+    if memory_limit_mb > 0:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            pass  # not supported on this platform; rely on the timeout alone
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        content, ext, parse, timed = job
+        try:
+            text = bytes_to_text(content, ext)
+            if parse:
+                # Empty text can't be parsed; the caller rejects it
+                parsed = parse_resume_content(text, debug=timed) if text.strip() else {}
+                timings = parsed.pop("debug", {}).get("timings") if timed else None
+                conn.send(("ok", (text, parsed, timings)))
+            else:
+                conn.send(("ok", text))
+        except MemoryError:
+            conn.send(("fatal", "Document exceeded the extraction memory limit"))
+            return  # address space may be fragmented; let the pool recycle us
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """One extraction process and the parent end of its pipe."""
+
+    def __init__(self, ctx: Any, memory_limit_mb: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        self.broken = False
+
+    def run(self, content: bytes, ext: str, parse: bool, timed: bool, timeout: float) -> Any:
+        """Blocking call; raises ExtractionTimeout if the worker does not answer in time."""
+        self.tasks += 1
+        self.conn.send((content, ext, parse, timed))
+        if not self.conn.poll(timeout):
+            raise ExtractionTimeout(f"Extraction exceeded {timeout:g}s")
+        status, payload = self.conn.recv()
+        if status == "fatal":
+            self.broken = True
+        if status != "ok":
+            raise ExtractionError(payload)
+        return payload
+
+    def alive(self) -> bool:
+        return not self.broken and self.process.is_alive()
+
+    def kill(self) -> None:
+        try:
+            self.conn.close()
+        finally:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(timeout=5)
+
+
+class ExtractionService:
+    """Bounded pool of extraction processes awaited from async handlers.
+
+    Each document runs in a separate process with an address-space limit and
+    a wall-clock timeout. Workers that time out, crash or run out of memory
+    are killed and replaced, so a malformed PDF cannot stall the event loop
+    or hold a worker forever.
+    """
+
+    def __init__(
+        self,
+        workers: int = EXTRACTION_WORKERS,
+        timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+        memory_limit_mb: int = EXTRACTION_MEMORY_LIMIT_MB,
+        max_queue: int = EXTRACTION_MAX_QUEUE,
+        max_tasks_per_worker: int = EXTRACTION_MAX_TASKS_PER_WORKER,
+    ):
+        self.size = max(1, workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_queue = max_queue
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._ctx = mp.get_context("spawn")
+        self._idle: list[_Worker] = []
+        self._started = 0
+        self._lock = threading.Lock()
+        self._slots: asyncio.Semaphore | None = None
+        # Threads only block on worker pipes, so one per worker is enough
+        self._threads = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="extract")
+        self._waiting = 0
+        self._busy = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._recycled = 0
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+                self._started -= 1
+                self._recycled += 1
+            self._started += 1
+        return _Worker(self._ctx, self.memory_limit_mb)
+
+    def _checkin(self, worker: _Worker, healthy: bool) -> None:
+        if healthy and worker.alive() and worker.tasks < self.max_tasks_per_worker:
+            with self._lock:
+                self._idle.append(worker)
+            return
+        worker.kill()
+        with self._lock:
+            self._started -= 1
+            self._recycled += 1
+
+    def _run(self, content: bytes, ext: str, parse: bool, timed: bool) -> Any:
+        worker = self._checkout()
+        healthy = False
+        try:
+            result = worker.run(content, ext, parse, timed, self.timeout)
+            healthy = True
+            return result
+        except ExtractionTimeout:
+            with self._lock:
+                self._timeouts += 1
+            raise
+        except ExtractionError:
+            healthy = worker.alive()
+            raise
+        except (EOFError, OSError) as e:
+            raise ExtractionError(f"Extraction worker died: {e}") from e
+        finally:
+            self._checkin(worker, healthy)
+
+    async def extract(self, content: bytes, ext: str) -> str:
+        """Extract text from an uploaded document without blocking the event loop."""
+        return await self._submit(content, ext, False, False)
+
+    async def extract_and_parse(
+        self, content: bytes, ext: str, debug: bool = False
+    ) -> tuple[str, dict[str, Any], list[ExtractorTiming] | None]:
+        """Extract text and run parse_resume_content in the same worker.
+
+        Extractor timings are collected when parse hooks are registered in
+        this process (they are replayed to the hooks here) or debug is set.
+        """
+        hooks = parse_hooks_enabled()
+        text, parsed, timings = await self._submit(content, ext, True, debug or hooks)
+        if timings and hooks:
+            emit_parse_timings(timings)
+        return text, parsed, timings
+
+    async def _submit(self, content: bytes, ext: str, parse: bool, timed: bool) -> Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        if self._waiting >= self.max_queue:
+            raise ExtractionBusy("Extraction queue is full, try again later")
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._busy += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._threads, self._run, content, ext, parse, timed)
+            self._completed += 1
+            return result
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._busy -= 1
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        """Pool saturation counters for monitoring."""
+        return {
+            "workers": self.size,
+            "started": self._started,
+            "busy": self._busy,
+            "queueDepth": self._waiting,
+            "maxQueue": self.max_queue,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "recycled": self._recycled,
+            "timeoutSeconds": self.timeout,
+            "memoryLimitMb": self.memory_limit_mb,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.kill()
+        self._threads.shutdown(wait=False)
+
+
+_service: ExtractionService | None = None
+
+
+def get_extraction_service() -> ExtractionService:
+    global _service
+    if _service is None:
+        _service = ExtractionService()
+    return _service
+
+
+def shutdown_extraction_service() -> None:
+    global _service
+    if _service is not None:
+        _service.shutdown()
+        _service = None
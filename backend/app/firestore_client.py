@@ -3,6 +3,7 @@ from typing import Protocol, Any
 
 import firebase_admin  # type: ignore
 from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP
 from google.cloud.firestore_v1.collection import CollectionReference
 
 # Define type alias for records stored in Firestore
@@ -28,14 +29,15 @@ def get_firestore_client() -> firestore.Client:
 
 def save_parsed_resume(resume_id: str, data: FirestoreData) -> None:
     db = _client()
-    db.collection("resumes").document(resume_id).set(data, merge=True)
+    db.collection("resumes").document(resume_id).set({**data, "updatedAt": SERVER_TIMESTAMP}, merge=True)
 
 
 def save_match(resume_id: str, score: int, reasons: list[str]) -> None:
     db = _client()
     db.collection("resumes").document(resume_id).set({
         "matchScore": score,
-        "matchReasons": reasons
+        "matchReasons": reasons,
+        "updatedAt": SERVER_TIMESTAMP
     }, merge=True)
 
 
@@ -48,7 +50,8 @@ def save_embedding(resume_id: str, vector: list[float], source: str = "miniLM"):
     db = _client()
     db.collection("resumes").document(resume_id).set({
         "embedding": vector,
-        "embeddingModel": source
+        "embeddingModel": source,
+        "updatedAt": SERVER_TIMESTAMP
     }, merge=True)
 
 
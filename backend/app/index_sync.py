@@ -0,0 +1,236 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from app.metrics import registry
+from app.text_index import get_text_index
+from app.vector_index import (
+    COMPACT_EMBEDDING_FIELDS, EMBEDDING_QUANTIZATION, INDEX_FIELDS, get_vector_index, resume_metadata, stored_vector,
+)
+
+logger = logging.getLogger(__name__)
+
+# "listen" follows the resumes collection with a Firestore snapshot listener,
+# "poll" rescans it every INDEX_SYNC_POLL_SECONDS, "auto" listens unless
+# FIRESTORE_EMULATOR_HOST is set, and "off" leaves indexes to this worker's
+# own writes
+INDEX_SYNC_MODE = os.getenv("INDEX_SYNC_MODE", "auto").lower()
+INDEX_SYNC_POLL_SECONDS = float(os.getenv("INDEX_SYNC_POLL_SECONDS", "5"))
+# Polls only see changed documents, so deletes are found by listing ids this often
+INDEX_SYNC_DELETE_SCAN_SECONDS = float(os.getenv("INDEX_SYNC_DELETE_SCAN_SECONDS", "60"))
+
+# Server timestamp every resume write sets; polls ask for documents past the newest one seen
+UPDATED_AT_FIELD = "updatedAt"
+
+# Fields the derived indexes are built from; polling reads only these
+SYNC_FIELDS = [
+    *INDEX_FIELDS, *(COMPACT_EMBEDDING_FIELDS if EMBEDDING_QUANTIZATION else []), "text_blob", UPDATED_AT_FIELD,
+]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class IndexSync:
+    """Keeps this worker's vector and keyword indexes in step with the resumes collection.
+
+    Writes made by other workers (or anything else writing to Firestore)
+    arrive as document changes and are applied one resume at a time, in
+    memory only: the worker that made the write has already appended it to
+    the shared embedding store. The first full listing also drops resumes
+    deleted while this worker was not watching, e.g. rows left in an
+    on-disk embedding store, and those repairs are persisted. Changes this
+    worker already applied are detected and skipped by the indexes.
+
+    If the listener cannot start or closes, the worker falls back to
+    polling, which asks only for documents whose updatedAt is past the
+    newest one seen and finds deletes with a periodic id-only listing.
+    """
+
+    def __init__(self, mode: str = INDEX_SYNC_MODE, poll_seconds: float = INDEX_SYNC_POLL_SECONDS,
+                 delete_scan_seconds: float = INDEX_SYNC_DELETE_SCAN_SECONDS):
+        if mode == "auto":
+            mode = "poll" if os.getenv("FIRESTORE_EMULATOR_HOST") else "listen"
+        self.mode = mode
+        self.poll_seconds = poll_seconds
+        self.delete_scan_seconds = delete_scan_seconds
+        self._since: datetime | None = None  # newest updatedAt applied
+        self._scanned_at = 0.0  # monotonic time of the last id-only listing
+        self._reconciled = False
+        self._watch: Any = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.applied = 0
+        self.removed = 0
+        self.errors = 0
+        self.last_event_at: str | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.mode == "off" or self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="index-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        from app.firestore_client import get_firestore_client
+
+        try:
+            db = get_firestore_client()
+            # Changes are applied on top of the resident rows, so load them first
+            get_vector_index().ensure_loaded()
+        except Exception as exc:
+            logger.warning("Index sync disabled, Firestore unavailable: %s", exc)
+            return
+
+        if self.mode == "listen":
+            try:
+                self._watch = db.collection("resumes").on_snapshot(self._on_snapshot)
+            except Exception as exc:
+                logger.warning("Firestore listener unavailable, polling instead: %s", exc)
+                self.mode = "poll"
+
+        while not self._stop.is_set():
+            if self.mode == "listen":
+                # The client closes the watch on errors it cannot retry
+                if getattr(self._watch, "_closed", False):
+                    # Polling picks up from the listener's newest updatedAt; deletes
+                    # missed in between turn up in the first id listing
+                    logger.warning("Firestore listener closed, polling instead")
+                    self._watch = None
+                    self.mode = "poll"
+                    self._scanned_at = 0.0
+                    continue
+            else:
+                try:
+                    self._poll(db)
+                except Exception as exc:
+                    self.errors += 1
+                    logger.warning("Index sync poll failed: %s", exc)
+            self._stop.wait(self.poll_seconds)
+
+    def _on_snapshot(self, docs: list[Any], changes: list[Any], read_time: Any) -> None:
+        try:
+            if not self._reconciled:
+                # The first callback lists the whole collection
+                self._reconcile(docs)
+                return
+            for change in changes:
+                doc = change.document
+                if change.type.name == "REMOVED":
+                    self._apply(doc.id, None)
+                else:
+                    self._apply(doc.id, doc.to_dict(), doc.update_time)
+        except Exception:
+            # Raising here would stop the listener thread
+            self.errors += 1
+            logger.exception("Index sync failed to apply changes")
+
+    def _poll(self, db: Any) -> None:
+        resumes = db.collection("resumes")
+        if not self._reconciled:
+            self._scanned_at = time.monotonic()
+            self._reconcile(resumes.select(SYNC_FIELDS).stream())
+            return
+        changed = resumes.where(UPDATED_AT_FIELD, ">", self._since or _EPOCH).select(SYNC_FIELDS).stream()
+        for doc in changed:
+            self._apply(doc.id, doc.to_dict(), doc.update_time)
+        if time.monotonic() - self._scanned_at >= self.delete_scan_seconds:
+            self._scanned_at = time.monotonic()
+            # Ids indexed before the listing started are gone if it does not include them
+            indexed = self._indexed_ids()
+            listed = {doc.id for doc in resumes.select([]).stream()}
+            for resume_id in indexed - listed:
+                self._apply(resume_id, None)
+
+    def _reconcile(self, docs: Iterable[Any]) -> None:
+        """Bring both indexes in line with a full listing of the collection."""
+        indexed = self._indexed_ids()
+        seen: set[str] = set()
+        for doc in docs:
+            seen.add(doc.id)
+            self._apply(doc.id, doc.to_dict(), persist=True)
+        for resume_id in indexed - seen:
+            self._apply(resume_id, None, persist=True)
+        text_index = get_text_index()
+        # Every text_blob has now been through the keyword index
+        text_index.loaded = True
+        self._reconciled = True
+        logger.info("Index sync (%s) reconciled %d resumes", self.mode, len(seen))
+
+    @staticmethod
+    def _indexed_ids() -> set[str]:
+        return set(get_vector_index().ids()) | set(get_text_index().ids())
+
+    def _apply(self, resume_id: str, data: dict[str, Any] | None, update_time: Any = None,
+               persist: bool = False) -> None:
+        """Apply one resume's current state; persist also writes it to the embedding store."""
+        vector_index, text_index = get_vector_index(), get_text_index()
+        with self._lock:
+            if data is None:
+                removed = vector_index.remove(resume_id, persist=persist) | text_index.remove(resume_id)
+                self.removed += int(removed)
+            else:
+                embedding = stored_vector(data, vector_index.quantization)
+                if embedding is not None:
+                    vector_index.refresh(resume_id, embedding, resume_metadata(data), persist=persist)
+                else:
+                    vector_index.remove(resume_id, persist=persist)
+                blob = data.get("text_blob")
+                if blob:
+                    text_index.refresh(resume_id, blob)
+                else:
+                    text_index.remove(resume_id)
+                self.applied += 1
+                updated_at = data.get(UPDATED_AT_FIELD)
+                if isinstance(updated_at, datetime) and (self._since is None or updated_at > self._since):
+                    self._since = updated_at
+        self.last_event_at = datetime.now().isoformat()
+        if update_time is not None:
+            registry.histogram("index_sync.lag.seconds").observe(max(0.0, time.time() - update_time.timestamp()))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "running": self.running,
+            "reconciled": self._reconciled,
+            "since": self._since.isoformat() if self._since else None,
+            "applied": self.applied,
+            "removed": self.removed,
+            "errors": self.errors,
+            "lastEventAt": self.last_event_at,
+        }
+
+
+_sync: IndexSync | None = None
+
+
+def get_index_sync() -> IndexSync:
+    global _sync
+    if _sync is None:
+        _sync = IndexSync()
+    return _sync
+
+
+def shutdown_index_sync() -> None:
+    global _sync
+    if _sync is not None:
+        _sync.stop()
+        _sync = None
@@ -1,9 +1,22 @@
+import asyncio
+import logging
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import routers
 from app.routes import users, analytics, admin, jobs, resumes, applications, notifications
+from app.embeddings import shutdown_embedding_batcher
+from app.extraction import shutdown_extraction_service
+from app.index_sync import get_index_sync, shutdown_index_sync
+from app.metrics import record_extractor_timing
+from app.parse_cache import get_parse_cache
+from app.parsing import add_parse_hook
+
+logger = logging.getLogger(__name__)
+
+# Startup prune of the parse cache; held so the task is not garbage collected mid-run
+_parse_cache_prune: "asyncio.Task | None" = None
 
 # Initialize FastAPI app with metadata
 app = FastAPI(
@@ -14,6 +27,10 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Per-extractor timing histograms (served at /api/admin/metrics); PARSE_METRICS=0 disables
+if os.getenv("PARSE_METRICS", "1") != "0":
+    add_parse_hook(record_extractor_timing)
+
 # CORS setup
 origins = [o.strip() for o in os.getenv("ALLOWED_ORIGINS", "").split(",") if o.strip()]
 
@@ -47,6 +64,29 @@ app.include_router(jobs.router)
 app.include_router(applications.router)
 app.include_router(notifications.router)
 
+@app.on_event("startup")
+def start_index_sync() -> None:
+    """Follow resume changes from other workers (INDEX_SYNC_MODE=off disables)."""
+    get_index_sync().start()
+
+@app.on_event("startup")
+async def prune_parse_cache() -> None:
+    """Drop parse cache files from other parser versions or budgets, and trim to its size cap."""
+    global _parse_cache_prune
+    _parse_cache_prune = asyncio.create_task(asyncio.to_thread(get_parse_cache().prune))
+    _parse_cache_prune.add_done_callback(_log_prune_failure)
+
+def _log_prune_failure(task: "asyncio.Task") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Parse cache prune failed", exc_info=task.exception())
+
+@app.on_event("shutdown")
+def shutdown_workers() -> None:
+    """Stop background worker pools."""
+    shutdown_index_sync()
+    shutdown_extraction_service()
+    shutdown_embedding_batcher()
+
 # Health check endpoint
 @app.get("/health", tags=["health"])
 def health_check() -> dict[str, str]:
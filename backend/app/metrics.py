@@ -0,0 +1,93 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Any
+
+# Upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count and sum, safe to observe from any thread."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        bounds = [str(b) for b in self.buckets] + ["+Inf"]
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "mean": round(total / count, 6) if count else 0.0,
+            "buckets": dict(zip(bounds, counts)),
+        }
+
+
+class Counter:
+    """Monotonic counter."""
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class MetricsRegistry:
+    """Process-local named metrics, created on first use."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, Histogram] = {}
+        self._counters: dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        hist = self._histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(name, Histogram(buckets))
+        return hist
+
+    def counter(self, name: str) -> Counter:
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(name, Counter())
+        return counter
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "histograms": {name: h.snapshot() for name, h in sorted(self._histograms.items())},
+            "counters": {name: c.value for name, c in sorted(self._counters.items())},
+        }
+
+
+registry = MetricsRegistry()
+
+
+def record_extractor_timing(extractor: str, seconds: float, input_chars: int) -> None:
+    """Parse hook that feeds per-extractor latency and input size histograms."""
+    registry.histogram(f"parse.{extractor}.seconds").observe(seconds)
+    registry.histogram(f"parse.{extractor}.input_chars", SIZE_BUCKETS).observe(input_chars)
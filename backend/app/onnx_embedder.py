@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker deployments only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+CONFIG_FILE = "embedder.json"
+
+
+def export_onnx(model_name: str, directory: str) -> str:
+    """Export a sentence-transformers model's encoder to ONNX and quantize it to int8.
+
+    Needs torch and sentence-transformers; returns the int8 model path.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    os.makedirs(directory, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(directory, FP32_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic,
+            opset_version=14,
+        )
+    int8_path = os.path.join(directory, INT8_FILE)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(directory)
+    with open(os.path.join(directory, CONFIG_FILE), "w", encoding="utf-8") as fh:
+        json.dump({"model": model_name, "max_seq_length": st_model.max_seq_length}, fh)
+    logger.info("Exported %s to %s", model_name, int8_path)
+    return int8_path
+
+
+@contextmanager
+def _export_lock(directory: str):
+    """Exclusive lock shared by every process exporting into directory."""
+    os.makedirs(os.path.dirname(directory), exist_ok=True)
+    with open(directory + ".lock", "a") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def install_onnx_export(model_name: str, directory: str, force: bool = False) -> None:
+    """Export into a temporary sibling directory and swap it in as directory.
+
+    Runs under a file lock, so workers starting together on an empty
+    directory export once: the others wait and then find the finished
+    export. Readers never see a partial one, since CONFIG_FILE (written
+    last) only appears with the rename. force re-exports over an existing
+    export.
+    """
+    target = os.path.abspath(directory)
+    with _export_lock(target):
+        if not force and os.path.exists(os.path.join(target, CONFIG_FILE)):
+            return
+        staging = tempfile.mkdtemp(prefix=os.path.basename(target) + ".", dir=os.path.dirname(target))
+        try:
+            export_onnx(model_name, staging)
+            if os.path.exists(target):
+                stale = staging + ".old"
+                os.replace(target, stale)
+                os.replace(staging, target)
+                shutil.rmtree(stale, ignore_errors=True)
+            else:
+                os.replace(staging, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+class OnnxEmbedder:
+    """Mean-pooled sentence embeddings from an exported ONNX encoder on onnxruntime's CPU provider.
+
+    encode() mirrors SentenceTransformer.encode for the arguments this app
+    uses, so it can stand in for the torch model.
+    """
+
+    def __init__(self, directory: str, threads: int = 0, quantized: bool = True):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer  # type: ignore
+
+        with open(os.path.join(directory, CONFIG_FILE), "r", encoding="utf-8") as fh:
+            config = json.load(fh)
+        self.max_seq_length = int(config.get("max_seq_length", 256))
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.path = os.path.join(directory, INT8_FILE if quantized else FP32_FILE)
+        self.session = ort.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, sentences: Iterable[str], batch_size: int = 32,
+               normalize_embeddings: bool = False, **_: object) -> np.ndarray:
+        texts = list(sentences)
+        out: list[np.ndarray] = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feed = {name: tokens[name].astype(np.int64) for name in self._inputs if name in tokens}
+            hidden = self.session.run(None, feed)[0]
+            mask = tokens["attention_mask"].astype(np.float32)[:, :, None]
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            out.append(pooled.astype(np.float32))
+        embeddings = np.concatenate(out) if out else np.zeros((0, 0), dtype=np.float32)
+        if normalize_embeddings and len(embeddings):
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+
+
+def load_onnx_embedder(model_name: str, directory: str, threads: int = 0, quantized: bool = True) -> OnnxEmbedder:
+    """Open the exported model, exporting it first if the directory has no complete export."""
+    if not os.path.exists(os.path.join(directory, CONFIG_FILE)):
+        install_onnx_export(model_name, directory)
+    return OnnxEmbedder(directory, threads=threads, quantized=quantized)
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.embedding_store import BACKEND_DIR
+from app.parsing import PARSE_MAX_CHARS, PARSER_VERSION, PDF_MAX_CHARS, PDF_MAX_PAGES
+
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "512"))
+# Empty disables the on-disk tier; relative paths are resolved against the
+# backend directory, not the CWD
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", ".cache/parse")
+# The disk tier evicts least recently used files past this many bytes (0 = no limit)
+PARSE_CACHE_DISK_BYTES = int(os.getenv("PARSE_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+
+# Everything that changes parse output for the same bytes; entries written
+# under other settings are never read, and are purged from disk
+_KEY_SUFFIX = "v{}-{}".format(
+    PARSER_VERSION,
+    hashlib.sha256(f"{PDF_MAX_PAGES}:{PDF_MAX_CHARS}:{PARSE_MAX_CHARS}".encode()).hexdigest()[:8],
+)
+
+CacheEntry = dict[str, Any]  # {"text": str, "parsed": dict}
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 of the uploaded bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class ParseCache:
+    """Content-addressed cache of extracted text and parse output.
+
+    Entries are keyed by the upload hash, file type, PARSER_VERSION and the
+    extraction budgets, so a parser or budget change never serves stale
+    results. Lookups hit an in-process LRU first and fall back to JSON files
+    on local disk, which survive restarts and are shared by workers on the
+    same host. The disk tier is kept under max_bytes by deleting the files
+    with the oldest mtime (hits refresh it); disk I/O runs off the event
+    loop.
+    """
+
+    def __init__(self, max_entries: int = PARSE_CACHE_SIZE, directory: str = PARSE_CACHE_DIR,
+                 max_bytes: int = PARSE_CACHE_DISK_BYTES):
+        self.max_entries = max(0, max_entries)
+        self.directory = directory
+        self.max_bytes = max(0, max_bytes)
+        self._lru: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bytes this worker believes are on disk; other workers write too,
+        # so pruning rescans the directory rather than trusting it
+        self._disk_bytes: int | None = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.purged = 0
+
+    @staticmethod
+    def key(digest: str, ext: str) -> str:
+        return f"{digest}-{ext}-{_KEY_SUFFIX}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        if self.directory:
+            entry = await asyncio.to_thread(self._read, key)
+            if entry is not None:
+                self._remember(key, entry)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def put(self, key: str, text: str, parsed: dict[str, Any]) -> None:
+        entry: CacheEntry = {"text": text, "parsed": parsed}
+        self._remember(key, entry)
+        if self.directory:
+            await asyncio.to_thread(self._write, key, entry)
+
+    def _read(self, key: str) -> CacheEntry | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+            os.utime(path)  # mtime is the disk tier's recency
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file and rename so readers never see partial JSON
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        except OSError:
+            return  # the disk tier is best effort
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+            over = self.max_bytes and (self._disk_bytes is None or self._disk_bytes > self.max_bytes)
+        if over:
+            self.prune()
+
+    def prune(self) -> None:
+        """Delete entries from other parser versions or budgets, then the oldest past max_bytes.
+
+        Evicts down to 90% of the cap so a full cache does not rescan on
+        every write.
+        """
+        if not self.directory:
+            return
+        now = time.time()
+        files: list[tuple[float, int, str]] = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                    if not name.endswith(f"-{_KEY_SUFFIX}.json"):
+                        # Other versions, and temp files orphaned by a crash
+                        # mid-write (recent ones may still be in use)
+                        if name.endswith(".json") or (name.endswith(".tmp") and st.st_mtime < now - 3600):
+                            os.remove(path)
+                            self.purged += 1
+                        continue
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        if self.max_bytes and total > self.max_bytes:
+            files.sort()
+            target = self.max_bytes * 9 // 10
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "directory": self.directory or None,
+            "diskBytes": self._disk_bytes,
+            "maxDiskBytes": self.max_bytes,
+            "evicted": self.evicted,
+            "purged": self.purged,
+        }
+
+
+_cache: ParseCache | None = None
+
+
+def get_parse_cache() -> ParseCache:
+    global _cache
+    if _cache is None:
+        _cache = ParseCache(directory=os.path.join(BACKEND_DIR, PARSE_CACHE_DIR) if PARSE_CACHE_DIR else "")
+    return _cache
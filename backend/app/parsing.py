@@ -1,37 +1,349 @@
 from io import BytesIO
+from collections.abc import Callable, Iterator
 from typing import Literal, Dict, List, Optional, Any
+import os
+import time
+import zipfile
+from xml.etree.ElementTree import ParseError, iterparse
 import mammoth
-from pdfminer.high_level import extract_text
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LAParams, LTTextContainer
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
 import re
 import json
 from datetime import datetime
 
+from app.sections import ResumeSections, segment_sections
+from app.skills import get_skill_matcher
+
+# Bump whenever extraction or parsing output changes; cached parses are keyed on it
+PARSER_VERSION = "4"
+
+# Most fields live on the first pages; stop PDF extraction once either budget is hit
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "40000"))
+
+def _page_may_have_text(page: PDFPage) -> bool:
+    """Cheap check on page resources: no fonts and only image XObjects means no text."""
+    resources = resolve1(page.resources) or {}
+    if resolve1(resources.get("Font")):
+        return True
+    xobjects = resolve1(resources.get("XObject")) or {}
+    for xobj in xobjects.values():
+        # Form XObjects carry their own resources and may draw text
+        subtype = getattr(resolve1(xobj), "attrs", {}).get("Subtype")
+        if getattr(subtype, "name", None) != "Image":
+            return True
+    return False
+
+def iter_pdf_pages(content: bytes, max_pages: int = PDF_MAX_PAGES) -> Iterator[str]:
+    """Yield the text of each PDF page in order, skipping image-only pages.
+
+    Pages are laid out one at a time, so callers that stop iterating early
+    never pay for the rest of the document. max_pages <= 0 means no limit.
+    """
+    resource_manager = PDFResourceManager(caching=True)
+    device = PDFPageAggregator(resource_manager, laparams=LAParams())
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    for page in PDFPage.get_pages(BytesIO(content), maxpages=max(0, max_pages), caching=True):
+        if not _page_may_have_text(page):
+            continue
+        interpreter.process_page(page)
+        layout = device.get_result()
+        yield "".join(
+            element.get_text() for element in layout if isinstance(element, LTTextContainer)
+        )
+
+def pdf_to_text(content: bytes, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS) -> str:
+    """Extract PDF text page by page until the page or character budget is reached."""
+    pages: List[str] = []
+    total = 0
+    for page_text in iter_pdf_pages(content, max_pages):
+        pages.append(page_text)
+        total += len(page_text)
+        if max_chars > 0 and total >= max_chars:
+            break
+    return "\n".join(pages)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+
+def _docx_main_part(archive: zipfile.ZipFile) -> str:
+    """Locate the main document part from the package relationships."""
+    try:
+        with archive.open("_rels/.rels") as fh:
+            for _, elem in iterparse(fh):
+                if elem.tag == f"{_REL}Relationship" and elem.get("Type") == _OFFICE_DOCUMENT:
+                    return elem.get("Target", "word/document.xml").lstrip("/")
+    except (KeyError, ParseError):
+        pass
+    return "word/document.xml"
+
+def iter_docx_lines(content: bytes) -> Iterator[str]:
+    """Stream paragraphs (including table-cell paragraphs) out of a DOCX as lines.
+    
+    Reads the document XML incrementally and discards each paragraph once
+    emitted, so memory stays flat regardless of document size.
+    """
+    with zipfile.ZipFile(BytesIO(content)) as archive:
+        with archive.open(_docx_main_part(archive)) as fh:
+            parts: List[str] = []
+            for _, elem in iterparse(fh):
+                tag = elem.tag
+                if tag == f"{_W}t":
+                    if elem.text:
+                        parts.append(elem.text)
+                elif tag == f"{_W}tab":
+                    parts.append("\t")
+                elif tag in (f"{_W}br", f"{_W}cr"):
+                    parts.append("\n")
+                elif tag == f"{_W}p":
+                    yield from "".join(parts).split("\n")
+                    parts.clear()
+                    elem.clear()
+                elif tag == f"{_W}tbl":
+                    elem.clear()
+
+def docx_to_text(content: bytes) -> str:
+    """Extract DOCX text with one line per paragraph or table cell.
+
+    Runs of spaces collapse to one; tabs are kept so tab-separated fields
+    ("Engineer\tJan 2020 - Present") stay separate.
+    """
+    try:
+        lines = (re.sub(r"[ \xa0]+", " ", line).strip() for line in iter_docx_lines(content))
+        return "\n".join(line for line in lines if line)
+    except (KeyError, ParseError):
+        # Unusual packages: fall back to mammoth. It converts to HTML-ish text; strip tags
+        html = mammoth.convert_to_html(BytesIO(content)).value
+        txt = re.sub("<[^<]+?>", " ", html)
+        return re.sub(r"\s+", " ", txt).strip()
+
 def bytes_to_text(content: bytes, ext: Literal["pdf","docx","txt"]) -> str:
     """Extract text from various file formats."""
     if ext == "txt":
         return content.decode(errors="ignore")
     if ext == "docx":
-        # Mammoth converts to HTML-ish text; we strip tags by removing '<...>'
-        html = mammoth.convert_to_html(BytesIO(content)).value
-        # quick strip
-        txt = re.sub("<[^<]+?>", " ", html)
-        return re.sub(r"\s+", " ", txt).strip()
+        return docx_to_text(content)
     if ext == "pdf":
-        # pdfminer can read from bytes via BytesIO
-        return extract_text(BytesIO(content))
+        return pdf_to_text(content)
     raise ValueError("Unsupported file type")
 
-def parse_resume_content(text: str) -> Dict[str, Any]:
-    """Parse resume text and extract structured information."""
-    parsed_data = {
-        "contact": extract_contact_info(text),
-        "skills": extract_skills(text),
-        "experience": extract_experience(text),
-        "education": extract_education(text),
-        "summary": extract_summary(text),
-        "certifications": extract_certifications(text),
-        "languages": extract_languages(text)
-    }
+# (extractor name, wall seconds, input chars)
+ExtractorTiming = tuple[str, float, int]
+ParseHook = Callable[[str, float, int], None]
+
+_parse_hooks: List[ParseHook] = []
+
+def add_parse_hook(hook: ParseHook) -> None:
+    """Call hook(extractor, seconds, input_chars) after every extractor run."""
+    if hook not in _parse_hooks:
+        _parse_hooks.append(hook)
+
+def remove_parse_hook(hook: ParseHook) -> None:
+    if hook in _parse_hooks:
+        _parse_hooks.remove(hook)
+
+def parse_hooks_enabled() -> bool:
+    return bool(_parse_hooks)
+
+def emit_parse_timings(timings: List[ExtractorTiming]) -> None:
+    """Deliver timings (e.g. collected in a worker process) to the registered hooks."""
+    for name, seconds, size in timings:
+        for hook in _parse_hooks:
+            hook(name, seconds, size)
+
+# Wall-clock budget per extractor. Bounded searches check it between candidate
+# regions and return what they found so far once it is spent (0 disables).
+EXTRACTOR_BUDGET_SECONDS = float(os.getenv("EXTRACTOR_BUDGET_SECONDS", "0.25"))
+# Extractors are linear-time, so capping their input bounds the whole parse
+PARSE_MAX_CHARS = int(os.getenv("PARSE_MAX_CHARS", "100000"))
+
+class _Deadline:
+    __slots__ = ("at",)
+
+    def __init__(self, budget: float):
+        self.at = time.perf_counter() + budget if budget > 0 else None
+
+    def expired(self) -> bool:
+        return self.at is not None and time.perf_counter() > self.at
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# RFC 5321 limits: 64-char local part, 255-char domain
+_EMAIL_BEFORE, _EMAIL_AFTER = 64, 256
+# Real resumes have a handful of '@'; stop after this many candidates
+_EMAIL_MAX_CANDIDATES = 50
+
+PHONE_PATTERNS = [
+    re.compile(r'\+?\d{1,3}[\s\-\.]?\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4}'),
+    re.compile(r'\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4}'),
+    re.compile(r'\d{3}[\s\-\.]\d{3}[\s\-\.]\d{4}')
+]
+
+# Searched one line at a time with bounded name lengths, so each start
+# position costs at most ~40 steps instead of rescanning the rest of the text
+LOCATION_PATTERNS = [
+    re.compile(r'[A-Za-z][A-Za-z \t]{0,40},[ \t]*[A-Z]{2}[ \t]*\d{5}'),  # City, ST ZIP
+    re.compile(r'[A-Za-z][A-Za-z \t]{0,40},[ \t]*[A-Z]{2}(?![A-Za-z])'),  # City, ST
+    re.compile(r'[A-Za-z][A-Za-z \t]{0,40},[ \t]*[A-Za-z][A-Za-z \t]{0,30}\d{5}')  # City, State ZIP
+]
+
+DATE_RANGE_PATTERN = re.compile(r'\d{4}\s*[\-–]\s*(?:\d{4}|Present|Current)')
+# How far back from a date range to look for "Title Company" on the same line
+_JOB_LOOKBACK = 200
+_JOB_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz \t,&.")
+
+def _find_email(text: str, deadline: _Deadline) -> Optional[str]:
+    """Search only a bounded window around each '@' instead of the whole text."""
+    at = text.find("@")
+    for _ in range(_EMAIL_MAX_CANDIDATES):
+        if at == -1 or deadline.expired():
+            break
+        start = max(0, at - _EMAIL_BEFORE)
+        match = EMAIL_PATTERN.search(text, start, at + _EMAIL_AFTER)
+        if match:
+            return match.group()
+        at = text.find("@", at + 1)
+    return None
+
+def _find_location(text: str, deadline: _Deadline) -> Optional[str]:
+    """First City, ST [ZIP] style match; only lines containing a comma are searched."""
+    lines = [line for line in text.split("\n") if "," in line]
+    for pattern in LOCATION_PATTERNS:
+        for line in lines:
+            if deadline.expired():
+                return None
+            match = pattern.search(line)
+            if match:
+                return match.group().strip()
+    return None
+
+def _find_jobs(text: str, deadline: _Deadline) -> Iterator[tuple[str, str, str]]:
+    """Yield (title, company, duration) for each date range preceded by "Title Company".
+    
+    Date ranges are found with a linear scan; the title and company are the
+    run of letters, spaces and ",&." just before the range on the same line,
+    split at the last space.
+    """
+    prev_end = 0
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        if deadline.expired():
+            return
+        window_start = max(prev_end, match.start() - _JOB_LOOKBACK)
+        prev_end = match.end()
+        line_start = text.rfind("\n", window_start, match.start()) + 1 or window_start
+        region = text[line_start:match.start()]
+        
+        i = len(region)
+        while i > 0 and region[i - 1] in _JOB_CHARS:
+            i -= 1
+        words = region[i:].strip().rsplit(None, 1)
+        if len(words) == 2:
+            yield words[0].strip(), words[1].strip(), match.group().strip()
+
+DEGREE_PATTERN = re.compile(r'\b(Bachelor|Master|PhD|Doctor|Associate|B\.?[AS]|M\.?[AS]|M\.?B\.?A|Ph\.?D)\b')
+SCHOOL_PATTERN = re.compile(r'(?:University|College|Institute)(?:[ \t]+(?:of|for|and|&)(?:[ \t]+[A-Z][A-Za-z]*){1,4})?')
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+# Longest school name walked back from its keyword, and longest line inspected
+_SCHOOL_LOOKBACK = 80
+_EDU_LINE_CHARS = 500
+_SCHOOL_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz \t&.'")
+
+def _school_on(line: str, floor: int = 0) -> Optional[tuple[int, str]]:
+    """(start, name) of the first "... University/College/Institute" in line at or after floor."""
+    match = SCHOOL_PATTERN.search(line, floor)
+    if not match:
+        return None
+    i = match.start()
+    lowest = max(floor, match.start() - _SCHOOL_LOOKBACK)
+    while i > lowest and line[i - 1] in _SCHOOL_CHARS:
+        i -= 1
+    name = line[i:match.end()].strip(" \t&.'")
+    return i, name
+
+def _find_degrees(text: str, deadline: _Deadline) -> Iterator[Dict[str, str]]:
+    """Yield one entry per degree keyword that has a school on its line (or the next).
+    
+    Every search is bounded to one capped line, so total work is linear in
+    the section length.
+    """
+    lines = [line[:_EDU_LINE_CHARS] for line in text.split("\n")]
+    for index, line in enumerate(lines):
+        if deadline.expired():
+            return
+        degree = DEGREE_PATTERN.search(line)
+        if not degree:
+            continue
+        
+        field = ""
+        school = _school_on(line, degree.end())
+        if school is not None:
+            field = line[degree.end():school[0]]
+        else:
+            school = _school_on(line)
+            if school is None and index + 1 < len(lines):
+                # "Bachelor of Science in CS" with the school on the following line
+                field = line[degree.end():]
+                school = _school_on(lines[index + 1])
+                line = line + " " + lines[index + 1]
+        if school is None:
+            continue
+        
+        year = YEAR_PATTERN.search(line)
+        yield {
+            "degree": degree.group(1),
+            "fieldOfStudy": re.sub(r'^(?:of|in)\b', '', field.strip(" \t.,-–|")).strip(" \t,"),
+            "school": school[1],
+            "year": year.group() if year else ""
+        }
+
+def parse_resume_content(text: str, debug: bool = False) -> Dict[str, Any]:
+    """Parse resume text and extract structured information.
+    
+    Only the first PARSE_MAX_CHARS characters are parsed. Extractors are
+    only timed when a parse hook is registered or debug is set; with debug
+    the timings are also returned under "debug".
+    """
+    if PARSE_MAX_CHARS > 0:
+        text = text[:PARSE_MAX_CHARS]
+    timings: Optional[List[ExtractorTiming]] = [] if (debug or _parse_hooks) else None
+    
+    # Segment once; section-based extractors only see their own slice
+    if timings is None:
+        sections = segment_sections(text)
+    else:
+        start = time.perf_counter()
+        sections = segment_sections(text)
+        timings.append(("sections", time.perf_counter() - start, len(text)))
+    
+    # (field, extractor, args, section it reads or None for the full text)
+    steps = (
+        ("contact", extract_contact_info, (text,), None),
+        ("skills", extract_skills, (text, sections), None),
+        ("experience", extract_experience, (text, sections), "experience"),
+        ("education", extract_education, (text, sections), "education"),
+        ("summary", extract_summary, (text, sections), "summary"),
+        ("certifications", extract_certifications, (text, sections), "certifications"),
+        ("languages", extract_languages, (text,), None),
+    )
+    
+    parsed_data: Dict[str, Any] = {}
+    for name, extractor, args, label in steps:
+        if timings is None:
+            parsed_data[name] = extractor(*args)
+        else:
+            start = time.perf_counter()
+            parsed_data[name] = extractor(*args)
+            size = len(text) if label is None else sections.size(label)
+            timings.append((name, time.perf_counter() - start, size))
+    
+    if timings is not None:
+        emit_parse_timings(timings)
+        if debug:
+            parsed_data["debug"] = {"timings": timings}
     
     return parsed_data
 
@@ -46,21 +358,14 @@ def extract_contact_info(text: str) -> Dict[str, Optional[str]]:
         "github": None
     }
     
+    deadline = _Deadline(EXTRACTOR_BUDGET_SECONDS)
+    
     # Email extraction
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, text)
-    if email_match:
-        contact_info["email"] = email_match.group()
-    
-    # Phone extraction (various formats)
-    phone_patterns = [
-        r'\+?\d{1,3}[\s\-\.]?\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4}',
-        r'\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4}',
-        r'\d{3}[\s\-\.]\d{3}[\s\-\.]\d{4}'
-    ]
+    contact_info["email"] = _find_email(text, deadline)
     
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, text)
+    # Phone extraction (various formats); patterns only use bounded repeats
+    for pattern in PHONE_PATTERNS:
+        phone_match = pattern.search(text)
         if phone_match:
             contact_info["phone"] = phone_match.group().strip()
             break
@@ -89,109 +394,42 @@ def extract_contact_info(text: str) -> Dict[str, Optional[str]]:
                 break
     
     # Location extraction (look for city, state patterns)
-    location_patterns = [
-        r'([A-Za-z\s]+),\s*([A-Z]{2})\s*\d{5}',  # City, ST ZIP
-        r'([A-Za-z\s]+),\s*([A-Z]{2})',  # City, ST
-        r'([A-Za-z\s]+),\s*([A-Za-z\s]+)\s*\d{5}'  # City, State ZIP
-    ]
-    
-    for pattern in location_patterns:
-        location_match = re.search(pattern, text)
-        if location_match:
-            contact_info["location"] = location_match.group().strip()
-            break
+    contact_info["location"] = _find_location(text, deadline)
     
     return contact_info
 
-def extract_skills(text: str) -> List[str]:
+def extract_skills(text: str, sections: Optional[ResumeSections] = None) -> List[str]:
     """Extract skills from resume text."""
-    # Common technical skills database
-    skill_database = [
-        # Programming Languages
-        'JavaScript', 'Python', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust', 'Swift',
-        'Kotlin', 'TypeScript', 'Scala', 'R', 'MATLAB', 'Perl', 'Shell', 'Bash',
-        
-        # Web Technologies
-        'React', 'Angular', 'Vue.js', 'Node.js', 'Express.js', 'Next.js', 'Nuxt.js',
-        'HTML', 'CSS', 'SASS', 'LESS', 'Bootstrap', 'Tailwind CSS', 'jQuery',
-        
-        # Databases
-        'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server',
-        'DynamoDB', 'Cassandra', 'Elasticsearch', 'Firebase',
-        
-        # Cloud & DevOps
-        'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI',
-        'GitHub Actions', 'Terraform', 'Ansible', 'Chef', 'Puppet',
-        
-        # Data Science & ML
-        'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib',
-        'Seaborn', 'Jupyter', 'Apache Spark', 'Hadoop', 'Tableau', 'Power BI',
-        
-        # Mobile Development
-        'React Native', 'Flutter', 'iOS Development', 'Android Development',
-        'Xamarin', 'Ionic', 'Cordova',
-        
-        # Other Technologies
-        'Git', 'SVN', 'REST API', 'GraphQL', 'JSON', 'XML', 'YAML',
-        'Linux', 'Windows', 'macOS', 'Ubuntu', 'CentOS'
-    ]
-    
-    found_skills = []
-    text_lower = text.lower()
-    
-    # Look for skills in the database
-    for skill in skill_database:
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            found_skills.append(skill)
-    
-    # Look for skills in common sections
-    skills_sections = ['skills', 'technical skills', 'technologies', 'tools', 'expertise']
-    
-    for section in skills_sections:
-        section_pattern = rf'{section}:?\s*([^\n{{2-5}}]+)'
-        section_match = re.search(section_pattern, text_lower)
-        if section_match:
-            section_text = section_match.group(1)
-            # Extract comma or bullet-separated items
-            items = re.split(r'[,•·\-\n]', section_text)
-            for item in items:
-                skill = item.strip().title()
-                if skill and len(skill.split()) <= 3 and skill not in found_skills:
-                    found_skills.append(skill)
+    # Single pass over the text with the shared skill trie
+    found_skills = get_skill_matcher().find_all(text)
+    
+    # Look for listed items in the skills section
+    if sections is None:
+        sections = segment_sections(text)
+    section_text = sections.text("skills").lower()
+    if section_text:
+        # Extract comma or bullet-separated items
+        items = re.split(r'[,•·\-\n]', section_text)
+        for item in items:
+            skill = item.strip().title()
+            if skill and len(skill.split()) <= 3 and skill not in found_skills:
+                found_skills.append(skill)
     
     return list(set(found_skills))  # Remove duplicates
 
-def extract_experience(text: str) -> List[Dict[str, Any]]:
+def extract_experience(text: str, sections: Optional[ResumeSections] = None) -> List[Dict[str, Any]]:
     """Extract work experience from resume text."""
     experience = []
     
-    # Common experience section headers
-    exp_patterns = [
-        r'(?i)(experience|employment|work history|professional experience)([\s\S]*?)(?=education|skills|projects|$)',
-        r'(?i)(work experience)([\s\S]*?)(?=education|skills|projects|$)'
-    ]
-    
-    experience_text = ""
-    for pattern in exp_patterns:
-        match = re.search(pattern, text)
-        if match:
-            experience_text = match.group(2)
-            break
+    if sections is None:
+        sections = segment_sections(text)
+    experience_text = sections.text("experience")
     
     if not experience_text:
         return experience
     
     # Look for job entries with dates
-    job_pattern = r'([A-Za-z\s,&]+)\s+([A-Za-z\s,&\.]+)\s+(\d{4}\s*[\-–]\s*(?:\d{4}|Present|Current))'
-    jobs = re.findall(job_pattern, experience_text)
-    
-    for job in jobs:
-        job_title = job[0].strip()
-        company = job[1].strip()
-        duration = job[2].strip()
-        
+    for job_title, company, duration in _find_jobs(experience_text, _Deadline(EXTRACTOR_BUDGET_SECONDS)):
         experience.append({
             "jobTitle": job_title,
             "company": company,
@@ -201,64 +439,41 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
     
     return experience
 
-def extract_education(text: str) -> List[Dict[str, Any]]:
+def extract_education(text: str, sections: Optional[ResumeSections] = None) -> List[Dict[str, Any]]:
     """Extract education information from resume text."""
     education = []
     
-    # Common education section
-    edu_pattern = r'(?i)(education|academic background)([\s\S]*?)(?=experience|skills|projects|certifications|$)'
-    edu_match = re.search(edu_pattern, text)
+    if sections is None:
+        sections = segment_sections(text)
+    edu_text = sections.text("education")
     
-    if edu_match:
-        edu_text = edu_match.group(2)
-        
-        # Look for degree patterns
-        degree_patterns = [
-            r'(Bachelor|Master|PhD|Doctor|Associate|B\.?[AS]|M\.?[AS]|M\.?B\.?A|Ph\.?D)[^\n]*([A-Za-z\s]+)\s+([A-Za-z\s&,\.]+University|College|Institute)\s*(\d{4})?',
-            r'([A-Za-z\s&,\.]+University|College|Institute)[^\n]*(Bachelor|Master|PhD|Doctor|Associate|B\.?[AS]|M\.?[AS]|M\.?B\.?A|Ph\.?D)[^\n]*(\d{4})?'
-        ]
-        
-        for pattern in degree_patterns:
-            degrees = re.findall(pattern, edu_text)
-            for degree in degrees:
-                if len(degree) >= 3:
-                    education.append({
-                        "degree": degree[0] if degree[0] else degree[1],
-                        "fieldOfStudy": degree[1] if degree[0] else "",
-                        "school": degree[2] if len(degree) > 2 else "",
-                        "year": degree[3] if len(degree) > 3 else ""
-                    })
+    if edu_text:
+        education.extend(_find_degrees(edu_text, _Deadline(EXTRACTOR_BUDGET_SECONDS)))
     
     return education
 
-def extract_summary(text: str) -> Optional[str]:
+def extract_summary(text: str, sections: Optional[ResumeSections] = None) -> Optional[str]:
     """Extract professional summary or objective."""
-    summary_patterns = [
-        r'(?i)(summary|objective|profile|about)([\s\S]*?)(?=experience|education|skills|$)',
-        r'(?i)(professional summary)([\s\S]*?)(?=experience|education|skills|$)'
-    ]
-    
-    for pattern in summary_patterns:
-        match = re.search(pattern, text)
-        if match:
-            summary = match.group(2).strip()
-            # Clean up and limit length
-            summary = re.sub(r'\s+', ' ', summary)
-            if len(summary) > 500:
-                summary = summary[:500] + "..."
-            return summary
-    
-    return None
+    if sections is None:
+        sections = segment_sections(text)
+    if "summary" not in sections:
+        return None
+    
+    # Clean up and limit length
+    summary = re.sub(r'\s+', ' ', sections.text("summary").strip())
+    if len(summary) > 500:
+        summary = summary[:500] + "..."
+    return summary
 
-def extract_certifications(text: str) -> List[str]:
+def extract_certifications(text: str, sections: Optional[ResumeSections] = None) -> List[str]:
     """Extract certifications from resume text."""
     certifications = []
     
-    cert_pattern = r'(?i)(certifications?|certificates?)([\s\S]*?)(?=experience|education|skills|projects|$)'
-    cert_match = re.search(cert_pattern, text)
+    if sections is None:
+        sections = segment_sections(text)
+    cert_text = sections.text("certifications")
     
-    if cert_match:
-        cert_text = cert_match.group(2)
+    if cert_text:
         # Split by common delimiters and clean up
         items = re.split(r'[\n•·\-]', cert_text)
         for item in items:
@@ -0,0 +1,217 @@
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from app.embeddings import EMBEDDING_VERSION, embed_texts_async, get_embedding_batcher
+from app.metrics import registry
+
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "3600"))
+# SQLite file shared by workers on the host; empty disables the shared tier
+QUERY_CACHE_SQLITE_PATH = os.getenv("QUERY_CACHE_SQLITE_PATH", "")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+
+class QueryEmbeddingCache:
+    """LRU + TTL cache of query embeddings keyed on normalized text and embedding version.
+
+    The in-process LRU is checked first; an optional SQLite file acts as a
+    second tier shared by every worker on the host, so a query embedded by
+    one worker is a hit for the others. SQLite reads and writes run in a
+    worker thread so a busy file never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_CACHE_SIZE,
+        ttl: float = QUERY_CACHE_TTL_SECONDS,
+        sqlite_path: str = QUERY_CACHE_SQLITE_PATH,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl = ttl
+        self.sqlite_path = sqlite_path
+        self._lru: OrderedDict[str, tuple[float, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()  # guards the LRU and counters only
+        self._db_lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._writes = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, version: str = EMBEDDING_VERSION) -> str:
+        return f"{version}\n{normalize_query(text)}"
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if not self.sqlite_path:
+            return None
+        if self._db is None:
+            directory = os.path.dirname(self.sqlite_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.sqlite_path, timeout=1.0, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def _remember(self, key: str, expires: float, vector: np.ndarray) -> None:
+        if self.max_entries == 0:
+            return
+        self._lru[key] = (expires, vector)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _read_shared(self, keys: list[str], now: float) -> dict[str, tuple[bytes, float]]:
+        try:
+            with self._db_lock:
+                db = self._connect()
+                if db is None:
+                    return {}
+                marks = ",".join("?" * len(keys))
+                rows = db.execute(
+                    f"SELECT key, vector, expires FROM query_embeddings WHERE key IN ({marks}) AND expires > ?",
+                    (*keys, now),
+                ).fetchall()
+        except sqlite3.Error:
+            return {}  # the shared tier is best effort
+        return {key: (blob, expires) for key, blob, expires in rows}
+
+    def _write_shared(self, rows: list[tuple[str, bytes, float]]) -> None:
+        try:
+            with self._db_lock:
+                db = self._connect()
+                if db is None:
+                    return
+                db.executemany(
+                    "INSERT OR REPLACE INTO query_embeddings (key, vector, expires) VALUES (?, ?, ?)", rows
+                )
+                # Opportunistic purge keeps the shared file from growing without bound
+                previous, self._writes = self._writes, self._writes + len(rows)
+                if previous // 256 != self._writes // 256:
+                    db.execute("DELETE FROM query_embeddings WHERE expires <= ?", (time.time(),))
+        except sqlite3.Error:
+            pass
+
+    async def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for the given keys; missing or expired keys are left out."""
+        now = time.time()
+        found: dict[str, np.ndarray] = {}
+        remaining: list[str] = []
+        with self._lock:
+            for key in keys:
+                entry = self._lru.get(key)
+                if entry is not None and entry[0] > now:
+                    self._lru.move_to_end(key)
+                    found[key] = entry[1]
+                    continue
+                if entry is not None:
+                    del self._lru[key]
+                remaining.append(key)
+
+        shared = await asyncio.to_thread(self._read_shared, remaining, now) if remaining and self.sqlite_path else {}
+
+        with self._lock:
+            for key, (blob, expires) in shared.items():
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+                self._remember(key, expires, found[key])
+            hits, misses = len(found), len(keys) - len(found)
+            self.hits += hits
+            self.shared_hits += len(shared)
+            self.misses += misses
+        registry.counter("embed.query_cache.hits").inc(hits)
+        registry.counter("embed.query_cache.shared_hits").inc(len(shared))
+        registry.counter("embed.query_cache.misses").inc(misses)
+        return found
+
+    async def get(self, key: str) -> np.ndarray | None:
+        return (await self.get_many([key])).get(key)
+
+    async def put_many(self, vectors: dict[str, np.ndarray]) -> None:
+        expires = time.time() + self.ttl
+        rows = []
+        with self._lock:
+            for key, vector in vectors.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, expires, vector)
+                rows.append((key, vector.tobytes(), expires))
+        if rows and self.sqlite_path:
+            await asyncio.to_thread(self._write_shared, rows)
+
+    async def put(self, key: str, vector: np.ndarray) -> None:
+        await self.put_many({key: vector})
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "sharedHits": self.shared_hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sqlitePath": self.sqlite_path or None,
+        }
+
+
+_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_cache() -> QueryEmbeddingCache:
+    global _cache
+    if _cache is None:
+        _cache = QueryEmbeddingCache()
+    return _cache
+
+
+async def embed_query(text: str) -> np.ndarray:
+    """Embedding for a search query, served from the query cache when possible."""
+    cache = get_query_cache()
+    key = cache.key(text)
+    vector = await cache.get(key)
+    if vector is None:
+        vector = np.array((await embed_texts_async([text]))[0], dtype=np.float32)
+        await cache.put(key, vector)
+    return vector
+
+
+async def embed_queries(texts: list[str]) -> np.ndarray:
+    """Embeddings for several search queries as one matrix.
+
+    Cache misses (deduplicated after normalization) are queued together on
+    the shared embedding batcher, so they count towards EMBED_MAX_QUEUE and
+    raise EmbeddingBusy when it is full.
+    """
+    cache = get_query_cache()
+    keys = [cache.key(text) for text in texts]
+    vectors = await cache.get_many(list(dict.fromkeys(keys)))
+    missing: dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+    if missing:
+        encoded = await get_embedding_batcher().embed(missing.values())
+        fresh = {key: np.array(vector, dtype=np.float32) for key, vector in zip(missing, encoded)}
+        await cache.put_many(fresh)
+        vectors.update(fresh)
+    return np.stack([vectors[key] for key in keys])
@@ -1,21 +1,57 @@
-from typing import Annotated, Any, cast
+from typing import Annotated, Any
+import asyncio
 import os
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from pydantic import BaseModel
 import numpy as np
 
 from app.auth import require_firebase_user
 from app.firestore_client import get_firestore_client
-from app.groq_client import ResumeData
-from app.embeddings import embed_texts
+from app.embeddings import embed_texts_async, embedding_fingerprint, get_embedding_batcher
+from app.extraction import get_extraction_service
+from app.index_sync import get_index_sync
+from app.parse_cache import get_parse_cache
+from app.query_cache import get_query_cache
+from app.text_index import get_text_index
+from app.metrics import registry
+from app.scoring import lexical_profile
+from app.vector_index import ANN_INDEX_PATH, ANN_NPROBE, embedding_fields, get_vector_index, resume_metadata, resume_parsed, resume_text_blob
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
+# Reindex pages through resumes in document id order, REINDEX_PAGE_SIZE at a
+# time, and checkpoints after every page so a crashed run can resume
+REINDEX_PAGE_SIZE = int(os.getenv("REINDEX_PAGE_SIZE", "256"))
+# A "running" checkpoint older than this is treated as a crashed run
+REINDEX_STALE_SECONDS = int(os.getenv("REINDEX_STALE_SECONDS", "300"))
+FIRESTORE_BATCH_SIZE = 400
+_REINDEX_FIELDS = [
+    "parsed", "parsed_llm", "fileName", "fileType", "uid", "url", "matchScore", "embeddingFingerprint", "lexical",
+]
+_MAX_JOB_ERRORS = 50
+# Failed resume ids kept in the checkpoint for retry; past this the job stops
+# without moving its cursor, so a resumed run retries the page instead
+_MAX_FAILED_IDS = 10000
+
+# Whether this worker is running the reindex job
+_reindex_running = False
+
 # Response Models
-class ReindexResponse(BaseModel):
-    updated: list[str]
-    errors: list[str]
-    total_processed: int
+class ReindexJobStatus(BaseModel):
+    status: str  # running | completed | failed
+    cursor: str | None = None  # id of the last resume checkpointed
+    processed: int = 0
+    updated: int = 0
+    skipped: int = 0
+    unchanged: int = 0  # embedding already matched the text blob and model
+    failed: int = 0  # resumes currently failing, i.e. len(failedIds)
+    failedIds: list[str] = []  # retried first when the job resumes
+    errors: list[str] = []
+    startedAt: str | None = None
+    updatedAt: str | None = None
+    finishedAt: str | None = None
 
 class SystemStatusResponse(BaseModel):
     status: str
@@ -26,54 +62,6 @@ class SystemStatusResponse(BaseModel):
     system_version: str
 
 # Helper Functions
-def _resume_text_blob(resume: ResumeData) -> str:
-    """Convert a parsed resume into a text blob for text search."""
-    parts: list[str] = []
-        
-    # Add contact info
-    contact = resume.get("contact", {})
-    if contact:
-        parts.extend(filter(None, [
-            contact.get("fullName", ""),
-            contact.get("location", "")
-        ]))
-    
-    # Add summary if present
-    summary = resume.get("summary", "")
-    if summary:
-        parts.append(str(summary))
-        
-    # Add skills list if present
-    skills = resume.get("skills", [])
-    if skills and isinstance(skills, list):
-        parts.extend(str(s) for s in skills if s)
-        
-    # Add experience entries
-    experience = resume.get("experience", [])
-    if experience and isinstance(experience, list):
-        for exp in experience:
-            parts.extend(filter(None, [
-                exp.get("title", ""),
-                exp.get("company", ""),
-                exp.get("location", "")
-            ]))
-            # Add bullet points if present
-            bullets = exp.get("bullets", [])
-            if bullets and isinstance(bullets, list):
-                parts.extend(str(b) for b in bullets if b)
-                
-    # Add education entries
-    education = resume.get("education", [])
-    if education and isinstance(education, list):
-        for edu in education:
-            parts.extend(filter(None, [
-                edu.get("degree", ""),
-                edu.get("field", ""),
-                edu.get("school", "")
-            ]))
-                
-    return "\n".join(p for p in parts if p.strip())
-
 def _check_admin_access(user: dict[str, Any]) -> bool:
     """Check if user has admin access."""
     # Check environment variable for admin email
@@ -83,12 +71,148 @@ def _check_admin_access(user: dict[str, Any]) -> bool:
     
     return is_admin_flag or (allowed_email and user_email == allowed_email)
 
+def _reindex_job_ref(db: Any) -> Any:
+    return db.collection("admin_jobs").document("reindex-all")
+
+def _is_stale(job: ReindexJobStatus) -> bool:
+    if not job.updatedAt:
+        return True
+    age = datetime.now() - datetime.fromisoformat(job.updatedAt)
+    return age.total_seconds() > REINDEX_STALE_SECONDS
+
+async def _run_reindex(job: ReindexJobStatus) -> None:
+    """Re-embed resumes page by page, checkpointing progress to Firestore."""
+    global _reindex_running
+    db = get_firestore_client()
+    job_ref = _reindex_job_ref(db)
+    index = get_vector_index()
+    batcher = get_embedding_batcher()
+    
+    def fetch_page(cursor: str | None) -> list[Any]:
+        query = db.collection("resumes").order_by("__name__").select(_REINDEX_FIELDS).limit(REINDEX_PAGE_SIZE)
+        if cursor:
+            query = query.start_after({"__name__": cursor})
+        return list(query.stream())
+    
+    def write(chunk: list[tuple[Any, dict[str, Any]]]) -> None:
+        write_batch = db.batch()
+        for ref, update in chunk:
+            write_batch.update(ref, update)
+        write_batch.commit()
+    
+    def checkpoint() -> None:
+        job.updatedAt = datetime.now().isoformat()
+        job_ref.set(job.dict())
+    
+    def record_error(message: str) -> None:
+        job.errors = (job.errors + [message])[-_MAX_JOB_ERRORS:]
+    
+    def fetch_ids(resume_ids: list[str]) -> list[Any]:
+        refs = [db.collection("resumes").document(resume_id) for resume_id in resume_ids]
+        return [doc for doc in db.get_all(refs, field_paths=_REINDEX_FIELDS) if doc.exists]
+    
+    async def reindex(docs: list[Any]) -> list[str]:
+        """Re-embed the changed resumes among docs; returns the ids that failed."""
+        ids: list[str] = []
+        refs: list[Any] = []
+        blobs: list[str] = []
+        fingerprints: list[str] = []
+        lexicals: list[dict[str, Any]] = []
+        metas: list[dict[str, Any]] = []
+        for doc in docs:
+            data = doc.to_dict() or {}
+            parsed = resume_parsed(data)
+            if not parsed:
+                job.skipped += 1
+                continue
+            blob = resume_text_blob(parsed)
+            fingerprint = embedding_fingerprint(blob)
+            # Resumes indexed before the lexical profile existed are redone once to gain it
+            if data.get("embeddingFingerprint") == fingerprint and doc.id in index and data.get("lexical"):
+                job.unchanged += 1
+                continue
+            lexical = lexical_profile(parsed)
+            ids.append(doc.id)
+            refs.append(doc.reference)
+            blobs.append(blob)
+            fingerprints.append(fingerprint)
+            lexicals.append(lexical)
+            metas.append(resume_metadata({**data, "lexical": lexical}))
+        
+        if not blobs:
+            return []
+        try:
+            vectors = np.asarray(await batcher.embed_bulk(blobs), dtype=np.float32)
+            updates = [
+                (ref, {
+                    "text_blob": blob, **embedding_fields(vec), "lexical": lexical,
+                    "embeddingFingerprint": fp, "updatedAt": SERVER_TIMESTAMP,
+                })
+                for ref, blob, fp, lexical, vec in zip(refs, blobs, fingerprints, lexicals, vectors)
+            ]
+            for start in range(0, len(updates), FIRESTORE_BATCH_SIZE):
+                await asyncio.to_thread(write, updates[start:start + FIRESTORE_BATCH_SIZE])
+            index.upsert_many(ids, vectors, metas)
+            text_index = get_text_index()
+            for resume_id, blob in zip(ids, blobs):
+                text_index.add(resume_id, blob)
+            job.updated += len(ids)
+            return []
+        except Exception as e:
+            record_error(f"{ids[0]}..{ids[-1]}: {e}")
+            return ids
+    
+    try:
+        # Unchanged resumes are only skipped if their vector is already resident
+        await asyncio.to_thread(index.ensure_loaded)
+        
+        # Retry what failed in earlier runs before moving on; resumes deleted
+        # since then drop out of fetch_ids and stop counting as failed
+        retry = list(job.failedIds)
+        for start in range(0, len(retry), REINDEX_PAGE_SIZE):
+            chunk = set(retry[start:start + REINDEX_PAGE_SIZE])
+            docs = await asyncio.to_thread(fetch_ids, list(chunk))
+            still_failing = set(await reindex(docs))
+            job.failedIds = [i for i in job.failedIds if i not in chunk or i in still_failing]
+            job.failed = len(job.failedIds)
+            await asyncio.to_thread(checkpoint)
+        
+        while True:
+            docs = await asyncio.to_thread(fetch_page, job.cursor)
+            if not docs:
+                break
+            
+            failed_ids = await reindex(docs)
+            if len(job.failedIds) + len(failed_ids) > _MAX_FAILED_IDS:
+                # Leave the cursor before this page so a resumed run retries it
+                raise RuntimeError(f"Stopping after more than {_MAX_FAILED_IDS} failed resumes")
+            job.failedIds.extend(failed_ids)
+            job.failed = len(job.failedIds)
+            job.processed += len(docs)
+            job.cursor = docs[-1].id
+            await asyncio.to_thread(checkpoint)
+        job.status = "completed"
+    except Exception as e:
+        job.status = "failed"
+        record_error(str(e))
+    finally:
+        job.finishedAt = datetime.now().isoformat()
+        _reindex_running = False
+        try:
+            await asyncio.to_thread(checkpoint)
+        except Exception:
+            pass  # the next run resumes from the last successful checkpoint
+
 # Routes
-@router.post("/reindex-all", response_model=ReindexResponse)
+@router.post("/reindex-all", response_model=ReindexJobStatus, status_code=status.HTTP_202_ACCEPTED)
 async def reindex_all_resumes(
-    user: Annotated[dict, Depends(require_firebase_user)]
-) -> ReindexResponse:
-    """Reindex all resumes in the database. Only accessible to admins."""
+    background_tasks: BackgroundTasks,
+    user: Annotated[dict, Depends(require_firebase_user)],
+    restart: bool = False
+) -> ReindexJobStatus:
+    """Start (or resume) re-embedding every resume in the background. Only accessible to admins."""
+    global _reindex_running
+    
     # Check authorization
     if not _check_admin_access(user):
         raise HTTPException(
@@ -96,48 +220,54 @@ async def reindex_all_resumes(
             detail="Admin access required"
         )
     
-    # Get all resume documents
     db = get_firestore_client()
-    resumes = db.collection("resumes").limit(2000).stream()
-    updated_ids: list[str] = []
-    errors: list[str] = []
+    snapshot = await asyncio.to_thread(_reindex_job_ref(db).get)
+    existing = ReindexJobStatus(**snapshot.to_dict()) if snapshot.exists else None
     
-    # Process each resume
-    for doc in resumes:
-        try:
-            data = doc.to_dict()
-            if data is None:
-                continue
-                
-            # Try to get parsed data from either field
-            parsed_llm = cast(ResumeData | None, data.get("parsed_llm"))
-            parsed_base = cast(ResumeData | None, data.get("parsed"))
-            parsed_data = parsed_llm or parsed_base
-            
-            if not parsed_data:
-                continue
-                
-            parsed = cast(ResumeData, parsed_data)
-            blob = _resume_text_blob(parsed)
-            raw_vec = embed_texts([blob])[0]
-            vec_array = np.array(raw_vec, dtype=np.float32)
-            
-            # Update document with embedding
-            doc_ref = doc.reference
-            doc_ref.update({
-                "text_blob": blob,
-                "embedding": vec_array.tolist()
-            })
-            updated_ids.append(doc.id)
-            
-        except Exception as e:
-            errors.append(f"{doc.id}: {str(e)}")
-            
-    return ReindexResponse(
-        updated=updated_ids,
-        errors=errors,
-        total_processed=len(updated_ids) + len(errors)
-    )
+    if _reindex_running or (existing and existing.status == "running" and not _is_stale(existing)):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A reindex is already running"
+        )
+    
+    now = datetime.now().isoformat()
+    if existing and (existing.status != "completed" or existing.failedIds) and not restart:
+        # Pick up after the last checkpoint of a crashed or failed run, or
+        # retry the resumes a completed run could not embed
+        job = existing
+        job.status = "running"
+        job.finishedAt = None
+    else:
+        job = ReindexJobStatus(status="running", startedAt=now)
+    job.updatedAt = now
+    
+    _reindex_running = True
+    try:
+        await asyncio.to_thread(_reindex_job_ref(db).set, job.dict())
+    except Exception:
+        _reindex_running = False
+        raise
+    background_tasks.add_task(_run_reindex, job)
+    return job
+
+@router.get("/reindex-all/status", response_model=ReindexJobStatus)
+async def get_reindex_status(
+    user: Annotated[dict, Depends(require_firebase_user)]
+) -> ReindexJobStatus:
+    """Get progress of the current or last reindex job. Only accessible to admins."""
+    if not _check_admin_access(user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    snapshot = await asyncio.to_thread(_reindex_job_ref(get_firestore_client()).get)
+    if not snapshot.exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No reindex has been run"
+        )
+    return ReindexJobStatus(**snapshot.to_dict())
 
 @router.get("/system-status", response_model=SystemStatusResponse)
 async def get_system_status(
@@ -162,7 +292,7 @@ async def get_system_status(
     
     try:
         # Test embeddings service
-        embed_texts(["test"])
+        await embed_texts_async(["test"])
         embeddings_available = True
     except Exception:
         embeddings_available = False
@@ -191,6 +321,79 @@ async def get_system_status(
         system_version="1.0.0"
     )
 
+@router.get("/extraction-status")
+async def get_extraction_status(
+    user: Annotated[dict, Depends(require_firebase_user)]
+) -> dict[str, Any]:
+    """Get document extraction pool saturation and parse cache hit rates. Admin only."""
+    if not _check_admin_access(user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return {
+        **get_extraction_service().stats(),
+        "parseCache": get_parse_cache().stats()
+    }
+
+@router.get("/embedding-status")
+async def get_embedding_status(
+    user: Annotated[dict, Depends(require_firebase_user)]
+) -> dict[str, Any]:
+    """Get embedding inference executor saturation, query cache hit rates, keyword index size and index sync state. Admin only."""
+    if not _check_admin_access(user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return {
+        **get_embedding_batcher().stats(),
+        "queryCache": get_query_cache().stats(),
+        "textIndex": get_text_index().stats(),
+        "indexSync": get_index_sync().stats()
+    }
+
+@router.get("/metrics")
+async def get_metrics(
+    user: Annotated[dict, Depends(require_firebase_user)]
+) -> dict[str, Any]:
+    """Get in-process histograms and counters for this worker. Admin only."""
+    if not _check_admin_access(user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return registry.snapshot()
+
+@router.post("/ann/rebuild")
+async def rebuild_ann_index(
+    user: Annotated[dict, Depends(require_firebase_user)],
+    nlist: int = 0,
+    nprobe: int = ANN_NPROBE
+) -> dict[str, Any]:
+    """Retrain the IVF search index on this worker's resident vectors. Admin only."""
+    if not _check_admin_access(user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    index = get_vector_index()
+    await asyncio.to_thread(index.ensure_loaded)
+    if len(index) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No indexed resumes to train on"
+        )
+    
+    ann = await asyncio.to_thread(index.build_ann, max(nlist, 0), max(nprobe, 1))
+    if ANN_INDEX_PATH:
+        await asyncio.to_thread(index.save_centroids, ANN_INDEX_PATH)
+    return ann.stats()
+
 @router.post("/cleanup-data")
 async def cleanup_data(
     user: Annotated[dict, Depends(require_firebase_user)]
@@ -214,7 +417,7 @@ async def cleanup_data(
         if not (data.get("parsed") or data.get("parsed_llm")):
             resumes_without_parsed.append(doc.id)
         
-        if not data.get("embedding"):
+        if not (data.get("embedding") or data.get("embeddingQ")):
             resumes_without_embeddings.append(doc.id)
     
     return {
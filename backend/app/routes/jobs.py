@@ -1,13 +1,27 @@
 from typing import Annotated, Any, List
+import asyncio
+import os
+import time
 from datetime import datetime
+from math import isfinite
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
 from app.auth import require_firebase_user
+from app.embeddings import EmbeddingBusy, embed_texts_async, embedding_fingerprint
 from app.firestore_client import get_firestore_client
+from app.metrics import registry
+from app.scoring import lexical_profile, score_profile, tokenize
+from app.vector_index import get_vector_index, public_metadata, resume_parsed
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
+# Candidates taken by embedding similarity and re-ranked with lexical overlap
+JOB_MATCH_POOL = int(os.getenv("JOB_MATCH_POOL", "100"))
+# Share of the blended score that comes from score_resume's lexical overlap
+JOB_MATCH_LEXICAL_WEIGHT = float(os.getenv("JOB_MATCH_LEXICAL_WEIGHT", "0.3"))
+
 # Request/Response Models
 class JobCreateRequest(BaseModel):
     title: str
@@ -34,6 +48,11 @@ class JobResponse(BaseModel):
     status: str
     applications_count: int
 
+class JobCandidatesResponse(BaseModel):
+    job_id: str
+    candidates: List[dict[str, Any]]
+    total: int
+
 class JobUpdateRequest(BaseModel):
     title: str = None
     company: str = None
@@ -45,6 +64,30 @@ class JobUpdateRequest(BaseModel):
     employment_type: str = None
     status: str = None
 
+def _job_text(job: dict[str, Any]) -> str:
+    """Text a job is embedded and lexically matched on."""
+    return "\n".join(filter(None, [
+        job.get("title", ""),
+        job.get("description", ""),
+        " ".join(job.get("requirements") or []),
+    ]))
+
+async def _job_embedding(doc_ref: Any, job: dict[str, Any], text: str) -> np.ndarray:
+    """The job's embedding, cached on the job document until its text or the model changes."""
+    fingerprint = embedding_fingerprint(text)
+    if job.get("embedding") and job.get("embeddingFingerprint") == fingerprint:
+        return np.asarray(job["embedding"], dtype=np.float32)
+    try:
+        vec = np.asarray((await embed_texts_async([text]))[0], dtype=np.float32)
+    except EmbeddingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+    await asyncio.to_thread(doc_ref.update, {"embedding": vec.tolist(), "embeddingFingerprint": fingerprint})
+    return vec
+
 # Routes
 @router.post("/", response_model=JobResponse)
 async def create_job(
@@ -135,6 +178,72 @@ async def get_job(
     
     return JobResponse(id=doc.id, **data)
 
+@router.get("/{job_id}/candidates", response_model=JobCandidatesResponse)
+async def rank_job_candidates(
+    job_id: str,
+    top_k: int = 20,
+    user: Annotated[dict, Depends(require_firebase_user)] = None
+) -> JobCandidatesResponse:
+    """Rank indexed resumes against a job.
+
+    The job embedding is scored against every resident resume vector in one
+    pass; the best JOB_MATCH_POOL are then blended with score_resume's
+    lexical overlap against the job text, computed from the lexical profiles
+    kept in the index metadata.
+    """
+    db = get_firestore_client()
+    doc_ref = db.collection("jobs").document(job_id)
+    doc = await asyncio.to_thread(doc_ref.get)
+    if not doc.exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    job = doc.to_dict() or {}
+    text = _job_text(job)
+    job_vec = await _job_embedding(doc_ref, job, text)
+    
+    index = get_vector_index()
+    if not index.loaded:
+        await asyncio.to_thread(index.ensure_loaded)
+    
+    started = time.perf_counter()
+    limit = max(1, min(top_k, 50))
+    hits = [hit for hit in await asyncio.to_thread(index.search, job_vec, max(limit, JOB_MATCH_POOL)) if isfinite(hit[1])]
+    registry.histogram("jobs.candidates.scan.seconds").observe(time.perf_counter() - started)
+    
+    # Lexical profiles are resident metadata; only resumes indexed before
+    # they existed (until the next reindex) are read from Firestore
+    profiles = {resume_id: meta.get("lexical") for resume_id, _, meta in hits}
+    stale = [resume_id for resume_id, profile in profiles.items() if not profile]
+    if stale:
+        registry.counter("jobs.candidates.profile_reads").inc(len(stale))
+        refs = [db.collection("resumes").document(resume_id) for resume_id in stale]
+        snapshots = await asyncio.to_thread(lambda: list(db.get_all(refs, field_paths=["parsed", "parsed_llm"])))
+        for snap in snapshots:
+            profiles[snap.id] = lexical_profile(resume_parsed(snap.to_dict() or {}))
+    
+    jd_tokens = set(tokenize(text))
+    candidates = []
+    for resume_id, sim, meta in hits:
+        lexical, reasons = score_profile(profiles.get(resume_id) or {}, jd_tokens)
+        candidates.append({
+            "id": resume_id,
+            **public_metadata(meta),
+            "sim": sim,
+            "lexicalScore": lexical,
+            "score": (1 - JOB_MATCH_LEXICAL_WEIGHT) * sim + JOB_MATCH_LEXICAL_WEIGHT * lexical / 100,
+            "reasons": reasons
+        })
+    candidates.sort(key=lambda c: c["score"], reverse=True)
+    
+    return JobCandidatesResponse(
+        job_id=job_id,
+        candidates=candidates[:limit],
+        total=len(candidates[:limit])
+    )
+
 @router.put("/{job_id}", response_model=JobResponse)
 async def update_job(
     job_id: str,
@@ -1,15 +1,33 @@
 from typing import Annotated, Any, cast
+import asyncio
 import os
+import uuid
+import zipfile
+from collections import OrderedDict
+from io import BytesIO
 from math import isfinite
 from datetime import datetime
 import numpy as np
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from pydantic import BaseModel
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Query
+from pydantic import BaseModel, PrivateAttr
 
 from app.auth import require_firebase_user
 from app.firestore_client import get_firestore_client
-from app.groq_client import call_llm, ResumeData
-from app.embeddings import embed_texts
+from app.metrics import registry
+from app.groq_client import call_llm
+from app.index_sync import get_index_sync
+from app.embeddings import EmbeddingBusy, embed_texts_async, embedding_fingerprint
+from app.extraction import ExtractionBusy, ExtractionError, get_extraction_service
+from app.parse_cache import ParseCache, content_hash, get_parse_cache
+from app.parsing import ExtractorTiming
+from app.query_cache import embed_queries, embed_query
+from app.scoring import lexical_profile
+from app.text_index import get_text_index, reciprocal_rank_fusion
+from app.vector_index import (
+    embedding_fields, get_vector_index, public_metadata, resume_metadata, resume_parsed, resume_text_blob,
+    stored_vector,
+)
 
 router = APIRouter(prefix="/api", tags=["resumes"])
 
@@ -29,59 +47,211 @@ class SearchResponse(BaseModel):
     total: int
     query: str
 
+class BatchSearchRequest(BaseModel):
+    queries: list[str]
+    top_k: int = 20
+    nprobe: int | None = None
+    mode: str = "hybrid"
+    skills: list[str] = []
+    location: str | None = None
+    file_type: str | None = None
+    min_score: float | None = None
+
+class BatchSearchResponse(BaseModel):
+    searches: list[SearchResponse]
+
 class UploadResponse(BaseModel):
     resumeId: str
     fileName: str
     message: str
+    debug: dict[str, Any] | None = None
+
+class BatchFileResult(BaseModel):
+    fileName: str
+    resumeId: str | None = None
+    error: str | None = None
+
+class BatchStatusResponse(BaseModel):
+    batchId: str
+    status: str
+    total: int
+    processed: int
+    succeeded: int
+    failed: int
+    results: list[BatchFileResult]
+    # Uploader's uid; only they can read the batch, and it never leaves the server
+    _uid: str = PrivateAttr(default="")
+
+# Supported upload extensions and the bytes_to_text type they map to
+EXT_MAP = {'.pdf': 'pdf', '.docx': 'docx', '.txt': 'txt'}
+
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_MAX_FILE_BYTES = int(os.getenv("BATCH_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+BATCH_MAX_ARCHIVE_BYTES = int(os.getenv("BATCH_MAX_ARCHIVE_BYTES", str(200 * 1024 * 1024)))
+# Matches EMBED_BATCH_MAX_SIZE, so a batch of uncached queries is one model call
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", "32"))
+# Firestore allows at most 500 writes per batch
+FIRESTORE_BATCH_SIZE = 400
+
+# Progress of recent batch uploads on this worker, oldest first
+_batches: "OrderedDict[str, BatchStatusResponse]" = OrderedDict()
+_MAX_TRACKED_BATCHES = 100
+
+# Ranked candidates taken from each of the vector and keyword lists before fusion
+SEARCH_FUSION_DEPTH = 100
+SEARCH_MODES = ("hybrid", "vector", "keyword")
+
+# Background load of the keyword index, started by the first search
+_text_index_load: "asyncio.Task | None" = None
 
 # Helper Functions
-def _resume_text_blob(resume: ResumeData) -> str:
-    """Convert a parsed resume into a text blob for text search."""
-    parts: list[str] = []
-        
-    # Add contact info
-    contact = resume.get("contact", {})
-    if contact:
-        parts.extend(filter(None, [
-            contact.get("fullName", ""),
-            contact.get("location", "")
-        ]))
-    
-    # Add summary if present
-    summary = resume.get("summary", "")
-    if summary:
-        parts.append(str(summary))
-        
-    # Add skills list if present
-    skills = resume.get("skills", [])
-    if skills and isinstance(skills, list):
-        parts.extend(str(s) for s in skills if s)
+async def _extract_and_parse(
+    content: bytes,
+    ext: str,
+    debug: bool = False
+) -> tuple[str, dict[str, Any], str, list[ExtractorTiming] | None]:
+    """Return (text, parsed, content hash, extractor timings) for an upload, using the parse cache.
+    
+    Extraction and parsing both run in the extraction pool. Timings are None
+    on cache hits or when nothing asked for them. Raises ExtractionError if
+    the worker fails and ValueError if no text was found.
+    """
+    digest = content_hash(content)
+    cache = get_parse_cache()
+    cache_key = ParseCache.key(digest, ext)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached["text"], cached["parsed"], digest, None
+    
+    resume_text, parsed_data, timings = await get_extraction_service().extract_and_parse(
+        content, ext, debug=debug
+    )
+    if not resume_text.strip():
+        raise ValueError("Could not extract text from file")
+    
+    await cache.put(cache_key, resume_text, parsed_data)
+    return resume_text, parsed_data, digest, timings
+
+def _read_zip_members(name: str, content: bytes, max_files: int) -> list[tuple[str, bytes]]:
+    """Return (fileName, bytes) for supported files inside a zip archive.
+
+    Member count and declared sizes are checked from the central directory
+    before anything is inflated; each member is then streamed and cut off
+    at BATCH_MAX_FILE_BYTES, since declared sizes can lie. Raises
+    HTTPException if the archive holds more than max_files supported files,
+    and ValueError for oversized archives or members.
+    """
+    members: list[tuple[str, bytes]] = []
+    with zipfile.ZipFile(BytesIO(content)) as archive:
+        infos = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith("__MACOSX/")
+            and os.path.splitext(info.filename)[1].lower() in EXT_MAP
+        ]
+        if len(infos) > max_files:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many files in batch (max {BATCH_MAX_FILES})"
+            )
+        for info in infos:
+            if info.file_size > BATCH_MAX_FILE_BYTES:
+                raise ValueError(f"{name}/{info.filename} exceeds the per-file size limit")
+        if sum(info.file_size for info in infos) > BATCH_MAX_ARCHIVE_BYTES:
+            raise ValueError(f"{name} exceeds the uncompressed archive size limit")
+
+        for info in infos:
+            chunks: list[bytes] = []
+            size = 0
+            with archive.open(info) as fh:
+                while chunk := fh.read(64 * 1024):
+                    size += len(chunk)
+                    if size > BATCH_MAX_FILE_BYTES:
+                        raise ValueError(f"{name}/{info.filename} exceeds the per-file size limit")
+                    chunks.append(chunk)
+            members.append((os.path.basename(info.filename), b"".join(chunks)))
+    return members
+
+def _remember_batch(batch: BatchStatusResponse) -> None:
+    _batches[batch.batchId] = batch
+    while len(_batches) > _MAX_TRACKED_BATCHES:
+        _batches.popitem(last=False)
+
+async def _process_batch(
+    batch: BatchStatusResponse,
+    files: list[tuple[int, str, bytes]],
+    job_description: str,
+    uid: str
+) -> None:
+    """Parse every file through the extraction pool and write results in Firestore batches."""
+    from app.parsing import calculate_match_score
+    
+    service = get_extraction_service()
+    # Stay within the pool size so a large batch never overflows the shared queue
+    slots = asyncio.Semaphore(service.size)
+    db = get_firestore_client()
+    pending: list[tuple[int, Any, dict[str, Any]]] = []
+    
+    def flush(chunk: list[tuple[int, Any, dict[str, Any]]]) -> None:
+        write_batch = db.batch()
+        for _, ref, doc in chunk:
+            write_batch.set(ref, doc)
+        try:
+            write_batch.commit()
+            for index, ref, _ in chunk:
+                batch.results[index].resumeId = ref.id
+                batch.succeeded += 1
+        except Exception as e:
+            for index, _, _ in chunk:
+                batch.results[index].error = f"Failed to store resume: {str(e)}"
+                batch.failed += 1
+    
+    async def flush_pending() -> None:
+        # Hand off a snapshot; other tasks keep appending while the commit runs
+        chunk = pending[:]
+        pending.clear()
+        await asyncio.to_thread(flush, chunk)
+    
+    async def handle(index: int, name: str, content: bytes) -> None:
+        ext = EXT_MAP[os.path.splitext(name)[1].lower()]
+        try:
+            async with slots:
+                resume_text, parsed_data, digest, _ = await _extract_and_parse(content, ext)
+        except Exception as e:
+            batch.results[index].error = str(e)
+            batch.failed += 1
+            batch.processed += 1
+            return
         
-    # Add experience entries
-    experience = resume.get("experience", [])
-    if experience and isinstance(experience, list):
-        for exp in experience:
-            parts.extend(filter(None, [
-                exp.get("title", ""),
-                exp.get("company", ""),
-                exp.get("location", "")
-            ]))
-            # Add bullet points if present
-            bullets = exp.get("bullets", [])
-            if bullets and isinstance(bullets, list):
-                parts.extend(str(b) for b in bullets if b)
-                
-    # Add education entries
-    education = resume.get("education", [])
-    if education and isinstance(education, list):
-        for edu in education:
-            parts.extend(filter(None, [
-                edu.get("degree", ""),
-                edu.get("field", ""),
-                edu.get("school", "")
-            ]))
-                
-    return "\n".join(p for p in parts if p.strip())
+        pending.append((index, db.collection("resumes").document(), {
+            "fileName": name,
+            "uid": uid,
+            "uploadedAt": datetime.now().isoformat(),
+            "rawText": resume_text,
+            "parsedResume": parsed_data,
+            "matchScore": calculate_match_score(parsed_data, job_description),
+            "jobDescription": job_description,
+            "isNew": True,
+            "fileSize": len(content),
+            "fileType": os.path.splitext(name)[1].lower(),
+            "contentHash": digest,
+            "batchId": batch.batchId,
+            "updatedAt": SERVER_TIMESTAMP
+        }))
+        batch.processed += 1
+        if len(pending) >= FIRESTORE_BATCH_SIZE:
+            await flush_pending()
+    
+    try:
+        await asyncio.gather(*(handle(index, name, data) for index, name, data in files))
+        if pending:
+            await flush_pending()
+        batch.status = "completed"
+    except Exception as e:
+        batch.status = "failed"
+        for result in batch.results:
+            if result.resumeId is None and result.error is None:
+                result.error = f"Batch aborted: {str(e)}"
 
 # Routes
 @router.post("/parse", response_model=GroqParseResponse)
@@ -103,6 +273,7 @@ async def parse_resume_groq(
 async def upload_resume(
     file: UploadFile = File(...),
     job_description: str = Form(""),
+    debug: bool = Form(False),
     user: Annotated[dict, Depends(require_firebase_user)] = None
 ) -> UploadResponse:
     """Upload a resume file, parse it with AI, and store structured data."""
@@ -113,38 +284,41 @@ async def upload_resume(
         )
     
     # Validate file type
-    allowed_extensions = ['.pdf', '.docx', '.txt']
     file_ext = os.path.splitext(file.filename)[1].lower()
     
-    if file_ext not in allowed_extensions:
+    if file_ext not in EXT_MAP:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+            detail=f"Unsupported file type. Allowed: {', '.join(EXT_MAP)}"
         )
     
     try:
         # Read file content
         content = await file.read()
         
-        # Extract text from file
-        from app.parsing import bytes_to_text, parse_resume_content, calculate_match_score
+        from app.parsing import calculate_match_score
         
         # Convert file extension format
-        ext_map = {'.pdf': 'pdf', '.docx': 'docx', '.txt': 'txt'}
-        ext = ext_map[file_ext]
+        ext = EXT_MAP[file_ext]
         
-        # Extract text
-        resume_text = bytes_to_text(content, ext)
-        
-        if not resume_text.strip():
+        try:
+            resume_text, parsed_data, digest, timings = await _extract_and_parse(content, ext, debug)
+        except ExtractionBusy as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
+        except ExtractionError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Could not extract text from file: {str(e)}"
+            )
+        except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not extract text from file"
+                detail=str(e)
             )
         
-        # Parse resume with AI
-        parsed_data = parse_resume_content(resume_text)
-        
         # Calculate match score
         match_score = calculate_match_score(parsed_data, job_description)
         
@@ -161,7 +335,9 @@ async def upload_resume(
             "jobDescription": job_description,
             "isNew": True,
             "fileSize": len(content),
-            "fileType": file_ext
+            "fileType": file_ext,
+            "contentHash": digest,
+            "updatedAt": SERVER_TIMESTAMP
         }
         
         # Add to Firestore
@@ -171,15 +347,179 @@ async def upload_resume(
         return UploadResponse(
             resumeId=resume_id,
             fileName=file.filename,
-            message="Resume uploaded and parsed successfully"
+            message="Resume uploaded and parsed successfully",
+            debug={
+                "cached": timings is None,
+                "timings": [
+                    {"extractor": name, "seconds": seconds, "inputChars": size}
+                    for name, seconds, size in (timings or [])
+                ]
+            } if debug else None
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process resume: {str(e)}"
         )
 
+@router.post("/parse-resume/batch", response_model=BatchStatusResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_resume_batch(
+    background_tasks: BackgroundTasks,
+    files: list[UploadFile] = File(...),
+    job_description: str = Form(""),
+    user: Annotated[dict, Depends(require_firebase_user)] = None
+) -> BatchStatusResponse:
+    """Upload many resumes (files and/or zip archives) and parse them in parallel.
+    
+    Parsing runs in the background; poll GET /api/parse-resume/batch/{batchId}
+    for progress and per-file resume IDs or errors.
+    """
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files in batch (max {BATCH_MAX_FILES})"
+        )
+    
+    # Results stay in upload order; entries remember their result's position
+    results: list[BatchFileResult] = []
+    entries: list[tuple[int, str, bytes]] = []
+    
+    def accept(file_name: str, content: bytes) -> None:
+        if len(entries) >= BATCH_MAX_FILES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many files in batch (max {BATCH_MAX_FILES})"
+            )
+        entries.append((len(results), file_name, content))
+        results.append(BatchFileResult(fileName=file_name))
+    
+    def reject(file_name: str, error: str) -> None:
+        results.append(BatchFileResult(fileName=file_name, error=error))
+    
+    for upload in files:
+        name = upload.filename or ""
+        file_ext = os.path.splitext(name)[1].lower()
+        if file_ext == ".zip":
+            # Read one byte past the cap so oversized uploads are never buffered whole
+            content = await upload.read(BATCH_MAX_ARCHIVE_BYTES + 1)
+            if len(content) > BATCH_MAX_ARCHIVE_BYTES:
+                reject(name, "Invalid archive: exceeds the archive size limit")
+                continue
+            try:
+                members = _read_zip_members(name, content, BATCH_MAX_FILES - len(entries))
+            except (zipfile.BadZipFile, ValueError) as e:
+                reject(name, f"Invalid archive: {str(e)}")
+                continue
+            for member_name, member_content in members:
+                accept(member_name, member_content)
+        elif file_ext not in EXT_MAP:
+            reject(name, f"Unsupported file type. Allowed: {', '.join([*EXT_MAP, '.zip'])}")
+        else:
+            content = await upload.read(BATCH_MAX_FILE_BYTES + 1)
+            if len(content) > BATCH_MAX_FILE_BYTES:
+                reject(name, "File exceeds the per-file size limit")
+            else:
+                accept(name, content)
+    
+    rejected = len(results) - len(entries)
+    batch = BatchStatusResponse(
+        batchId=uuid.uuid4().hex,
+        status="running" if entries else "completed",
+        total=len(results),
+        processed=rejected,
+        succeeded=0,
+        failed=rejected,
+        results=results
+    )
+    uid = user.get("uid") if user else "anonymous"
+    batch._uid = uid
+    _remember_batch(batch)
+    
+    if entries:
+        background_tasks.add_task(_process_batch, batch, entries, job_description, uid)
+    return batch
+
+@router.get("/parse-resume/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(
+    batch_id: str,
+    user: Annotated[dict, Depends(require_firebase_user)]
+) -> BatchStatusResponse:
+    """Get progress and per-file results of a batch upload (only its uploader can see it)."""
+    batch = _batches.get(batch_id)
+    if batch is None or batch._uid != user.get("uid"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found"
+        )
+    return batch
+
+def _search_filters(skills: list[str], location: str | None, file_type: str | None,
+                    min_score: float | None) -> dict[str, Any]:
+    """VectorIndex where filters for the given search parameters, leaving out unset ones."""
+    filters = {"skills": skills, "location": location, "file_type": file_type, "min_score": min_score}
+    return {key: value for key, value in filters.items() if value not in (None, "", [])}
+
+def _check_search_mode(mode: str) -> None:
+    if mode not in SEARCH_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="mode must be one of: hybrid, vector, keyword"
+        )
+
+def _keyword_index_ready() -> bool:
+    """Whether keyword ranking is available, starting its background load if not.
+
+    The keyword index loads in the background (or through index sync's first
+    listing); until then searches are vector-only.
+    """
+    global _text_index_load
+    text_index = get_text_index()
+    if not text_index.loaded and not get_index_sync().running and (_text_index_load is None or _text_index_load.done()):
+        _text_index_load = asyncio.create_task(asyncio.to_thread(text_index.ensure_loaded))
+    return text_index.loaded
+
+def _vector_depth(mode: str, limit: int, keyword_ready: bool) -> int:
+    """Vector hits a query needs: limit on its own, SEARCH_FUSION_DEPTH to fuse, none for keyword-only."""
+    if mode == "vector" or not keyword_ready:
+        return limit
+    return SEARCH_FUSION_DEPTH if mode == "hybrid" else 0
+
+def _search_results(
+    q: str, query_vec: np.ndarray, vector_hits: list[Any], mode: str, limit: int,
+    keyword_ready: bool, where: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Results for one query from its vector hits, fused with keyword hits unless vector-only."""
+    if mode == "vector" or not keyword_ready:
+        return [
+            {"id": resume_id, **public_metadata(meta), "sim": sim}
+            for resume_id, sim, meta in vector_hits
+            if isfinite(sim)
+        ]
+    keyword_ids = [resume_id for resume_id, _ in get_text_index().search(q, SEARCH_FUSION_DEPTH)]
+    # Also drops keyword hits that fail the filters or have no vector
+    keyword_hits = get_vector_index().score_ids(query_vec, keyword_ids, where=where)
+    fused = reciprocal_rank_fusion([[hit[0] for hit in vector_hits], [hit[0] for hit in keyword_hits]])[:limit]
+    known = {resume_id: (sim, meta) for resume_id, sim, meta in [*vector_hits, *keyword_hits]}
+    return [
+        {"id": resume_id, **public_metadata(known[resume_id][1]), "sim": known[resume_id][0], "score": score}
+        for resume_id, score in fused
+        if isfinite(known[resume_id][0])
+    ]
+
+async def _embed_one(text: str) -> np.ndarray:
+    """Embed a single text, mapping a saturated embedding queue to 503."""
+    try:
+        return np.array((await embed_texts_async([text]))[0], dtype=np.float32)
+    except EmbeddingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+
 @router.post("/index")
 async def index_resume(
     req: IndexResumeRequest,
@@ -207,73 +547,154 @@ async def index_resume(
     parsed_base = cast(dict[str, Any], data.get("parsed", {}))
     parsed = cast(dict[str, Any], req.parsed if req.parsed is not None else parsed_base)
     
-    # Create search blob from parsed resume
-    resume_data: ResumeData = {
-        "contact": parsed.get("contact", {}),
-        "summary": parsed.get("summary", ""),
-        "skills": parsed.get("skills", []),
-        "experience": parsed.get("experience", []),
-        "education": parsed.get("education", []),
-        "certifications": parsed.get("certifications", []),
-        "languages": parsed.get("languages", [])
-    }
-    blob = _resume_text_blob(resume_data)
+    # Same source as reindex-all (parsed_llm wins), so both paths agree on the fingerprint
+    source = resume_parsed({**data, "parsed": parsed})
+    blob = resume_text_blob(source)
+    fingerprint = embedding_fingerprint(blob)
+    lexical = lexical_profile(source)
+    
+    # Same blob under the same model: reuse the stored embedding
+    index = get_vector_index()
+    stored = stored_vector(data, index.quantization)
+    if stored is not None and data.get("embeddingFingerprint") == fingerprint:
+        registry.counter("embed.unchanged_skipped").inc()
+        result_data: dict[str, Any] = {
+            "parsed": parsed,
+            "text_blob": blob,
+            "embedding": np.asarray(stored, dtype=np.float32).tolist(),
+        }
+        if parsed != data.get("parsed") or not data.get("lexical"):
+            doc_ref.update({"parsed": parsed, "lexical": lexical, "updatedAt": SERVER_TIMESTAMP})
+            index.update_meta(req.resumeId, resume_metadata({**data, **result_data, "lexical": lexical}))
+        if req.resumeId not in index:
+            index.upsert(req.resumeId, stored, resume_metadata({**data, **result_data, "lexical": lexical}))
+        if req.resumeId not in get_text_index():
+            get_text_index().add(req.resumeId, blob)
+        return result_data
     
     # Generate embeddings for text search
-    raw_vec = embed_texts([blob])[0]
-    vec_array = np.array(raw_vec, dtype=np.float32)
+    vec_array = await _embed_one(blob)
     vec_list = vec_array.tolist()
     
-    # Update the document with parsed data and embeddings
-    result_data: dict[str, Any] = {
+    # Returned to the caller; the document gets the fields EMBEDDING_FLOAT_COPY asks for
+    result_data = {
         "parsed": parsed,
         "text_blob": blob,
         "embedding": vec_list,
     }
     
     # Update Firestore document
-    doc_ref.update(result_data)
+    doc_ref.update({
+        "parsed": parsed, "text_blob": blob, **embedding_fields(vec_array), "lexical": lexical,
+        "embeddingFingerprint": fingerprint, "updatedAt": SERVER_TIMESTAMP,
+    })
+    index.upsert(req.resumeId, vec_array, resume_metadata({**data, **result_data, "lexical": lexical}))
+    get_text_index().add(req.resumeId, blob)
     return result_data
 
 @router.get("/search", response_model=SearchResponse)
 async def search_resumes(
     q: str, 
     top_k: int = 20, 
+    nprobe: int | None = None,
+    mode: str = "hybrid",
+    skills: list[str] = Query(default=[]),
+    location: str | None = None,
+    file_type: str | None = None,
+    min_score: float | None = None,
     user: Annotated[dict, Depends(require_firebase_user)] = None
 ) -> SearchResponse:
-    """Perform semantic search on indexed resumes."""
-    query_vec = np.array(embed_texts([q])[0], dtype="float32")
-    db = get_firestore_client()
-    items = []
-
-    docs = db.collection("resumes").limit(1500).stream()
-    for d in docs:
-        x = d.to_dict()
-        emb = x.get("embedding")
-        if not emb or not isinstance(emb, list) or not emb:
-            continue
-        v = np.array(emb, dtype="float32")
-        sim = float(np.dot(query_vec, v))
-        if isfinite(sim):
-            items.append({
-                "id": d.id,
-                "fileName": x.get("fileName"),
-                "uid": x.get("uid"),
-                "url": x.get("url"),
-                "matchScore": x.get("matchScore"),
-                "skills": (x.get("parsed_llm") or x.get("parsed") or {}).get("skills", []),
-                "sim": sim
-            })
-
-    items.sort(key=lambda r: r["sim"], reverse=True)
-    results = items[:max(1, min(top_k, 50))]
+    """Search indexed resumes by meaning, keywords (BM25) or both fused with reciprocal rank fusion.
+
+    Structured filters (every skill, location, file type, minimum match
+    score) are applied before scoring, so only matching resumes are ranked.
+    """
+    _check_search_mode(mode)
+    
+    try:
+        query_vec = await embed_query(q)
+    except EmbeddingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     
+    # Scored against the process-resident index; the first query loads it from Firestore
+    index = get_vector_index()
+    if not index.loaded:
+        await asyncio.to_thread(index.ensure_loaded)
+    
+    limit = max(1, min(top_k, 50))
+    where = _search_filters(skills, location, file_type, min_score)
+    keyword_ready = _keyword_index_ready()
+    depth = _vector_depth(mode, limit, keyword_ready)
+    
+    def run() -> list[dict[str, Any]]:
+        vector_hits = index.search(query_vec, depth, nprobe=nprobe, where=where) if depth else []
+        return _search_results(q, query_vec, vector_hits, mode, limit, keyword_ready, where)
+    
+    results = await asyncio.to_thread(run)
     return SearchResponse(
         results=results,
         total=len(results),
         query=q
     )
 
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_resumes_batch(
+    req: BatchSearchRequest,
+    user: Annotated[dict, Depends(require_firebase_user)]
+) -> BatchSearchResponse:
+    """Search for several queries at once, with the same modes and filters as GET /search.
+
+    Uncached queries are embedded together on the shared batcher and the
+    vector side of every query is scored against the index in one pass;
+    filters apply to every query.
+    """
+    _check_search_mode(req.mode)
+    if not req.queries:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No queries provided"
+        )
+    if len(req.queries) > SEARCH_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many queries in batch (max {SEARCH_BATCH_MAX_QUERIES})"
+        )
+    
+    try:
+        query_vecs = await embed_queries(req.queries)
+    except EmbeddingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+    
+    index = get_vector_index()
+    if not index.loaded:
+        await asyncio.to_thread(index.ensure_loaded)
+    
+    limit = max(1, min(req.top_k, 50))
+    where = _search_filters(req.skills, req.location, req.file_type, req.min_score)
+    keyword_ready = _keyword_index_ready()
+    depth = _vector_depth(req.mode, limit, keyword_ready)
+    
+    def run() -> list[list[dict[str, Any]]]:
+        batches = index.search_many(query_vecs, depth, nprobe=req.nprobe, where=where) if depth else [[] for _ in req.queries]
+        return [
+            _search_results(q, query_vec, hits, req.mode, limit, keyword_ready, where)
+            for q, query_vec, hits in zip(req.queries, query_vecs, batches)
+        ]
+    
+    searches = [
+        SearchResponse(results=results, total=len(results), query=q)
+        for q, results in zip(req.queries, await asyncio.to_thread(run))
+    ]
+    return BatchSearchResponse(searches=searches)
+
 @router.get("/parsed-data/{resume_id}")
 async def get_resume(
     resume_id: str,
@@ -338,5 +759,7 @@ async def delete_resume(
     
     # Delete the document
     doc_ref.delete()
+    get_vector_index().remove(resume_id)
+    get_text_index().remove(resume_id)
     
     return {"message": f"Resume {resume_id} deleted successfully"}
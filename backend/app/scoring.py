@@ -7,19 +7,36 @@ WORD = re.compile(r"[a-zA-Z+#.-]{2,}")
 def tokenize(t: str) -> list[str]:
     return [w.lower() for w in WORD.findall(t)]
 
-def score_resume(parsed: dict, jd_text: str) -> tuple[int, list[str]]:
-    jd_tokens = set(tokenize(jd_text))
-    resume_tokens = set(tokenize(" ".join(parsed.get("skills", [])) + " " + parsed.get("summary","")))
+def lexical_profile(parsed: dict) -> dict:
+    """What score_resume reads from a resume, small enough to keep resident next to its vector."""
+    # Parsers store missing fields as None, so coerce before joining
+    summary = parsed.get("summary") or ""
+    skills = " ".join(s for s in parsed.get("skills") or [] if isinstance(s, str))
+    bullets = " ".join(b for exp in parsed.get("experience") or [] if isinstance(exp, dict)
+                       for b in exp.get("bullets") or [] if isinstance(b, str))
+    resume_blob = " ".join((summary, skills, bullets)).lower()
+    return {
+        "tokens": " ".join(sorted(set(tokenize(skills + " " + summary)))),
+        "hints": [k for k in SENIOR_HINTS if k in resume_blob],
+    }
+
+def score_profile(profile: dict, jd_tokens: set[str]) -> tuple[int, list[str]]:
+    """score_resume for a resume already reduced by lexical_profile."""
+    resume_tokens = set(profile.get("tokens", "").split())
     overlap = jd_tokens.intersection(resume_tokens)
     # skill-weighted score
     base = len(overlap) / max(1, len(resume_tokens))
     # add boost for seniority hints present in JD & resume bullets
-    resume_blob = " ".join((parsed.get("summary",""), " ".join(parsed.get("skills", [])),
-                            " ".join(b for exp in parsed.get("experience", []) for b in exp.get("bullets",[]))))
-    bonus = sum(1 for k in SENIOR_HINTS if (k in jd_tokens and k in resume_blob.lower())) * 0.02
+    bonus = sum(1 for k in profile.get("hints", []) if k in jd_tokens) * 0.02
     score = min(1.0, base + bonus)
     reasons = [
         f"Token overlap {len(overlap)} / {len(resume_tokens)}",
         "Seniority bonus applied" if bonus > 0 else "No seniority bonus"
     ]
     return round(score * 100), reasons
+
+def score_resume(parsed: dict, jd_text: str, jd_tokens: set[str] | None = None) -> tuple[int, list[str]]:
+    # Callers scoring many resumes against one JD can tokenize it once
+    if jd_tokens is None:
+        jd_tokens = set(tokenize(jd_text))
+    return score_profile(lexical_profile(parsed), jd_tokens)
@@ -0,0 +1,131 @@
+import re
+from typing import NamedTuple
+
+# Heading keyword -> section label. Longer phrases come first so that
+# "work experience" wins over "experience" in the combined alternation.
+SECTION_HEADINGS: dict[str, str] = {
+    "professional summary": "summary",
+    "career objective": "summary",
+    "summary": "summary",
+    "objective": "summary",
+    "profile": "summary",
+    "about me": "summary",
+    "about": "summary",
+    "professional experience": "experience",
+    "work experience": "experience",
+    "work history": "experience",
+    "company details": "experience",
+    "employment": "experience",
+    "experience": "experience",
+    "academic background": "education",
+    "education": "education",
+    "technical skills": "skills",
+    "skills": "skills",
+    "technologies": "skills",
+    "expertise": "skills",
+    "tools": "skills",
+    "certifications": "certifications",
+    "certification": "certifications",
+    "certificates": "certifications",
+    "certificate": "certifications",
+    "projects": "projects",
+    "languages": "languages",
+}
+
+_KEYWORDS = "|".join(re.escape(k) for k in sorted(SECTION_HEADINGS, key=len, reverse=True))
+_UPPER_KEYWORDS = _KEYWORDS.upper()
+
+# A keyword ends a heading if only an optional "Details" and a colon, a
+# bullet or the end of the line follow it, as in "Education Details",
+# "Skills:" or "Technical Summary • ..." (also as the mis-decoded "â\x80¢"
+# some extractors produce).
+_ENDS_HEADING = r"(?=[ \t]*(?:details)?[ \t\r]*(?::|$|[•·*]|â\x80¢))"
+
+# Headings are, in order of preference at any position:
+# - a keyword at the start of a line ("Experience", "SKILLS Python, ...")
+# - a bare keyword behind a bullet or markdown marker ("## Education:");
+#   a marker followed by prose ("- Experience in ML pipelines") is body text
+# - a keyword followed by "Details" or an ALL-CAPS keyword anywhere else
+#   ("... B.Tech.Education Details", "WORKING EXPERIENCE IN CORPORATE:"),
+#   which is how headings come out of text whose line breaks were lost;
+#   before "Details" the keyword may even be glued to the previous word
+#   ("SPSSEducation Details", "monthsCompany Details")
+# A lowercase keyword that merely ends a line ("5 years of experience",
+# "communication skills") is prose, not a heading.
+_LINE_HEADING = re.compile(
+    rf"(?im)(?:^[ \t]*({_KEYWORDS})\b"
+    rf"|^[ \t]*[•·*#\-][ \t•·*#\-]*({_KEYWORDS}){_ENDS_HEADING}"
+    rf"|({_KEYWORDS})(?:(?<=details)|(?=[ \t]*details\b))"
+    rf"|(?-i:\b({_UPPER_KEYWORDS})\b))"
+    rf"[ \t]*(?:details\b)?[ \t]*:?"
+)
+
+# Text extracted without line breaks (e.g. flattened DOCX) may have no
+# heading of the forms above, so fall back to keyword matches anywhere.
+_ANY_HEADING = re.compile(rf"(?i)\b({_KEYWORDS})\b[ \t]*:?")
+
+
+class Section(NamedTuple):
+    label: str
+    heading: str
+    heading_start: int
+    start: int  # body offset, just past the heading
+    end: int
+
+
+class ResumeSections:
+    """Labeled sections of a resume, found in one scan over the text."""
+
+    def __init__(self, text: str, sections: list[Section]):
+        self.source = text
+        self.sections = sections
+        self._first: dict[str, Section] = {}
+        for section in sections:
+            self._first.setdefault(section.label, section)
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._first
+
+    def get(self, label: str) -> Section | None:
+        """Return the first section with this label, if any."""
+        return self._first.get(label)
+
+    def size(self, label: str) -> int:
+        """Length of the first section with this label, or 0."""
+        section = self._first.get(label)
+        return section.end - section.start if section is not None else 0
+
+    def text(self, label: str) -> str:
+        """Return the body of the first section with this label, or ''."""
+        section = self._first.get(label)
+        if section is None:
+            return ""
+        return self.source[section.start:section.end]
+
+
+def segment_sections(text: str) -> ResumeSections:
+    """Split resume text into labeled sections with offsets.
+
+    Each section runs from the end of its heading to the start of the next
+    heading (or the end of the text).
+    """
+    matches = list(_LINE_HEADING.finditer(text))
+    if not matches:
+        matches = list(_ANY_HEADING.finditer(text))
+
+    sections: list[Section] = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        group = next(g for g in range(1, (match.re.groups or 0) + 1) if match.group(g) is not None)
+        heading = match.group(group)
+        sections.append(Section(
+            label=SECTION_HEADINGS[heading.lower()],
+            heading=heading,
+            heading_start=match.start(group),
+            start=match.end(),
+            end=end,
+        ))
+    return ResumeSections(text, sections)
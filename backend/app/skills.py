@@ -0,0 +1,124 @@
+import os
+import re
+from collections.abc import Iterable
+
+# Text is split into word runs and single punctuation characters, so that
+# "Vue.js", "C++" and "REST API" become token sequences that can be walked
+# through a trie. Word runs use the same \w definition as the \b boundaries
+# the old per-skill regexes relied on.
+TOKEN = re.compile(r"\w+|[^\w\s]")
+
+# Common technical skills database
+SKILL_DATABASE = [
+    # Programming Languages
+    'JavaScript', 'Python', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust', 'Swift',
+    'Kotlin', 'TypeScript', 'Scala', 'R', 'MATLAB', 'Perl', 'Shell', 'Bash',
+
+    # Web Technologies
+    'React', 'Angular', 'Vue.js', 'Node.js', 'Express.js', 'Next.js', 'Nuxt.js',
+    'HTML', 'CSS', 'SASS', 'LESS', 'Bootstrap', 'Tailwind CSS', 'jQuery',
+
+    # Databases
+    'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server',
+    'DynamoDB', 'Cassandra', 'Elasticsearch', 'Firebase',
+
+    # Cloud & DevOps
+    'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI',
+    'GitHub Actions', 'Terraform', 'Ansible', 'Chef', 'Puppet',
+
+    # Data Science & ML
+    'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib',
+    'Seaborn', 'Jupyter', 'Apache Spark', 'Hadoop', 'Tableau', 'Power BI',
+
+    # Mobile Development
+    'React Native', 'Flutter', 'iOS Development', 'Android Development',
+    'Xamarin', 'Ionic', 'Cordova',
+
+    # Other Technologies
+    'Git', 'SVN', 'REST API', 'GraphQL', 'JSON', 'XML', 'YAML',
+    'Linux', 'Windows', 'macOS', 'Ubuntu', 'CentOS'
+]
+
+_END = ""  # trie key marking the end of a skill; never produced by TOKEN
+
+
+def tokenize_skill_text(text: str) -> list[str]:
+    """Split lowercased text into the tokens the skill trie is keyed on."""
+    return TOKEN.findall(text.lower())
+
+
+class SkillMatcher:
+    """Token trie that finds every known skill in a single scan of the text.
+
+    Scan cost depends on the text length and the longest skill (in tokens),
+    not on how many skills are loaded, so large external dictionaries are
+    as cheap to match as the built-in one.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self._root: dict[str, dict] = {}
+        self._size = 0
+        self.add_all(skills)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, skill: str) -> None:
+        """Register a skill; the first spelling seen is the one reported."""
+        tokens = tokenize_skill_text(skill)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node:
+            node[_END] = skill.strip()
+            self._size += 1
+
+    def add_all(self, skills: Iterable[str]) -> None:
+        for skill in skills:
+            self.add(skill)
+
+    def find_all(self, text: str) -> list[str]:
+        """Return every registered skill in text, in order of first occurrence."""
+        tokens = tokenize_skill_text(text)
+        root = self._root
+        found: dict[str, None] = {}
+        for i in range(len(tokens)):
+            node = root.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                name = node.get(_END)
+                if name is not None:
+                    found[name] = None
+                if j == len(tokens):
+                    break
+                node = node.get(tokens[j])
+                j += 1
+        return list(found)
+
+
+def load_skill_dictionary(path: str, matcher: SkillMatcher | None = None) -> SkillMatcher:
+    """Load one skill per line from path (blank lines and '#' comments skipped).
+
+    Skills are added to matcher, or to the module-level matcher used by
+    extract_skills when none is given.
+    """
+    target = matcher if matcher is not None else _matcher
+    with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+        target.add_all(
+            line.strip() for line in fh
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+    return target
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Return the shared matcher built from SKILL_DATABASE (and SKILL_DICTIONARY_PATH)."""
+    return _matcher
+
+
+_matcher = SkillMatcher(SKILL_DATABASE)
+
+if os.getenv("SKILL_DICTIONARY_PATH"):
+    load_skill_dictionary(os.environ["SKILL_DICTIONARY_PATH"])
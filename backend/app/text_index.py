@@ -0,0 +1,284 @@
+import math
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+
+# Words with digits and symbols kept, so "k8s", "python3", "c++" and "c#" are terms
+TERM = re.compile(r"[a-z0-9+#][a-z0-9+#.\-]*")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Postings buffered per term before they are merged into the compressed block
+_PENDING_LIMIT = 64
+# Rebuild postings once this fraction of document numbers is dead
+_COMPACT_FRACTION = 0.25
+
+
+def terms(text: str) -> list[str]:
+    """Lowercased index terms of at least two characters, minus trailing punctuation."""
+    out = []
+    for token in TERM.findall(text.lower()):
+        token = token.strip(".-")
+        if len(token) >= 2:
+            out.append(token)
+    return out
+
+
+def _narrowest(values: np.ndarray) -> np.ndarray:
+    top = int(values.max()) if len(values) else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return values.astype(np.uint64)
+
+
+class _Postings:
+    """Posting list for one term.
+
+    Merged postings are stored as document-number gaps and term
+    frequencies, each packed into the narrowest unsigned dtype that fits;
+    new postings are buffered in plain lists until _PENDING_LIMIT.
+    """
+
+    __slots__ = ("first", "gaps", "tfs", "last", "pending_docs", "pending_tfs")
+
+    def __init__(self) -> None:
+        self.first = 0
+        self.gaps = np.zeros(0, dtype=np.uint8)
+        self.tfs = np.zeros(0, dtype=np.uint8)
+        self.last = -1
+        self.pending_docs: list[int] = []
+        self.pending_tfs: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.gaps) + len(self.pending_docs)
+
+    def add(self, docno: int, tf: int) -> None:
+        self.pending_docs.append(docno)
+        self.pending_tfs.append(tf)
+        self.last = docno
+        if len(self.pending_docs) >= _PENDING_LIMIT:
+            self.merge()
+
+    def merge(self) -> None:
+        if not self.pending_docs:
+            return
+        docs, tfs = self.decode()
+        self.encode(docs, tfs)
+
+    def encode(self, docs: np.ndarray, tfs: np.ndarray) -> None:
+        self.first = int(docs[0]) if len(docs) else 0
+        self.gaps = _narrowest(np.diff(docs, prepend=self.first))
+        self.tfs = _narrowest(tfs)
+        self.last = int(docs[-1]) if len(docs) else -1
+        self.pending_docs = []
+        self.pending_tfs = []
+
+    def decode(self) -> tuple[np.ndarray, np.ndarray]:
+        docs = np.cumsum(self.gaps, dtype=np.int64) + self.first if len(self.gaps) else np.zeros(0, np.int64)
+        tfs = self.tfs.astype(np.float32)
+        if self.pending_docs:
+            docs = np.concatenate([docs, np.asarray(self.pending_docs, dtype=np.int64)])
+            tfs = np.concatenate([tfs, np.asarray(self.pending_tfs, dtype=np.float32)])
+        return docs, tfs
+
+    @property
+    def nbytes(self) -> int:
+        return self.gaps.nbytes + self.tfs.nbytes + 16 * len(self.pending_docs)
+
+
+class TextIndex:
+    """In-process BM25 inverted index over resume text blobs.
+
+    Every add gets a fresh, increasing document number, so postings only
+    ever append. Updates and deletes leave dead numbers behind, which are
+    masked at query time and dropped by periodic compaction. A query only
+    touches the postings of its own terms.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, _Postings] = {}
+        self._docnos: dict[str, int] = {}
+        self._ids: list[str | None] = []  # docno -> resume id, None once dead
+        self._digests: dict[str, int] = {}  # resume id -> hash of its indexed text
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._docnos)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._docnos
+
+    def add(self, resume_id: str, text: str) -> None:
+        counts = Counter(terms(text or ""))
+        with self._lock:
+            self._remove(resume_id)
+            docno = len(self._ids)
+            self._ids.append(resume_id)
+            self._docnos[resume_id] = docno
+            self._digests[resume_id] = hash(text or "")
+            if docno >= len(self._lengths):
+                capacity = max(1024, 2 * len(self._lengths))
+                self._lengths = np.concatenate([self._lengths, np.zeros(capacity - len(self._lengths), np.float32)])
+                self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), bool)])
+            length = float(sum(counts.values()))
+            self._lengths[docno] = length
+            self._alive[docno] = True
+            self._total_length += length
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.add(docno, min(tf, 65535))
+
+    def refresh(self, resume_id: str, text: str) -> bool:
+        """Add or replace a resume's text unless it is already indexed verbatim; returns True if indexed."""
+        with self._lock:
+            if self._digests.get(resume_id) == hash(text or ""):
+                return False
+            self.add(resume_id, text)
+            return True
+
+    def ids(self) -> list[str]:
+        with self._lock:
+            return list(self._docnos)
+
+    def remove(self, resume_id: str) -> bool:
+        with self._lock:
+            removed = self._remove(resume_id)
+            if removed and len(self._ids) - len(self._docnos) > _COMPACT_FRACTION * max(len(self._ids), 1024):
+                self.compact()
+            return removed
+
+    def _remove(self, resume_id: str) -> bool:
+        docno = self._docnos.pop(resume_id, None)
+        if docno is None:
+            return False
+        self._digests.pop(resume_id, None)
+        self._ids[docno] = None
+        self._alive[docno] = False
+        self._total_length -= float(self._lengths[docno])
+        return True
+
+    def compact(self) -> None:
+        """Renumber live documents densely and drop dead postings."""
+        with self._lock:
+            old_ids = self._ids
+            alive = self._alive[:len(old_ids)].copy()
+            remap = np.cumsum(alive) - 1
+            self._ids = [rid for rid in old_ids if rid is not None]
+            self._docnos = {rid: i for i, rid in enumerate(self._ids)}
+            capacity = max(1024, len(self._ids))
+            lengths = np.zeros(capacity, dtype=np.float32)
+            lengths[:len(self._ids)] = self._lengths[:len(old_ids)][alive]
+            self._lengths = lengths
+            self._alive = np.zeros(capacity, dtype=bool)
+            self._alive[:len(self._ids)] = True
+            for term in list(self._postings):
+                postings = self._postings[term]
+                docs, tfs = postings.decode()
+                keep = alive[docs]
+                if not keep.any():
+                    del self._postings[term]
+                    continue
+                postings.encode(remap[docs[keep]], tfs[keep])
+
+    def search(self, query: str, k: int) -> list[tuple[str, float]]:
+        """Top-k resume ids by BM25 score (only documents matching at least one term)."""
+        query_terms = set(terms(query))
+        with self._lock:
+            n_live = len(self._docnos)
+            if not query_terms or n_live == 0 or k <= 0:
+                return []
+            n_docs = len(self._ids)
+            avg_length = self._total_length / n_live or 1.0
+            lengths = self._lengths[:n_docs]
+            scores = np.zeros(n_docs, dtype=np.float32)
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs, tfs = postings.decode()
+                # Document frequency counts dead numbers too; close enough between compactions
+                idf = math.log(1 + (n_live - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[docs] / avg_length)
+                scores[docs] += idf * tfs * (BM25_K1 + 1) / (tfs + norm)
+            scores[~self._alive[:n_docs]] = 0
+            matched = np.flatnonzero(scores)
+            if not len(matched):
+                return []
+            k = min(k, len(matched))
+            top = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(self._ids[d], float(scores[d])) for d in top]
+
+    def load(self, docs: Iterable[Any]) -> int:
+        """Bulk load Firestore resume snapshots with a text_blob; returns the number indexed.
+
+        Resumes already added (e.g. indexed while the load was streaming)
+        are newer than the snapshot and are kept.
+        """
+        count = 0
+        for doc in docs:
+            blob = (doc.to_dict() or {}).get("text_blob")
+            if blob and doc.id not in self:
+                self.add(doc.id, blob)
+                count += 1
+        with self._lock:
+            for postings in self._postings.values():
+                postings.merge()
+        self.loaded = True
+        return count
+
+    def ensure_loaded(self) -> None:
+        """Load every resume's text_blob from Firestore once per process."""
+        if self.loaded:
+            return
+        # Adds and searches keep running while the collection streams in
+        with self._load_lock:
+            if self.loaded:
+                return
+            from app.firestore_client import get_firestore_client
+
+            db = get_firestore_client()
+            self.load(db.collection("resumes").select(["text_blob"]).stream())
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": len(self._docnos),
+                "deadDocuments": len(self._ids) - len(self._docnos),
+                "terms": len(self._postings),
+                "postingBytes": sum(p.nbytes for p in self._postings.values()),
+                "loaded": self.loaded,
+            }
+
+
+def reciprocal_rank_fusion(rankings: Iterable[list[str]], k: int = 60) -> list[tuple[str, float]]:
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank)."""
+    fused: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, resume_id in enumerate(ranking, start=1):
+            fused[resume_id] = fused.get(resume_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+_index: TextIndex | None = None
+
+
+def get_text_index() -> TextIndex:
+    global _index
+    if _index is None:
+        _index = TextIndex()
+    return _index
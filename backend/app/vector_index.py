@@ -0,0 +1,661 @@
+import logging
+import os
+import threading
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from app.ann_index import IVFIndex
+from app.attribute_index import AttributeIndex
+from app.embedding_store import EmbeddingSnapshot, EmbeddingStore, get_embedding_store
+from app.metrics import registry
+from app.quantization import QuantizedMatrix, dequantize, from_bytes, quantize, to_bytes
+
+logger = logging.getLogger(__name__)
+
+# "exact" scans every row; "ivf" probes an inverted-file ANN index once the
+# corpus is large enough to be worth it
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "exact").lower()
+ANN_MIN_VECTORS = int(os.getenv("ANN_MIN_VECTORS", "20000"))
+ANN_NLIST = int(os.getenv("ANN_NLIST", "0"))  # 0 = about 4 * sqrt(n)
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+# Trained centroids are saved here and reused on restart instead of retraining
+ANN_INDEX_PATH = os.getenv("ANN_INDEX_PATH", "")
+# "int8" or "float16" keeps only a quantized copy resident, scans it and
+# rescores the best QUANT_RESCORE_FACTOR * k candidates at full precision
+# read from the embedding store (or Firestore); empty keeps float32 rows
+EMBEDDING_QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION", "").lower()
+QUANT_RESCORE_FACTOR = int(os.getenv("QUANT_RESCORE_FACTOR", "4"))
+# With quantization on, "0" stops writing the float list next to embeddingQ;
+# rescoring then relies on the embedding store
+EMBEDDING_FLOAT_COPY = os.getenv("EMBEDDING_FLOAT_COPY", "1") != "0"
+
+# Fields search results need; everything else stays in Firestore
+INDEX_FIELDS = [
+    "embedding", "fileName", "fileType", "uid", "url", "matchScore",
+    "parsed.skills", "parsed_llm.skills", "parsed.contact.location", "parsed_llm.contact.location",
+    "lexical",
+]
+# Resident metadata used for server-side scoring only, left out of results
+PRIVATE_META_FIELDS = ("lexical",)
+# The compact copy written next to (or instead of) the float list when quantizing
+COMPACT_EMBEDDING_FIELDS = ["embeddingQ", "embeddingQuant"]
+# What a quantized index without a store loads: the compact copy instead of the float list
+QUANTIZED_INDEX_FIELDS = [f for f in INDEX_FIELDS if f != "embedding"] + COMPACT_EMBEDDING_FIELDS
+
+Hit = tuple[str, float, dict[str, Any]]  # (resume id, cosine similarity, metadata)
+
+
+def resume_parsed(data: dict[str, Any]) -> dict[str, Any]:
+    """The parse every derived field is built from: the LLM one if present, else the rule-based one."""
+    return data.get("parsed_llm") or data.get("parsed") or {}
+
+
+def resume_text_blob(resume: dict[str, Any]) -> str:
+    """Convert a parsed resume into the text blob that is embedded and keyword-indexed."""
+    parts: list[str] = []
+        
+    # Add contact info
+    contact = resume.get("contact", {})
+    if contact:
+        parts.extend(filter(None, [
+            contact.get("fullName", ""),
+            contact.get("location", "")
+        ]))
+    
+    # Add summary if present
+    summary = resume.get("summary", "")
+    if summary:
+        parts.append(str(summary))
+        
+    # Add skills list if present
+    skills = resume.get("skills", [])
+    if skills and isinstance(skills, list):
+        parts.extend(str(s) for s in skills if s)
+        
+    # Add experience entries
+    experience = resume.get("experience", [])
+    if experience and isinstance(experience, list):
+        for exp in experience:
+            parts.extend(filter(None, [
+                exp.get("title", ""),
+                exp.get("company", ""),
+                exp.get("location", "")
+            ]))
+            # Add bullet points if present
+            bullets = exp.get("bullets", [])
+            if bullets and isinstance(bullets, list):
+                parts.extend(str(b) for b in bullets if b)
+                
+    # Add education entries
+    education = resume.get("education", [])
+    if education and isinstance(education, list):
+        for edu in education:
+            parts.extend(filter(None, [
+                edu.get("degree", ""),
+                edu.get("field", ""),
+                edu.get("school", "")
+            ]))
+                
+    return "\n".join(p for p in parts if p.strip())
+
+
+def resume_metadata(data: dict[str, Any]) -> dict[str, Any]:
+    """Light per-resume fields kept next to the vector for result rendering."""
+    parsed = resume_parsed(data)
+    return {
+        "fileName": data.get("fileName"),
+        "fileType": data.get("fileType"),
+        "uid": data.get("uid"),
+        "url": data.get("url"),
+        "matchScore": data.get("matchScore"),
+        "skills": parsed.get("skills", []),
+        "location": (parsed.get("contact") or {}).get("location"),
+        # score_resume's inputs, written by the indexing paths as lexical_profile(parsed)
+        "lexical": data.get("lexical"),
+    }
+
+
+def public_metadata(meta: dict[str, Any]) -> dict[str, Any]:
+    """Resident metadata as returned in search results."""
+    return {key: value for key, value in meta.items() if key not in PRIVATE_META_FIELDS}
+
+
+def quantized_fields(vector: np.ndarray) -> dict[str, Any]:
+    """Compact Firestore copy of an embedding ({} unless EMBEDDING_QUANTIZATION is set)."""
+    if not EMBEDDING_QUANTIZATION:
+        return {}
+    return {"embeddingQ": to_bytes(vector, EMBEDDING_QUANTIZATION), "embeddingQuant": EMBEDDING_QUANTIZATION}
+
+
+def embedding_fields(vector: np.ndarray) -> dict[str, Any]:
+    """Firestore update storing an embedding: the float list, its compact copy, or both.
+
+    With EMBEDDING_QUANTIZATION set and EMBEDDING_FLOAT_COPY=0 only the
+    compact copy is kept (384 int8 bytes instead of 3 KB of doubles) and
+    an older float list is deleted, so it cannot shadow the new vector.
+    """
+    fields = quantized_fields(vector)
+    if not fields or EMBEDDING_FLOAT_COPY:
+        fields["embedding"] = np.asarray(vector, dtype=np.float32).tolist()
+    else:
+        from google.cloud.firestore_v1 import DELETE_FIELD
+
+        fields["embedding"] = DELETE_FIELD
+    return fields
+
+
+def stored_vector(data: dict[str, Any], quantization: str = "") -> Any:
+    """A resume document's embedding: the float list, else its compact copy in this mode, else None."""
+    if data.get("embedding"):
+        return data["embedding"]
+    if quantization and data.get("embeddingQ") and data.get("embeddingQuant") == quantization:
+        return from_bytes(data["embeddingQ"], quantization)
+    return None
+
+
+class _Candidates(NamedTuple):
+    """Shortlisted rows copied out of a quantized index, for rescoring without its lock."""
+    ids: list[str]
+    meta: list[dict[str, Any]]
+    codes: np.ndarray
+    scales: np.ndarray | None
+
+
+class VectorIndex:
+    """Process-resident matrix of normalized resume embeddings.
+
+    Rows live in one contiguous float32 array that grows by doubling, so a
+    query is a single matrix-vector product plus an argpartition top-k.
+    Deletes move the last row into the freed slot to keep rows dense.
+    Writes go through to the on-disk embedding store when one is attached,
+    and a cold start maps that store instead of scanning Firestore.
+
+    With quantization set, only int8/float16 rows are resident. Scans read
+    those, and the shortlisted rows are rescored at full precision. The
+    full-precision rows come from the embedding store's shared mapping, or
+    from Firestore for rows the store lacks.
+
+    Rows are also indexed by skill, location, file type and score, so a
+    filtered search only scores the rows that pass the filters.
+    """
+
+    def __init__(self, dim: int | None = None, store: EmbeddingStore | None = None,
+                 quantization: str = EMBEDDING_QUANTIZATION, rescore_factor: int = QUANT_RESCORE_FACTOR):
+        self.dim = dim
+        self.store = store
+        self.quantization = quantization
+        self.rescore_factor = max(1, rescore_factor)
+        self._quantized: QuantizedMatrix | None = QuantizedMatrix(quantization, dim) if quantization and dim else None
+        # None when quantized: rescoring reads full precision from the store instead
+        self._matrix: np.ndarray | None = None if quantization else np.zeros((0, dim or 0), dtype=np.float32)
+        self._ids: list[str] = []
+        self._meta: list[dict[str, Any]] = []
+        self._rows: dict[str, int] = {}
+        self._attributes = AttributeIndex()
+        self._lock = threading.RLock()
+        self.loaded = False
+        self.ann: IVFIndex | None = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._rows
+
+    def _prepare(self, vector: Iterable[float]) -> np.ndarray | None:
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        if vec.size == 0 or not np.isfinite(vec).all():
+            return None
+        if self.dim is None:
+            self.dim = int(vec.size)
+            if self.quantization:
+                self._quantized = QuantizedMatrix(self.quantization, self.dim)
+            else:
+                self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        if vec.size != self.dim:
+            return None
+        return vec
+
+    def _grow(self, needed: int) -> None:
+        capacity = (self._matrix if self._matrix is not None else self._quantized.codes).shape[0]  # type: ignore[union-attr]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        if self._matrix is not None:
+            grown = np.zeros((new_capacity, self.dim), dtype=np.float32)
+            grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+            self._matrix = grown
+        if self._quantized is not None:
+            self._quantized.reserve(new_capacity, len(self._ids))
+
+    def upsert(self, resume_id: str, vector: Iterable[float], meta: dict[str, Any] | None = None,
+               persist: bool = True) -> bool:
+        """Insert or replace a resume's vector; returns False if the vector is unusable."""
+        with self._lock:
+            vec = self._prepare(vector)
+            if vec is None:
+                self.remove(resume_id, persist=persist)
+                return False
+            row = self._rows.get(resume_id)
+            if row is None:
+                row = len(self._ids)
+                self._grow(row + 1)
+                self._ids.append(resume_id)
+                self._meta.append(meta or {})
+                self._rows[resume_id] = row
+                self._attributes.set(row, self._meta[row])
+            elif meta is not None:
+                self._meta[row] = meta
+                self._attributes.set(row, meta)
+            if self._matrix is not None:
+                self._matrix[row] = vec
+            if self._quantized is not None:
+                self._quantized.set(row, vec)
+            if self.ann is not None:
+                self.ann.add(resume_id, vec)
+            if persist and self.store is not None:
+                self.store.append([resume_id], vec[None, :], [self._meta[row]])
+            return True
+
+    def upsert_many(self, ids: list[str], vectors: np.ndarray, metas: list[dict[str, Any]]) -> int:
+        """Bulk upsert with a single append to the embedding store; returns the number indexed."""
+        kept: list[int] = []
+        with self._lock:
+            for i, (resume_id, vec, meta) in enumerate(zip(ids, vectors, metas)):
+                if self.upsert(resume_id, vec, meta, persist=False):
+                    kept.append(i)
+                elif self.store is not None:
+                    self.store.delete([resume_id])
+            if self.store is not None and kept:
+                x = np.asarray(vectors, dtype=np.float32)[kept]
+                self.store.append([ids[i] for i in kept], x, [self._meta[self._rows[ids[i]]] for i in kept])
+        return len(kept)
+
+    def refresh(self, resume_id: str, vector: Iterable[float], meta: dict[str, Any],
+                persist: bool = False) -> bool:
+        """Upsert only if the vector changed, otherwise just replace the metadata in memory.
+
+        Returns True if the vector was written. Meant for change feeds that
+        replay writes this process has usually applied already; the worker
+        that made the write has appended it to the shared store, so replays
+        stay in memory unless persist is set.
+        """
+        with self._lock:
+            row = self._rows.get(resume_id)
+            if row is not None:
+                vec = np.asarray(vector, dtype=np.float32).ravel()
+                if vec.shape == (self.dim,) and (
+                    np.array_equal(vec, self._matrix[row]) if self._matrix is not None
+                    else self._quantized.matches(row, vec)  # type: ignore[union-attr]
+                ):
+                    if meta != self._meta[row]:
+                        self._meta[row] = meta
+                        self._attributes.set(row, meta)
+                    return False
+            return self.upsert(resume_id, vector, meta, persist=persist)
+
+    def ids(self) -> list[str]:
+        with self._lock:
+            return list(self._ids)
+
+    def update_meta(self, resume_id: str, meta: dict[str, Any]) -> None:
+        with self._lock:
+            row = self._rows.get(resume_id)
+            if row is not None:
+                self._meta[row].update(meta)
+                self._attributes.set(row, self._meta[row])
+
+    def remove(self, resume_id: str, persist: bool = True) -> bool:
+        with self._lock:
+            row = self._rows.pop(resume_id, None)
+            if row is None:
+                return False
+            if persist and self.store is not None:
+                self.store.delete([resume_id])
+            if self.ann is not None:
+                self.ann.remove(resume_id)
+            last = len(self._ids) - 1
+            self._attributes.clear(row)
+            if row != last:
+                self._attributes.move(row, last)
+                if self._matrix is not None:
+                    self._matrix[row] = self._matrix[last]
+                if self._quantized is not None:
+                    self._quantized.move(row, last)
+                self._ids[row] = self._ids[last]
+                self._meta[row] = self._meta[last]
+                self._rows[self._ids[row]] = row
+            self._ids.pop()
+            self._meta.pop()
+            return True
+
+    def search(self, query: Iterable[float], k: int, exact: bool = False,
+               nprobe: int | None = None, where: dict[str, Any] | None = None) -> list[Hit]:
+        """Top-k by cosine similarity (vectors are stored normalized).
+
+        Uses the ANN index (or the quantized scan) when available, unless
+        exact is set. where holds AttributeIndex.mask filters (skills,
+        location, file_type, min_score); filtered searches only score the
+        rows that match, exactly or through the quantized shortlist.
+        """
+        q = np.asarray(query, dtype=np.float32).ravel()
+        with self._lock:
+            n = len(self._ids)
+            if n == 0 or k <= 0 or q.size != self.dim:
+                return []
+            rows = None
+            if where:
+                rows = np.flatnonzero(self._filter(where))
+                if not len(rows):
+                    return []
+            elif self.ann is not None and not exact:
+                return [
+                    (resume_id, sim, self._meta[self._rows[resume_id]])
+                    for resume_id, sim in self.ann.search(q, k, nprobe)
+                ]
+            if self._matrix is not None:
+                scores = self._matrix[:n] @ q if rows is None else self._matrix[rows] @ q
+                k = min(k, len(scores))
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top], kind="stable")]
+                found = top if rows is None else rows[top]
+                return [(self._ids[i], float(scores[j]), self._meta[i]) for i, j in zip(found, top)]
+            # Shortlist on the quantized rows; rescore outside the lock, since
+            # full-precision rows may have to come from Firestore
+            approx = self._quantized.scores(q, n if rows is None else rows)  # type: ignore[union-attr]
+            k = min(k, len(approx))
+            shortlist = len(approx) if exact else min(len(approx), k * self.rescore_factor)
+            best = np.argpartition(-approx, shortlist - 1)[:shortlist]
+            candidates = self._candidates(best if rows is None else rows[best])
+        return self._rescore(candidates, self._full_precision(candidates), np.arange(shortlist), q, k)
+
+    def _candidates(self, rows: np.ndarray) -> _Candidates:
+        """Copy what rescoring needs out of these rows; caller holds the lock."""
+        rows = np.sort(rows)  # sequential reads from the quantized rows
+        quantized = self._quantized
+        assert quantized is not None
+        return _Candidates(
+            ids=[self._ids[i] for i in rows],
+            meta=[self._meta[i] for i in rows],
+            codes=quantized.codes[rows],
+            scales=None if quantized.scales is None else quantized.scales[rows],
+        )
+
+    def _full_precision(self, candidates: _Candidates) -> np.ndarray:
+        """Full-precision vectors of the candidates, from the store, else Firestore, else dequantized.
+
+        A fetched vector is only used if it quantizes to the resident codes,
+        so a store or document that is behind or ahead of this index cannot
+        change a score by more than quantization error. The Firestore read
+        blocks, so request handlers run searches in a thread.
+        """
+        vectors = dequantize(candidates.codes, candidates.scales)
+        missing = np.ones(len(candidates.ids), dtype=bool)
+
+        def accept(positions: np.ndarray, fetched: np.ndarray) -> None:
+            codes, scales = quantize(fetched, self.quantization)
+            same = (codes == candidates.codes[positions]).all(axis=1)
+            if scales is not None and candidates.scales is not None:
+                same &= scales == candidates.scales[positions]
+            vectors[positions[same]] = fetched[same]
+            missing[positions[same]] = False
+
+        if self.store is not None:
+            found, fetched = self.store.read(candidates.ids)
+            if found.any():
+                accept(np.flatnonzero(found), fetched[found])  # type: ignore[index]
+            registry.counter("vector_index.rescore.store_rows").inc(int(found.sum()))
+        if missing.any():
+            try:
+                from app.firestore_client import get_firestore_client
+
+                db = get_firestore_client()
+                positions = np.flatnonzero(missing)
+                refs = [db.collection("resumes").document(candidates.ids[i]) for i in positions]
+                by_id = {
+                    doc.id: doc.get("embedding")
+                    for doc in db.get_all(refs, field_paths=["embedding"]) if doc.exists
+                }
+                kept = [(i, by_id[candidates.ids[i]]) for i in positions if by_id.get(candidates.ids[i])]
+                if kept:
+                    accept(np.array([i for i, _ in kept]), np.asarray([v for _, v in kept], dtype=np.float32))
+                registry.counter("vector_index.rescore.firestore_rows").inc(len(kept))
+            except Exception as exc:
+                logger.warning("Rescoring with quantized vectors, full precision unavailable: %s", exc)
+        registry.counter("vector_index.rescore.approximate_rows").inc(int(missing.sum()))
+        return vectors
+
+    @staticmethod
+    def _rescore(candidates: _Candidates, vectors: np.ndarray, positions: np.ndarray,
+                 q: np.ndarray, k: int) -> list[Hit]:
+        """Top-k of the candidates at the given positions, scored on their full-precision vectors."""
+        exact_scores = vectors[positions] @ q
+        k = min(k, len(positions))
+        best = np.argpartition(-exact_scores, k - 1)[:k]
+        best = best[np.argsort(-exact_scores[best], kind="stable")]
+        return [
+            (candidates.ids[p], float(exact_scores[b]), candidates.meta[p]) for b, p in zip(best, positions[best])
+        ]
+
+    def search_many(self, queries: np.ndarray, k: int, exact: bool = False,
+                    nprobe: int | None = None, where: dict[str, Any] | None = None) -> list[list[Hit]]:
+        """search() for several queries at once, scoring them together.
+
+        The exact and filtered paths are one matrix-matrix product over the
+        (candidate) rows, the quantized path one pass over the quantized
+        rows and one full-precision fetch for all shortlists; only the ANN
+        path still probes query by query.
+        """
+        Q = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        with self._lock:
+            n = len(self._ids)
+            if n == 0 or k <= 0 or Q.shape[1] != self.dim:
+                return [[] for _ in Q]
+            rows = None
+            if where:
+                rows = np.flatnonzero(self._filter(where))
+                if not len(rows):
+                    return [[] for _ in Q]
+            elif self.ann is not None and not exact:
+                return [self.search(q, k, nprobe=nprobe) for q in Q]
+            if self._matrix is not None:
+                # (queries, rows), so each query's top-k is a contiguous argpartition
+                scores = Q @ (self._matrix[:n] if rows is None else self._matrix[rows]).T
+                k = min(k, scores.shape[1])
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                results = []
+                for query_scores, best in zip(scores, top):
+                    best = best[np.argsort(-query_scores[best], kind="stable")]
+                    found = best if rows is None else rows[best]
+                    results.append([
+                        (self._ids[i], float(query_scores[c]), self._meta[i]) for i, c in zip(found, best)
+                    ])
+                return results
+            approx = self._quantized.scores_many(Q, n if rows is None else rows)  # type: ignore[union-attr]
+            k = min(k, approx.shape[1])
+            shortlist = approx.shape[1] if exact else min(approx.shape[1], k * self.rescore_factor)
+            shortlists = np.argpartition(-approx, shortlist - 1, axis=1)[:, :shortlist]
+            # One candidate set for every query, so full precision is fetched once
+            union = np.unique(shortlists)
+            candidates = self._candidates(union if rows is None else rows[union])
+        vectors = self._full_precision(candidates)
+        # _candidates sorts rows, and union is sorted, so positions carry over
+        positions = np.searchsorted(union, shortlists)
+        return [self._rescore(candidates, vectors, p, q, k) for p, q in zip(positions, Q)]
+
+    def _filter(self, where: dict[str, Any]) -> np.ndarray:
+        """Mask of rows matching where; the first filtered search builds the attribute index."""
+        if not self._attributes.built:
+            self._attributes.rebuild(self._meta)
+        return self._attributes.mask(len(self._ids), **where)
+
+    def score_ids(self, query: Iterable[float], ids: Iterable[str],
+                  where: dict[str, Any] | None = None) -> list[Hit]:
+        """Exact similarity of query to specific resumes.
+
+        Ids not in the index, or not matching the where filters, are skipped.
+        """
+        q = np.asarray(query, dtype=np.float32).ravel()
+        with self._lock:
+            rows = [self._rows[i] for i in ids if i in self._rows]
+            if where and rows:
+                mask = self._filter(where)
+                rows = [r for r in rows if mask[r]]
+            if not rows or q.size != self.dim:
+                return []
+            if self._matrix is not None:
+                sims = self._matrix[rows] @ q
+                return [(self._ids[r], float(s), self._meta[r]) for r, s in zip(rows, sims)]
+            candidates = self._candidates(np.asarray(rows))
+        sims = self._full_precision(candidates) @ q
+        return [(resume_id, float(s), meta) for resume_id, s, meta in zip(candidates.ids, sims, candidates.meta)]
+
+    def load(self, docs: Iterable[Any], collect: list[tuple[str, np.ndarray]] | None = None) -> int:
+        """Bulk load Firestore resume snapshots; returns the number indexed.
+
+        Indexed (id, float32 vector) pairs are appended to collect if given,
+        for seeding the store when no float32 matrix is kept.
+        """
+        count = 0
+        for doc in docs:
+            data = doc.to_dict() or {}
+            emb = stored_vector(data, self.quantization)
+            if emb is not None and self.upsert(doc.id, emb, resume_metadata(data), persist=False):
+                count += 1
+                if collect is not None:
+                    collect.append((doc.id, np.asarray(emb, dtype=np.float32)))
+        self.loaded = True
+        return count
+
+    def load_snapshot(self, snapshot: EmbeddingSnapshot) -> int:
+        """Adopt the rows of a mapped embedding store snapshot.
+
+        A dense snapshot is used as the matrix directly, so its pages stay
+        shared with other workers until this process modifies or outgrows it.
+        A quantized index only reads it once to build its quantized rows.
+        """
+        with self._lock:
+            self.dim = int(snapshot.matrix.shape[1])
+            vectors = snapshot.vectors()
+            self._ids = list(snapshot.ids)
+            self._meta = list(snapshot.meta)
+            self._rows = {resume_id: row for row, resume_id in enumerate(self._ids)}
+            self._attributes = AttributeIndex()
+            if self.quantization:
+                self._quantized = QuantizedMatrix(self.quantization, self.dim)
+                self._quantized.set_many(vectors)
+                self._matrix = None
+            else:
+                self._matrix = vectors
+            self.loaded = True
+            return len(self._ids)
+
+    def build_ann(self, nlist: int = 0, nprobe: int = ANN_NPROBE, centroids: np.ndarray | None = None) -> IVFIndex:
+        """(Re)build the IVF index over the current rows.
+
+        Trains new centroids unless ones are given; the old index keeps
+        serving until the new one is swapped in.
+        """
+        if centroids is None:
+            with self._lock:
+                sample = self._resident_vectors()
+            ann = IVFIndex.train(sample, nlist=nlist, nprobe=nprobe)
+        else:
+            ann = IVFIndex(centroids, nprobe=nprobe)
+        with self._lock:
+            # Rows may have changed while training; index the current ones
+            ann.add_many(self._ids, self._resident_vectors())
+            self.ann = ann
+        return ann
+
+    def _resident_vectors(self) -> np.ndarray:
+        """A float32 copy of every row (dequantized when quantized); caller holds the lock."""
+        n = len(self._ids)
+        if self._matrix is not None:
+            return self._matrix[:n].copy()
+        return self._quantized.vectors(np.arange(n)) if self._quantized is not None else np.zeros((0, self.dim or 0))
+
+    def save_centroids(self, path: str) -> None:
+        """Persist only the trained centroids; rows are re-assigned on load."""
+        if self.ann is not None:
+            IVFIndex(self.ann.centroids, nprobe=self.ann.nprobe).save(path)
+
+    def _init_ann(self) -> None:
+        if ANN_INDEX_PATH and os.path.exists(ANN_INDEX_PATH):
+            try:
+                saved = IVFIndex.load(ANN_INDEX_PATH, centroids_only=True)
+                if saved.dim == self.dim:
+                    self.build_ann(nprobe=ANN_NPROBE, centroids=saved.centroids)
+                    return
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning("Ignoring unreadable ANN index %s: %s", ANN_INDEX_PATH, exc)
+        if len(self) < ANN_MIN_VECTORS:
+            return
+        self.build_ann(nlist=ANN_NLIST, nprobe=ANN_NPROBE)
+        if ANN_INDEX_PATH:
+            self.save_centroids(ANN_INDEX_PATH)
+
+    def _load_quantized(self, db: Any) -> None:
+        """Load the compact embeddingQ copies; documents written without one fall back to the float list."""
+        legacy: list[str] = []
+        count = 0
+        for doc in db.collection("resumes").select(QUANTIZED_INDEX_FIELDS).stream():
+            data = doc.to_dict() or {}
+            emb = stored_vector(data, self.quantization)
+            if emb is None:
+                legacy.append(doc.id)
+            elif self.upsert(doc.id, emb, resume_metadata(data), persist=False):
+                count += 1
+        for start in range(0, len(legacy), 300):
+            refs = [db.collection("resumes").document(resume_id) for resume_id in legacy[start:start + 300]]
+            self.load(db.get_all(refs, field_paths=INDEX_FIELDS))
+        self.loaded = True
+        logger.info("Loaded %d quantized embeddings, %d documents without embeddingQ", count, len(legacy))
+
+    def ensure_loaded(self) -> None:
+        """Load every indexed resume from Firestore once per process."""
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            snapshot = self.store.open() if self.store is not None else None
+            if snapshot is not None:
+                self.load_snapshot(snapshot)
+            else:
+                from app.firestore_client import get_firestore_client
+
+                db = get_firestore_client()
+                if self.quantization and self.store is None:
+                    self._load_quantized(db)
+                else:
+                    # Seeding the store needs full precision; a quantized
+                    # index holds it only until the store has it
+                    collected: list[tuple[str, np.ndarray]] | None = [] if self._matrix is None else None
+                    fields = [*INDEX_FIELDS, *COMPACT_EMBEDDING_FIELDS] if self.quantization else INDEX_FIELDS
+                    self.load(db.collection("resumes").select(fields).stream(), collected)
+                    if self.store is not None and self._ids:
+                        # Until this point the store ignored this worker's writes
+                        if collected is None:
+                            self.store.seed(self._ids, self._matrix[:len(self._ids)], self._meta)  # type: ignore[index]
+                        elif collected:
+                            self.store.seed(
+                                [resume_id for resume_id, _ in collected],
+                                np.stack([vec for _, vec in collected]),
+                                [self._meta[self._rows[resume_id]] for resume_id, _ in collected],
+                            )
+                        del collected
+            if VECTOR_INDEX_BACKEND == "ivf":
+                self._init_ann()
+
+
+_index: VectorIndex | None = None
+
+
+def get_vector_index() -> VectorIndex:
+    global _index
+    if _index is None:
+        _index = VectorIndex(store=get_embedding_store())
+    return _index
@@ -0,0 +1,137 @@
+"""Adversarial inputs for the regex-heavy extractors.
+
+Each case is a pathological text for the patterns that used to backtrack
+catastrophically (long runs of letters and spaces, dotted local parts,
+repeated degree keywords). The benchmark times the extractors on growing
+sizes and fails if any run exceeds the per-extractor budget plus slack.
+Sizes above PARSE_MAX_CHARS only exercise parse_resume_content, which is
+the entry point that truncates its input.
+--legacy also times the original patterns on small sizes for comparison.
+
+Usage (from backend/):
+    python -m benchmarks.bench_adversarial
+    python -m benchmarks.bench_adversarial --legacy
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections.abc import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import parsing  # noqa: E402
+
+CASES: dict[str, Callable[[int], str]] = {
+    "letters_spaces": lambda n: ("abc def " * (n // 8 + 1))[:n],
+    "letters_spaces_comma": lambda n: ("abc def " * (n // 8 + 1))[:n] + ", ",
+    "no_digit_zip": lambda n: ("Abc Def, Ghi " * (n // 13 + 1))[:n],
+    "dotted_local_part": lambda n: ("a." * (n // 2 + 1))[:n] + "@",
+    "many_ats": lambda n: ("a@" * (n // 2 + 1))[:n],
+    "dotted_domain": lambda n: "x@" + ("a." * (n // 2 + 1))[:n],
+    "job_without_date": lambda n: "Experience\n" + ("Senior Engineer Acme " * (n // 21 + 1))[:n] + " 20",
+    "many_dates": lambda n: "Experience\n" + ("Dev Acme 2019 - 2020 " * (n // 21 + 1))[:n],
+    "degree_without_school": lambda n: "Education\nBachelor " + ("abc def " * (n // 8 + 1))[:n],
+    "repeated_degrees": lambda n: "Education\n" + ("Bachelor Master " * (n // 16 + 1))[:n],
+}
+
+EXTRACTORS: dict[str, Callable[[str], object]] = {
+    "contact": parsing.extract_contact_info,
+    "experience": parsing.extract_experience,
+    "education": parsing.extract_education,
+    "parse_resume_content": parsing.parse_resume_content,
+}
+
+# Original patterns, kept only to demonstrate the blow-up
+LEGACY: dict[str, str] = {
+    "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    "location_city_state_zip": r'([A-Za-z\s]+),\s*([A-Za-z\s]+)\s*\d{5}',
+    "job": r'([A-Za-z\s,&]+)\s+([A-Za-z\s,&\.]+)\s+(\d{4}\s*[\-–]\s*(?:\d{4}|Present|Current))',
+    "degree": r'(Bachelor|Master|PhD|Doctor|Associate|B\.?[AS]|M\.?[AS]|M\.?B\.?A|Ph\.?D)[^\n]*([A-Za-z\s]+)\s+([A-Za-z\s&,\.]+University|College|Institute)\s*(\d{4})?',
+}
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(sizes: list[int], slack: float) -> tuple[dict, bool]:
+    # Extractors stop at the budget; one bounded window may run past it
+    bound = parsing.EXTRACTOR_BUDGET_SECONDS + slack
+    results: dict[str, dict] = {}
+    ok = True
+    for case, make in CASES.items():
+        for n in sizes:
+            text = make(n)
+            for name, fn in EXTRACTORS.items():
+                if n > parsing.PARSE_MAX_CHARS > 0 and name != "parse_resume_content":
+                    continue
+                # The full parse runs seven extractors, each with its own budget
+                limit = bound * 7 if name == "parse_resume_content" else bound
+                seconds = timed(lambda: fn(text))
+                passed = seconds <= limit
+                ok = ok and passed
+                results.setdefault(case, {}).setdefault(name, {})[n] = round(seconds * 1000, 3)
+                if not passed:
+                    print(f"FAIL {case} n={n} {name}: {seconds:.3f}s > {limit:.3f}s")
+    return results, ok
+
+
+def run_legacy(sizes: list[int]) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    inputs = {
+        "email": CASES["dotted_local_part"],
+        "location_city_state_zip": CASES["letters_spaces_comma"],
+        "job": CASES["job_without_date"],
+        "degree": CASES["degree_without_school"],
+    }
+    for name, pattern in LEGACY.items():
+        compiled = re.compile(pattern)
+        for n in sizes:
+            text = inputs[name](n)
+            results.setdefault(name, {})[n] = round(timed(lambda: compiled.findall(text)) * 1000, 3)
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="1000,10000,100000,1000000", help="Comma-separated input lengths")
+    ap.add_argument("--slack", type=float, default=0.25, help="Seconds allowed past the budget")
+    ap.add_argument("--legacy", action="store_true", help="Also time the original patterns")
+    ap.add_argument("--legacy-sizes", default="250,500,1000", help="Input lengths for --legacy")
+    ap.add_argument("--output", help="Write results as JSON to this path")
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results, ok = run(sizes, args.slack)
+    report: dict = {"budgetSeconds": parsing.EXTRACTOR_BUDGET_SECONDS, "ms": results}
+
+    print(f"budget {parsing.EXTRACTOR_BUDGET_SECONDS}s per extractor; times in ms")
+    for case, per_extractor in results.items():
+        for name, per_size in per_extractor.items():
+            cells = "  ".join(f"{n:>8}:{ms:>9.2f}" for n, ms in per_size.items())
+            print(f"{case:<24}{name:<22}{cells}")
+
+
+    if args.legacy:
+        legacy_sizes = [int(s) for s in args.legacy_sizes.split(",") if s]
+        report["legacyMs"] = run_legacy(legacy_sizes)
+        print("\noriginal patterns (ms)")
+        for name, per_size in report["legacyMs"].items():
+            cells = "  ".join(f"{n:>8}:{ms:>9.2f}" for n, ms in per_size.items())
+            print(f"{name:<46}{cells}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    print("\nOK: all extractors stayed within budget" if ok else "\nFAILED: budget exceeded")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Recall and latency of the IVF search index against exact search.
+
+Builds a VectorIndex over synthetic clustered unit vectors (or real
+all-MiniLM-L6-v2 embeddings of the Kaggle corpus with --real), trains the
+IVF index and sweeps nprobe, reporting recall@k against the exact top-k,
+per-query latency and the save/load round trip. Offline; --real needs the
+sentence-transformers model available locally.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ann --n 100000 --nprobe 4 8 16 32
+    python -m benchmarks.bench_ann --real --k 10
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ann_index import IVFIndex  # noqa: E402
+from app.vector_index import VectorIndex  # noqa: E402
+
+DEFAULT_CSV = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "dataset", "kaggle", "UpdatedResumeDataSet.csv"
+)
+
+
+def normalize(x: np.ndarray) -> np.ndarray:
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+
+def synthetic(n: int, queries: int, dim: int, clusters: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """Gaussian blobs on the unit sphere; queries are noisy copies of corpus rows."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    corpus = normalize(centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim)))
+    picks = corpus[rng.integers(0, n, queries)]
+    return corpus, normalize(picks + 0.05 * rng.standard_normal((queries, dim)))
+
+
+def real(path: str, queries: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """Embed Kaggle resume paragraphs; a random slice is held out as queries."""
+    from app.embeddings import embed_texts
+
+    with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+        resumes = [row["Resume"] for row in csv.DictReader(fh) if row.get("Resume")]
+    chunks = [c.strip() for text in resumes for c in text.split("\n") if len(c.strip()) > 40]
+    vectors = np.asarray(embed_texts(chunks), dtype=np.float32)
+    order = np.random.default_rng(seed).permutation(len(vectors))
+    return vectors[order[queries:]], vectors[order[:queries]]
+
+
+def evaluate(index: VectorIndex, queries: np.ndarray, k: int, nprobe: int | None) -> dict[str, Any]:
+    exact = nprobe is None
+    recalls, latencies = [], []
+    for q in queries:
+        truth = {hit[0] for hit in index.search(q, k, exact=True)}
+        start = time.perf_counter()
+        hits = index.search(q, k, exact=exact, nprobe=nprobe)
+        latencies.append(time.perf_counter() - start)
+        recalls.append(len(truth & {hit[0] for hit in hits}) / max(1, len(truth)))
+    latencies.sort()
+    return {
+        "nprobe": "exact" if exact else nprobe,
+        "recall": round(float(np.mean(recalls)), 4),
+        "mean_ms": round(1000 * float(np.mean(latencies)), 3),
+        "p99_ms": round(1000 * latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))], 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--real", action="store_true", help="embed the Kaggle corpus instead of synthetic vectors")
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--n", type=int, default=100000, help="synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200, help="synthetic blob count")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="IVF lists (0 = about 4 * sqrt(n))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    if args.real:
+        corpus, queries = real(args.csv, args.queries, args.seed)
+    else:
+        corpus, queries = synthetic(args.n, args.queries, args.dim, args.clusters, args.seed)
+
+    index = VectorIndex()
+    for i, vec in enumerate(corpus):
+        index.upsert(str(i), vec)
+
+    start = time.perf_counter()
+    ann = index.build_ann(nlist=args.nlist)
+    train_seconds = time.perf_counter() - start
+    print(f"{len(corpus)} vectors x {corpus.shape[1]} dims, nlist={ann.nlist}, "
+          f"trained in {train_seconds:.2f}s, k={args.k}")
+
+    rows = [evaluate(index, queries, args.k, None)]
+    rows += [evaluate(index, queries, args.k, p) for p in args.nprobe]
+    print(f"{'nprobe':>8} {'recall@k':>9} {'mean ms':>9} {'p99 ms':>9}")
+    for row in rows:
+        print(f"{row['nprobe']:>8} {row['recall']:>9.4f} {row['mean_ms']:>9.3f} {row['p99_ms']:>9.3f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ivf.npz")
+        start = time.perf_counter()
+        ann.save(path)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        restored = IVFIndex.load(path)
+        load_seconds = time.perf_counter() - start
+    same = all(
+        restored.search(q, args.k) == ann.search(q, args.k) for q in queries[:20]
+    )
+    print(f"save {save_seconds:.2f}s, load {load_seconds:.2f}s, results identical after load: {same}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({"vectors": len(corpus), "dim": int(corpus.shape[1]), "nlist": ann.nlist,
+                       "k": args.k, "train_seconds": round(train_seconds, 3), "results": rows}, fh, indent=2)
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
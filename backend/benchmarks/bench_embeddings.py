@@ -0,0 +1,91 @@
+"""Parity and throughput of the torch and ONNX int8 embedding backends.
+
+Embeds resume text from the Kaggle corpus with sentence-transformers on
+torch and with the int8 ONNX export on onnxruntime, then reports the cosine
+similarity between the two backends' vectors and each backend's throughput
+per batch size. Exits non-zero if any text falls below --min-cosine; the
+same check runs under pytest in tests/test_onnx_parity.py.
+
+Usage (from backend/):
+    python -m benchmarks.bench_embeddings --limit 500 --batch-sizes 1 8 32
+    python -m benchmarks.bench_embeddings --export   # re-export the ONNX model first
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.embeddings import EMBED_TORCH_THREADS, MODEL_NAME, ONNX_MODEL_DIR, _load_torch_model  # noqa: E402
+from app.onnx_embedder import install_onnx_export, load_onnx_embedder  # noqa: E402
+from benchmarks.bench_parser import DEFAULT_CSV, load_corpus  # noqa: E402
+
+
+def throughput(model: Any, texts: list[str], batch_size: int) -> float:
+    """Texts per second, after one warm-up batch."""
+    model.encode(texts[:batch_size], batch_size=batch_size, normalize_embeddings=True)
+    start = time.perf_counter()
+    model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--limit", type=int, default=500, help="resumes to embed")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--onnx-dir", default=ONNX_MODEL_DIR)
+    parser.add_argument("--fp32", action="store_true", help="compare the unquantized ONNX export instead")
+    parser.add_argument("--export", action="store_true", help="re-export the ONNX model before measuring")
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.csv, args.limit)
+    if args.export:
+        install_onnx_export(MODEL_NAME, args.onnx_dir, force=True)
+
+    start = time.perf_counter()
+    torch_model = _load_torch_model()
+    torch_load = time.perf_counter() - start
+    start = time.perf_counter()
+    onnx_model = load_onnx_embedder(MODEL_NAME, args.onnx_dir, threads=EMBED_TORCH_THREADS, quantized=not args.fp32)
+    onnx_load = time.perf_counter() - start
+
+    reference = np.asarray(torch_model.encode(texts, batch_size=32, normalize_embeddings=True), dtype=np.float32)
+    candidate = onnx_model.encode(texts, batch_size=32, normalize_embeddings=True)
+    cosine = (reference * candidate).sum(axis=1)
+    print(f"{len(texts)} texts, cosine torch vs onnx: mean {cosine.mean():.5f}, "
+          f"min {cosine.min():.5f}, p1 {np.percentile(cosine, 1):.5f}")
+    print(f"load: torch {torch_load:.2f}s, onnx {onnx_load:.2f}s ({onnx_model.path})")
+
+    rows: list[dict[str, Any]] = []
+    print(f"{'batch':>6} {'torch/s':>9} {'onnx/s':>9} {'speedup':>8}")
+    for batch_size in args.batch_sizes:
+        t = throughput(torch_model, texts, batch_size)
+        o = throughput(onnx_model, texts, batch_size)
+        rows.append({"batch_size": batch_size, "torch_per_s": round(t, 1), "onnx_per_s": round(o, 1)})
+        print(f"{batch_size:>6} {t:>9.1f} {o:>9.1f} {o / t:>7.2f}x")
+
+    passed = bool(cosine.min() >= args.min_cosine)
+    if not passed:
+        print(f"FAIL: {int((cosine < args.min_cosine).sum())} texts below cosine {args.min_cosine}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({
+                "texts": len(texts),
+                "cosine": {"mean": float(cosine.mean()), "min": float(cosine.min())},
+                "load_seconds": {"torch": round(torch_load, 3), "onnx": round(onnx_load, 3)},
+                "throughput": rows,
+            }, fh, indent=2)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Parser throughput benchmark over the bundled Kaggle resume corpus.
+
+Replays dataset/kaggle/UpdatedResumeDataSet.csv through parse_resume_content
+and each extractor, offline (no Firestore or Groq). Reports docs/sec,
+p50/p95/p99 latency and peak traced memory per extractor, and can save the
+results as JSON and compare against an earlier run.
+
+Usage (from backend/):
+    python -m benchmarks.bench_parser --output bench.json
+    python -m benchmarks.bench_parser --compare bench.json
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import parsing  # noqa: E402
+from app.sections import segment_sections  # noqa: E402
+
+DEFAULT_CSV = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "dataset", "kaggle", "UpdatedResumeDataSet.csv"
+)
+
+# name -> callable(text, sections); sections are precomputed so each extractor is timed alone
+EXTRACTORS: dict[str, Callable[[str, Any], Any]] = {
+    "segment_sections": lambda text, sections: segment_sections(text),
+    "contact": lambda text, sections: parsing.extract_contact_info(text),
+    "skills": lambda text, sections: parsing.extract_skills(text, sections),
+    "experience": lambda text, sections: parsing.extract_experience(text, sections),
+    "education": lambda text, sections: parsing.extract_education(text, sections),
+    "summary": lambda text, sections: parsing.extract_summary(text, sections),
+    "certifications": lambda text, sections: parsing.extract_certifications(text, sections),
+    "languages": lambda text, sections: parsing.extract_languages(text),
+    "parse_resume_content": lambda text, sections: parsing.parse_resume_content(text),
+}
+
+
+def load_corpus(path: str, limit: int = 0) -> list[str]:
+    with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+        texts = [row["Resume"] for row in csv.DictReader(fh) if row.get("Resume")]
+    return texts[:limit] if limit > 0 else texts
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def time_extractors(texts: list[str], repeat: int) -> dict[str, list[float]]:
+    """Wall time in seconds for every (extractor, document, repeat)."""
+    timings: dict[str, list[float]] = {name: [] for name in EXTRACTORS}
+    for _ in range(repeat):
+        for text in texts:
+            sections = segment_sections(text)
+            for name, fn in EXTRACTORS.items():
+                start = time.perf_counter()
+                fn(text, sections)
+                timings[name].append(time.perf_counter() - start)
+    return timings
+
+
+def peak_memory(texts: list[str]) -> dict[str, int]:
+    """Largest traced allocation peak (bytes) seen per extractor; separate pass so timing stays clean."""
+    peaks = {name: 0 for name in EXTRACTORS}
+    tracemalloc.start()
+    try:
+        for text in texts:
+            sections = segment_sections(text)
+            for name, fn in EXTRACTORS.items():
+                tracemalloc.reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+                fn(text, sections)
+                _, peak = tracemalloc.get_traced_memory()
+                peaks[name] = max(peaks[name], peak - base)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def run(texts: list[str], repeat: int) -> dict[str, Any]:
+    # Warm up module-level caches (compiled regexes, skill trie)
+    for text in texts[:10]:
+        parsing.parse_resume_content(text)
+
+    timings = time_extractors(texts, repeat)
+    peaks = peak_memory(texts)
+
+    results: dict[str, Any] = {}
+    for name, values in timings.items():
+        ordered = sorted(values)
+        total = sum(ordered)
+        results[name] = {
+            "calls": len(ordered),
+            "docsPerSec": round(len(ordered) / total, 2) if total else None,
+            "meanMs": round(total / len(ordered) * 1000, 4) if ordered else 0.0,
+            "p50Ms": round(percentile(ordered, 50) * 1000, 4),
+            "p95Ms": round(percentile(ordered, 95) * 1000, 4),
+            "p99Ms": round(percentile(ordered, 99) * 1000, 4),
+            "peakBytes": peaks[name],
+        }
+
+    return {
+        "meta": {
+            "parserVersion": parsing.PARSER_VERSION,
+            "documents": len(texts),
+            "repeat": repeat,
+            "corpusChars": sum(len(t) for t in texts),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict[str, Any], baseline: dict[str, Any] | None = None) -> None:
+    meta = report["meta"]
+    print(f"{meta['documents']} documents x {meta['repeat']} (parser v{meta['parserVersion']})")
+    header = f"{'extractor':<22}{'docs/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KiB':>10}"
+    if baseline:
+        header += f"{'p50 vs base':>13}"
+    print(header)
+    for name, row in report["results"].items():
+        line = (
+            f"{name:<22}{row['docsPerSec'] or 0:>12.1f}{row['p50Ms']:>10.3f}"
+            f"{row['p95Ms']:>10.3f}{row['p99Ms']:>10.3f}{row['peakBytes'] / 1024:>10.1f}"
+        )
+        base = (baseline or {}).get("results", {}).get(name)
+        if base and base.get("p50Ms"):
+            line += f"{(row['p50Ms'] / base['p50Ms'] - 1) * 100:>+12.1f}%"
+        print(line)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--csv", default=DEFAULT_CSV, help="Kaggle resume CSV (Category,Resume)")
+    ap.add_argument("--limit", type=int, default=0, help="Only use the first N resumes")
+    ap.add_argument("--repeat", type=int, default=1, help="Passes over the corpus")
+    ap.add_argument("--output", help="Write results as JSON to this path")
+    ap.add_argument("--compare", help="Baseline JSON from an earlier run")
+    args = ap.parse_args()
+
+    report = run(load_corpus(args.csv, args.limit), max(1, args.repeat))
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
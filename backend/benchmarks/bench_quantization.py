@@ -0,0 +1,107 @@
+"""Memory saved versus recall lost by quantized embedding scans.
+
+Indexes the same vectors (synthetic, or real MiniLM embeddings with
+--real) with float32, float16 and int8 scans and reports, per mode and
+rescore factor, the resident bytes of the scan matrix, the stored bytes per
+vector, recall@k against exact float32 search and per-query latency.
+Every index is loaded from a temporary embedding store, as in production,
+so quantized indexes rescore from its mapping rather than resident rows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_quantization --n 100000 --rescore 1 2 4 8
+    python -m benchmarks.bench_quantization --real
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.embedding_store import EmbeddingStore  # noqa: E402
+from app.quantization import QUANTIZATION_MODES, to_bytes  # noqa: E402
+from app.vector_index import VectorIndex  # noqa: E402
+from benchmarks.bench_ann import DEFAULT_CSV, real, synthetic  # noqa: E402
+
+
+def build(store: EmbeddingStore, mode: str, rescore: int) -> VectorIndex:
+    index = VectorIndex(store=store, quantization=mode, rescore_factor=rescore)
+    index.load_snapshot(store.open())
+    return index
+
+
+def evaluate(index: VectorIndex, truth: list[set[str]], queries: np.ndarray, k: int) -> tuple[float, float]:
+    recalls, latencies = [], []
+    for expected, q in zip(truth, queries):
+        start = time.perf_counter()
+        hits = index.search(q, k)
+        latencies.append(time.perf_counter() - start)
+        recalls.append(len(expected & {hit[0] for hit in hits}) / max(1, len(expected)))
+    return float(np.mean(recalls)), 1000 * float(np.mean(latencies))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--real", action="store_true", help="embed the Kaggle corpus instead of synthetic vectors")
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--n", type=int, default=100000, help="synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200, help="synthetic blob count")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="shortlist sizes as multiples of k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    if args.real:
+        corpus, queries = real(args.csv, args.queries, args.seed)
+    else:
+        corpus, queries = synthetic(args.n, args.queries, args.dim, args.clusters, args.seed)
+    n, dim = corpus.shape
+
+    store = EmbeddingStore(tempfile.mkdtemp(prefix="bench-quant-"))
+    store.seed([str(i) for i in range(n)], corpus, [{} for _ in range(n)])
+
+    baseline = build(store, "", 1)
+    truth = [{hit[0] for hit in baseline.search(q, args.k, exact=True)} for q in queries]
+    _, base_ms = evaluate(baseline, truth, queries, args.k)
+    rows: list[dict[str, Any]] = [{
+        "mode": "float32", "rescore": "-", "scan_mb": round(n * dim * 4 / 2**20, 1),
+        "stored_bytes": dim * 8,  # Firestore stores the float list as 64-bit doubles
+        "recall": 1.0, "mean_ms": round(base_ms, 3),
+    }]
+    del baseline
+
+    for mode in QUANTIZATION_MODES:
+        index = build(store, mode, 1)
+        for factor in args.rescore:
+            index.rescore_factor = factor
+            recall, mean_ms = evaluate(index, truth, queries, args.k)
+            rows.append({
+                "mode": mode, "rescore": factor, "scan_mb": round(index._quantized.nbytes(n) / 2**20, 1),
+                "stored_bytes": len(to_bytes(corpus[0], mode)),
+                "recall": round(recall, 4), "mean_ms": round(mean_ms, 3),
+            })
+        del index
+
+    print(f"{n} vectors x {dim} dims, k={args.k}")
+    print(f"{'mode':>8} {'rescore':>8} {'scan MB':>8} {'bytes/vec':>10} {'recall@k':>9} {'mean ms':>8}")
+    for row in rows:
+        print(f"{row['mode']:>8} {row['rescore']:>8} {row['scan_mb']:>8} {row['stored_bytes']:>10} "
+              f"{row['recall']:>9.4f} {row['mean_ms']:>8.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({"vectors": n, "dim": dim, "k": args.k, "results": rows}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import pytest
+
+from app.attribute_index import AttributeIndex
+
+LOCATIONS = ["Austin, TX 78701", "Dallas, TX", "Austin", "London, UK"]
+
+
+@pytest.fixture
+def index() -> AttributeIndex:
+    index = AttributeIndex()
+    index.rebuild([{"location": location} for location in LOCATIONS])
+    return index
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("Austin, TX", [0]),
+    ("austin,  tx 78701", [0]),
+    ("Austin", [0, 2]),
+    ("TX", [0, 1]),
+    ("78701", []),
+    ("Paris", []),
+])
+def test_location_filter_ignores_postal_codes(index, location, expected):
+    assert index.mask(len(LOCATIONS), location=location).nonzero()[0].tolist() == expected
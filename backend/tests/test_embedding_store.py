@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.embedding_store import LOG_FILE, EmbeddingStore
+
+
+def _vectors(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def _seeded(directory: str, n: int = 4) -> tuple[EmbeddingStore, list[str], np.ndarray]:
+    store = EmbeddingStore(directory)
+    ids = [f"r{i}" for i in range(n)]
+    x = _vectors(n)
+    assert store.seed(ids, x, [{"i": i} for i in range(n)])
+    return store, ids, x
+
+
+def _by_id(snapshot) -> dict[str, np.ndarray]:
+    return dict(zip(snapshot.ids, snapshot.vectors()))
+
+
+def test_unseeded_store_ignores_writes(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.append(["a"], _vectors(1), [{}])
+    store.delete(["a"])
+    assert store.open() is None
+    assert not os.path.exists(tmp_path / LOG_FILE)
+
+
+def test_reopen_sees_appends_deletes_and_compaction(tmp_path):
+    store, ids, x = _seeded(str(tmp_path))
+    newer = _vectors(1, seed=1)
+    store.append(["r1"], newer, [{"i": 1}])
+    store.delete(["r2"])
+
+    reopened = _by_id(EmbeddingStore(str(tmp_path)).open())
+    assert sorted(reopened) == ["r0", "r1", "r3"]
+    np.testing.assert_array_equal(reopened["r1"], newer[0])
+    np.testing.assert_array_equal(reopened["r3"], x[3])
+
+    assert store.compact() == 3
+    compacted = EmbeddingStore(str(tmp_path)).open()
+    assert compacted.dense
+    assert {k: v.tolist() for k, v in _by_id(compacted).items()} == {k: v.tolist() for k, v in reopened.items()}
+    assert sorted(n for n in os.listdir(tmp_path) if n.startswith("vectors")) == ["vectors.2.f32"]
+
+
+def test_crash_before_log_rename_keeps_old_generation(tmp_path, monkeypatch):
+    store, ids, x = _seeded(str(tmp_path))
+    store.append(["r0"], _vectors(1, seed=2), [{}])
+    before = {k: v.copy() for k, v in _by_id(EmbeddingStore(str(tmp_path)).open()).items()}
+
+    real_replace = os.replace
+
+    def crash(src, dst):
+        if dst.endswith(LOG_FILE):
+            raise OSError("simulated crash")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.setattr(os, "replace", real_replace)
+
+    # The compacted vector file exists, but the log still names the old one
+    after = _by_id(EmbeddingStore(str(tmp_path)).open())
+    assert {k: v.tolist() for k, v in after.items()} == {k: v.tolist() for k, v in before.items()}
+
+    # The next swap clears the orphan
+    assert store.compact() == len(ids)
+    assert sorted(n for n in os.listdir(tmp_path) if n.startswith("vectors")) == ["vectors.2.f32"]
+
+
+def test_reader_follows_other_writers_across_compaction(tmp_path):
+    writer, ids, x = _seeded(str(tmp_path))
+    reader = EmbeddingStore(str(tmp_path))
+    found, rows = reader.read(["r0", "missing"])
+    assert found.tolist() == [True, False]
+    np.testing.assert_array_equal(rows[0], x[0])
+
+    newer = _vectors(1, seed=3)
+    writer.append(["r0"], newer, [{}])
+    writer.compact()
+    found, rows = reader.read(["r0", "r3"])
+    assert found.all()
+    np.testing.assert_array_equal(rows[0], newer[0])
+    np.testing.assert_array_equal(rows[1], x[3])
@@ -0,0 +1,68 @@
+"""Cosine parity of the ONNX embedding backend with sentence-transformers on torch.
+
+Skipped unless sentence-transformers, onnxruntime and onnx are installed
+(requirements-onnx.txt) and the model loads, i.e. it is cached or can be
+downloaded. EMBED_PARITY_MODEL runs it against another sentence-transformers
+model, such as a local directory.
+"""
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from app.embeddings import MODEL_NAME  # noqa: E402
+from app.onnx_embedder import install_onnx_export, load_onnx_embedder  # noqa: E402
+from benchmarks.bench_parser import DEFAULT_CSV, load_corpus  # noqa: E402
+
+# The same bar benchmarks/bench_embeddings.py applies (--min-cosine)
+MIN_COSINE = 0.99
+PARITY_MODEL = os.getenv("EMBED_PARITY_MODEL", MODEL_NAME)
+
+_TEXTS = [
+    "Senior backend engineer, Python, Go, PostgreSQL, Kubernetes",
+    "Data scientist with 5 years of experience in NLP and recommender systems",
+    "B.Tech Computer Science, 2018",
+    "Certified Scrum Master; AWS Solutions Architect Associate",
+    "Led a team of six to migrate payments to event-driven services",
+    "Java",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def texts() -> list[str]:
+    corpus = load_corpus(DEFAULT_CSV, 200) if os.path.exists(DEFAULT_CSV) else []
+    return _TEXTS + corpus
+
+
+@pytest.fixture(scope="module")
+def torch_model():
+    from sentence_transformers import SentenceTransformer
+
+    try:
+        return SentenceTransformer(PARITY_MODEL)
+    except OSError as exc:
+        pytest.skip(f"{PARITY_MODEL} is not available: {exc}")
+
+
+@pytest.fixture(scope="module")
+def onnx_dir(torch_model, tmp_path_factory) -> str:
+    directory = str(tmp_path_factory.mktemp("onnx") / "model")
+    install_onnx_export(PARITY_MODEL, directory)
+    return directory
+
+
+@pytest.mark.parametrize("quantized", [True, False], ids=["int8", "fp32"])
+def test_onnx_matches_torch(torch_model, onnx_dir, texts, quantized):
+    reference = np.asarray(torch_model.encode(texts, batch_size=32, normalize_embeddings=True), dtype=np.float32)
+    candidate = load_onnx_embedder(PARITY_MODEL, onnx_dir, quantized=quantized).encode(
+        texts, batch_size=32, normalize_embeddings=True
+    )
+    assert candidate.shape == reference.shape
+    cosine = (reference * candidate).sum(axis=1)
+    worst = int(cosine.argmin())
+    assert cosine.min() >= MIN_COSINE, f"cosine {cosine.min():.5f} for {texts[worst][:80]!r}"
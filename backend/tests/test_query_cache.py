@@ -0,0 +1,29 @@
+import asyncio
+
+import numpy as np
+
+from app.query_cache import QueryEmbeddingCache
+
+
+def test_shared_tier_serves_other_workers(tmp_path):
+    path = str(tmp_path / "queries.sqlite3")
+    vector = np.arange(4, dtype=np.float32)
+    key = QueryEmbeddingCache.key("  Python   Developer ")
+
+    asyncio.run(QueryEmbeddingCache(sqlite_path=path).put(key, vector))
+    other = QueryEmbeddingCache(sqlite_path=path)
+    found = asyncio.run(other.get(QueryEmbeddingCache.key("python developer")))
+
+    np.testing.assert_array_equal(found, vector)
+    assert other.stats()["sharedHits"] == 1
+
+
+def test_version_bump_misses_shared_tier(tmp_path):
+    path = str(tmp_path / "queries.sqlite3")
+    asyncio.run(QueryEmbeddingCache(sqlite_path=path).put(
+        QueryEmbeddingCache.key("python", version="model/1"), np.ones(4, dtype=np.float32)
+    ))
+    other = QueryEmbeddingCache(sqlite_path=path)
+
+    assert asyncio.run(other.get(QueryEmbeddingCache.key("python", version="model/2"))) is None
+    assert other.stats()["misses"] == 1
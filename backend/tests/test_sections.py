@@ -0,0 +1,33 @@
+import pytest
+
+from app.sections import segment_sections
+
+
+def _headings(text: str) -> list[tuple[str, str]]:
+    return [(section.label, section.heading) for section in segment_sections(text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Experience\nAcme Corp, 2019-2023", [("experience", "Experience")]),
+    ("SKILLS Python, SQL", [("skills", "SKILLS")]),
+    ("## Education:\nB.Sc Physics", [("education", "Education")]),
+    ("• Skills:\nPython", [("skills", "Skills")]),
+    ("B.Tech.Education Details \nB.Tech. 2018", [("education", "Education")]),
+    ("SPSSEducation Details\nMBA", [("education", "Education")]),
+    ("Matlab- less than 1 year monthsCompany Details \ncompany - Acme", [("experience", "Company Details")]),
+    ("WORKING EXPERIENCE IN CORPORATE:\nAcme", [("experience", "EXPERIENCE")]),
+])
+def test_headings(text, expected):
+    assert _headings(text) == expected
+
+
+@pytest.mark.parametrize("prose", [
+    "Backend engineer with 5 years of experience",
+    "Strong written and verbal communication skills",
+    "A developer who is passionate about",
+    "- Experience in ML pipelines",
+])
+def test_prose_ending_in_a_keyword_is_not_a_heading(prose):
+    text = f"Summary\nBuilds data platforms.\n{prose}\nEducation\nB.Sc Computer Science"
+    assert _headings(text) == [("summary", "Summary"), ("education", "Education")]
+    assert prose in segment_sections(text).text("summary")